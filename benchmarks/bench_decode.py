@@ -0,0 +1,66 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: Raydium decode benchmark
+#
+# =============================================================================
+# 
+# Compares generic `CStruct.parse` based `decode` with precompiled `decode_fast`.
+#
+# Usage: PYTHONPATH=. python benchmarks/bench_decode.py [iterations]
+#
+from   sapysol_raydium_amm.accounts import RaydiumLiquidityPoolV4, SerumMarketV3
+from   typing                       import List, Callable
+import random
+import sys
+import timeit
+
+# =============================================================================
+# 
+def MakeAccountsData(size: int, count: int, seed: int = 1) -> List[bytes]:
+    rng = random.Random(seed)
+    return [rng.randbytes(size) for _ in range(count)]
+
+# =============================================================================
+# 
+def BenchDecoder(name: str, decoder: Callable, dataList: List[bytes], iterations: int) -> float:
+    def run():
+        for data in dataList:
+            decoder(data)
+    seconds:   float = min(timeit.repeat(run, number=iterations, repeat=3))
+    perDecode: float = seconds / (iterations * len(dataList)) * 1_000_000
+    print(f"{name:<40} {perDecode:10.2f} us/decode")
+    return perDecode
+
+# =============================================================================
+# 
+def Main(iterations: int = 20):
+    for cls in [RaydiumLiquidityPoolV4, SerumMarketV3]:
+        dataList: List[bytes] = MakeAccountsData(size=cls.layout.sizeof(), count=100)
+        for data in dataList:
+            assert cls.decode(data) == cls.decode_fast(data), f"{cls.__name__}: decode_fast mismatch!"
+
+        slow: float = BenchDecoder(name=f"{cls.__name__}.decode",      decoder=cls.decode,      dataList=dataList, iterations=iterations)
+        fast: float = BenchDecoder(name=f"{cls.__name__}.decode_fast", decoder=cls.decode_fast, dataList=dataList, iterations=iterations)
+        print(f"{'speedup':<40} {slow / fast:10.2f} x")
+
+# =============================================================================
+# 
+if __name__ == "__main__":
+    Main(iterations=int(sys.argv[1]) if len(sys.argv) > 1 else 20)
+
+# =============================================================================
+# 
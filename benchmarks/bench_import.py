@@ -0,0 +1,96 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: Raydium import time benchmark
+#
+# =============================================================================
+# 
+# Cold-start import time of the package, measured in fresh interpreters.
+# Every target runs `--runs` times, the median wall time of the import
+# statement is reported together with the heavy dependencies it pulled in.
+# Exits with code 1 when the instruction builder target loads one of them.
+#
+# Usage: PYTHONPATH=. python benchmarks/bench_import.py [--runs 7]
+#
+from   typing      import List, Tuple, NamedTuple
+import subprocess
+import statistics
+import argparse
+import json
+import sys
+
+# Dependencies the low-latency path must not import
+HEAVY_MODULES: List[str] = ["sapysol", "anchorpy", "borsh_construct", "solana.rpc.api", "httpx"]
+
+# (name, import statement)
+IMPORT_TARGETS: List[Tuple[str, str]] = [
+    ("package",  "import sapysol_raydium_amm"),
+    ("builders", "from sapysol_raydium_amm import SwapTemplate, Swap, CreateAtaIdempotentIx, RAYDIUM_LIQUIDITY_POOL_V4"),
+    ("amm",      "from sapysol_raydium_amm import SapysolRaydiumAMM"),
+    ("star",     "from sapysol_raydium_amm import *"),
+]
+
+_PROBE: str = """
+import time, sys, json
+t = time.perf_counter()
+exec({statement!r})
+ms = (time.perf_counter() - t) * 1000
+print(json.dumps({{"ms": ms, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+# =============================================================================
+#
+class ImportResult(NamedTuple):
+    name:     str       #
+    medianMs: float     #
+    heavy:    List[str] #
+
+# =============================================================================
+#
+def MeasureImport(name: str, statement: str, runs: int = 7) -> ImportResult:
+    probe: str = _PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+    times: List[float] = []
+    heavy: List[str]   = []
+    for _ in range(runs):
+        out = json.loads(subprocess.run([sys.executable, "-c", probe], check=True, capture_output=True, text=True).stdout)
+        times.append(out["ms"])
+        heavy = out["heavy"]
+    return ImportResult(name=name, medianMs=statistics.median(times), heavy=heavy)
+
+# =============================================================================
+#
+def Main() -> int:
+    parser = argparse.ArgumentParser(description="sapysol_raydium_amm import time")
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args()
+
+    results: List[ImportResult] = [MeasureImport(name=name, statement=statement, runs=args.runs) for name, statement in IMPORT_TARGETS]
+    for r in results:
+        print(f"{r.name:<12} {r.medianMs:10.1f} ms   {', '.join(r.heavy) or '-'}")
+
+    builders: ImportResult = next(r for r in results if r.name == "builders")
+    if builders.heavy:
+        print(f"\nInstruction builders import heavy dependencies: {', '.join(builders.heavy)}")
+        return 1
+    return 0
+
+# =============================================================================
+#
+if __name__ == "__main__":
+    sys.exit(Main())
+
+# =============================================================================
+#
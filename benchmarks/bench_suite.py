@@ -0,0 +1,232 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: Raydium benchmark suite
+#
+# =============================================================================
+# 
+# Offline benchmarks of the hot paths against a fake `Client` serving
+# recorded (or synthetic) account fixtures. Results are in microseconds per
+# call; `--save` stores them as the baseline, later runs compare against it
+# and exit with code 1 when anything got slower than `--threshold`.
+#
+# Usage: PYTHONPATH=. python benchmarks/bench_suite.py [--fixtures FILE] [--baseline FILE] [--save] [--threshold 0.2] [--filter TEXT]
+#
+import os
+import tempfile
+
+# Caches, locks and token files go to a throwaway HOME, so runs neither touch
+# nor get sped up by the real ~/.sapysol. Must happen before the imports below.
+os.environ["HOME"] = tempfile.mkdtemp(prefix="sapysol_bench_")
+
+from   sapysol_raydium_amm                         import SapysolRaydiumAMM, RaydiumAmmCache, RaydiumSerumCache, RaydiumSwapCache
+from   sapysol_raydium_amm.accounts                import RaydiumLiquidityPoolV4, SerumMarketV3
+from   sapysol_raydium_amm.instructions.swap       import SwapArgs, Swap, SwapTemplate
+from   sapysol_raydium_amm.src                     import derive
+from   sapysol_raydium_amm.src.raydium_swap_cache  import RaydiumSwapCacheEntry, RAYDIUM_SWAP_CACHE_CODEC
+from   sapysol_raydium_amm.src.storage             import RaydiumJsonDirStorage, RaydiumSqliteStorage
+from   sapysol_raydium_amm.src.orderbook           import DecodeSerumOrderbookSide
+from   sapysol.token_cache                         import TokenCache
+from   sapysol                                     import GetAta
+from   solders.pubkey                              import Pubkey
+from   typing                                      import List, Dict, Tuple, Callable, Any, NamedTuple, Optional
+from   bench_decode                                import MakeAccountsData
+from   fixtures                                    import RaydiumFixtures, FixtureClient, LoadFixtures, MakeSyntheticFixtures
+import argparse
+import platform
+import timeit
+import json
+import sys
+
+BASELINE_VERSION: int = 1
+
+# =============================================================================
+#
+class BenchResult(NamedTuple):
+    name:      str   #
+    perCallUs: float #
+
+class BenchComparison(NamedTuple):
+    name:       str             #
+    perCallUs:  float           #
+    baselineUs: Optional[float] #
+    ratio:      Optional[float] #
+    regressed:  bool            #
+
+# =============================================================================
+# Every benchmark is (name, callable). Setup (warm caches, stored entries,
+# fixtures) happens here, only the callable is timed.
+#
+def MakeBenchmarks(fixtures: RaydiumFixtures) -> List[Tuple[str, Callable[[], Any]]]:
+    connection: FixtureClient = FixtureClient(fixtures=fixtures)
+    rootPath:   str           = os.environ["HOME"]
+    wallet:     Pubkey        = fixtures.walletAddress
+
+    # Swap cache entry built by the library itself from the fixture accounts
+    swapCache: RaydiumSwapCacheEntry = RaydiumSwapCache.GetSwapCacheFromPoolAddress(connection=connection, poolAddress=fixtures.poolAddress)
+    tokenFrom, tokenTo = swapCache.quote_mint, swapCache.base_mint
+    for tokenMint in [tokenFrom, tokenTo]:
+        TokenCache.GetToken(connection=connection, tokenMint=tokenMint)
+    amm = SapysolRaydiumAMM(connection=connection, swapCache=swapCache)
+
+    ammData:      bytes  = bytes(fixtures.accounts[fixtures.poolAddress].data)
+    marketData:   bytes  = bytes(fixtures.accounts[swapCache.market_id].data)
+    market:       SerumMarketV3 = SerumMarketV3.decode_fast(marketData)
+    bidsData:     bytes  = bytes(fixtures.accounts[market.bids].data)
+    swapJson:     dict   = swapCache.to_json()
+    swapBytes:    bytes  = swapCache.to_bytes()
+    coldMarketID: Pubkey = Pubkey.from_bytes(MakeAccountsData(size=32, count=1, seed=2)[0])
+    ataFrom:      Pubkey = GetAta(tokenMint=tokenFrom, owner=wallet)
+    ataTo:        Pubkey = GetAta(tokenMint=tokenTo,   owner=wallet)
+    template = SwapTemplate(swapCache=swapCache, walletAddress=wallet, tokenAtaFrom=ataFrom, tokenAtaTo=ataTo)
+
+    jsonStorage   = RaydiumJsonDirStorage(codec=RAYDIUM_SWAP_CACHE_CODEC, path=os.path.join(rootPath, "bench_json"))
+    sqliteStorage = RaydiumSqliteStorage (codec=RAYDIUM_SWAP_CACHE_CODEC, path=os.path.join(rootPath, "bench.sqlite"))
+    for storage in [jsonStorage, sqliteStorage]:
+        storage.Put(key=swapCache.amm_id, entry=swapCache)
+
+    def DeriveCold():
+        # Fresh market every call, as when a pool is seen for the first time
+        derive._DeriveLiquidityV4_Common.cache_clear()
+        derive.DeriveAssociatedMarketAuthority.cache_clear()
+        derive.DeriveLiquidityV4Addresses(marketID=coldMarketID)
+
+    def SwapCacheFromStorage():
+        RaydiumSwapCache.ClearMemoryCache()
+        RaydiumSwapCache.GetSwapCacheFromPoolAddress(connection=connection, poolAddress=fixtures.poolAddress)
+
+    return [
+        ("decode/RaydiumLiquidityPoolV4.decode",           lambda: RaydiumLiquidityPoolV4.decode(ammData)),
+        ("decode/RaydiumLiquidityPoolV4.decode_fast",      lambda: RaydiumLiquidityPoolV4.decode_fast(ammData)),
+        ("decode/SerumMarketV3.decode",                    lambda: SerumMarketV3.decode(marketData)),
+        ("decode/SerumMarketV3.decode_fast",               lambda: SerumMarketV3.decode_fast(marketData)),
+        ("decode/DecodeSerumOrderbookSide.full",           lambda: DecodeSerumOrderbookSide(data=bidsData, market=market)),
+        ("decode/DecodeSerumOrderbookSide.depth10",        lambda: DecodeSerumOrderbookSide(data=bidsData, market=market, depth=10)),
+        ("derive/DeriveLiquidityV4Addresses.cold",         DeriveCold),
+        ("derive/DeriveLiquidityV4Addresses.warm",         lambda: derive.DeriveLiquidityV4Addresses(marketID=swapCache.market_id)),
+        ("derive/DeriveLiquidityV4AssociatedAuthority",    lambda: derive.DeriveLiquidityV4AssociatedAuthority()),
+        ("swap_cache/RaydiumSwapCacheEntry.to_json",       lambda: swapCache.to_json()),
+        ("swap_cache/RaydiumSwapCacheEntry.from_json",     lambda: RaydiumSwapCacheEntry.from_json(swapJson)),
+        ("swap_cache/RaydiumSwapCacheEntry.to_bytes",      lambda: swapCache.to_bytes()),
+        ("swap_cache/RaydiumSwapCacheEntry.from_bytes",    lambda: RaydiumSwapCacheEntry.from_bytes(swapBytes)),
+        ("file_cache/RaydiumJsonDirStorage.Get",           lambda: jsonStorage.Get(key=swapCache.amm_id)),
+        ("file_cache/RaydiumSqliteStorage.Get",            lambda: sqliteStorage.Get(key=swapCache.amm_id)),
+        ("file_cache/RaydiumSwapCache.storage_hit",        SwapCacheFromStorage),
+        ("file_cache/RaydiumSwapCache.memory_hit",         lambda: RaydiumSwapCache.GetSwapCacheFromPoolAddress(connection=connection, poolAddress=fixtures.poolAddress)),
+        ("file_cache/RaydiumAmmCache.GetRaydiumAmm",       lambda: RaydiumAmmCache.GetRaydiumAmm(connection=connection, poolAddress=fixtures.poolAddress)),
+        ("file_cache/RaydiumSerumCache.GetRaydiumSerum",   lambda: RaydiumSerumCache.GetRaydiumSerum(connection=connection, marketAddress=swapCache.market_id)),
+        ("file_cache/TokenCache.GetToken",                 lambda: TokenCache.GetToken(connection=connection, tokenMint=tokenTo)),
+        ("instructions/Swap",                              lambda: Swap(args=SwapArgs(amount_in=10**9, min_amount_out=1), swapCache=swapCache, walletAddress=wallet, tokenAtaFrom=ataFrom, tokenAtaTo=ataTo)),
+        ("instructions/SwapTemplate.build",                lambda: template.build(amountIn=10**9, minAmountOut=1)),
+        ("e2e/SapysolRaydiumAMM.GetSwapInstruction",       lambda: amm.GetSwapInstruction(walletAddress=wallet, tokenFrom=tokenFrom, tokenTo=tokenTo, amountIn=10**9)),
+        ("e2e/SapysolRaydiumAMM.GetSwapInstruction.units", lambda: amm.GetSwapInstruction(walletAddress=wallet, tokenFrom=tokenFrom, tokenTo=tokenTo, amountIn=10**9, txComputeUnits=200_000)),
+    ]
+
+# =============================================================================
+# Best of `repeat` runs of at least ~0.2s each.
+#
+def RunBenchmark(name: str, func: Callable[[], Any], repeat: int = 5) -> BenchResult:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    seconds: float = min(timer.repeat(repeat=repeat, number=number))
+    return BenchResult(name=name, perCallUs=seconds / number * 1_000_000)
+
+# =============================================================================
+#
+def SaveBaseline(path: str, results: List[BenchResult]):
+    with open(path, "w") as f:
+        json.dump({
+            "BASELINE_VERSION": BASELINE_VERSION,           #
+            "python":           platform.python_version(),  #
+            "machine":          platform.platform(),        #
+            "results":          {result.name: result.perCallUs for result in results},
+        }, f, indent=1)
+
+def LoadBaseline(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.isfile(path):
+        return None
+    with open(path) as f:
+        baseline = json.load(f)
+    return baseline if baseline.get("BASELINE_VERSION") == BASELINE_VERSION else None
+
+# =============================================================================
+# A benchmark regresses when it is more than `threshold` (0.2 = 20%) slower
+# than the baseline; benchmarks missing from the baseline never do.
+#
+def CompareResults(results: List[BenchResult], baseline: Dict[str, float], threshold: float) -> List[BenchComparison]:
+    comparisons: List[BenchComparison] = []
+    for result in results:
+        baselineUs: Optional[float] = baseline.get(result.name)
+        ratio:      Optional[float] = None if not baselineUs else result.perCallUs / baselineUs
+        comparisons.append(BenchComparison(name       = result.name,
+                                           perCallUs  = result.perCallUs,
+                                           baselineUs = baselineUs,
+                                           ratio      = ratio,
+                                           regressed  = ratio is not None and ratio > 1 + threshold))
+    return comparisons
+
+# =============================================================================
+#
+def Main() -> int:
+    parser = argparse.ArgumentParser(description="Offline sapysol_raydium_amm benchmarks")
+    parser.add_argument("--fixtures",  default=None, help="recorded fixtures JSON (see fixtures.py), synthetic accounts if omitted")
+    parser.add_argument("--baseline",  default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json"))
+    parser.add_argument("--save",      action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown vs. baseline, 0.2 = 20%%")
+    parser.add_argument("--filter",    default="", help="run only benchmarks whose name contains this text")
+    parser.add_argument("--repeat",    type=int, default=5)
+    args = parser.parse_args()
+
+    fixtures: RaydiumFixtures = LoadFixtures(args.fixtures) if args.fixtures else MakeSyntheticFixtures()
+    results:  List[BenchResult] = []
+    for name, func in MakeBenchmarks(fixtures=fixtures):
+        if args.filter in name:
+            results.append(RunBenchmark(name=name, func=func, repeat=args.repeat))
+            print(f"{name:<52} {results[-1].perCallUs:12.2f} us", flush=True)
+
+    if args.save:
+        SaveBaseline(path=args.baseline, results=results)
+        print(f"Baseline saved: {args.baseline}")
+        return 0
+
+    baseline: Optional[Dict[str, Any]] = LoadBaseline(path=args.baseline)
+    if baseline is None:
+        print(f"No baseline at {args.baseline}, run with --save to create one")
+        return 0
+    if baseline["python"] != platform.python_version() or baseline["machine"] != platform.platform():
+        print(f"Warning: baseline was recorded on {baseline['machine']}, Python {baseline['python']}")
+
+    print()
+    print(f"{'benchmark':<52} {'baseline':>12} {'current':>12} {'ratio':>8}")
+    comparisons: List[BenchComparison] = CompareResults(results=results, baseline=baseline["results"], threshold=args.threshold)
+    for c in comparisons:
+        baselineStr: str = "-" if c.baselineUs is None else f"{c.baselineUs:.2f}"
+        ratioStr:    str = "-" if c.ratio      is None else f"{c.ratio:.2f}"
+        print(f"{c.name:<52} {baselineStr:>12} {c.perCallUs:12.2f} {ratioStr:>8}{'  REGRESSION' if c.regressed else ''}")
+
+    regressed: List[BenchComparison] = [c for c in comparisons if c.regressed]
+    if regressed:
+        print(f"\n{len(regressed)} benchmark(s) slower than baseline by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+# =============================================================================
+#
+if __name__ == "__main__":
+    sys.exit(Main())
+
+# =============================================================================
+#
@@ -0,0 +1,255 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: Raydium benchmark fixtures
+#
+# =============================================================================
+# 
+# Recorded account fixtures and a fake `Client` serving them offline.
+#
+# Record a fixture set from a live node (runs FromPoolAddress and
+# GetSwapInstruction once and keeps every account that was read):
+#   PYTHONPATH=. python benchmarks/fixtures.py <rpcUrl> <poolAddress> <walletAddress> <output.json>
+#
+from   solana.rpc.api                     import Client
+from   solana.rpc.commitment              import Commitment
+from   solders.account                    import Account
+from   solders.pubkey                     import Pubkey
+from   solders.rpc.responses              import GetAccountInfoResp, GetMultipleAccountsResp, RpcResponseContext
+from   spl.token.constants                import WRAPPED_SOL_MINT, TOKEN_PROGRAM_ID
+from   typing                             import List, Dict, Any, NamedTuple, Optional
+from   sapysol                            import MakePubkey, SapysolPubkey
+from   sapysol_raydium_amm.accounts       import RaydiumLiquidityPoolV4, SerumMarketV3
+from   sapysol_raydium_amm.src.constants  import RAYDIUM_LIQUIDITY_POOL_V4, RAYDIUM_SERUM_PROGAM_ID
+from   sapysol_raydium_amm.src.orderbook  import SERUM_ACCOUNT_FLAG_INITIALIZED, SERUM_ACCOUNT_FLAG_BIDS, SERUM_ACCOUNT_FLAG_ASKS
+import dataclasses
+import base64
+import random
+import struct
+import json
+import sys
+
+FIXTURES_VERSION: int = 1
+
+# =============================================================================
+# Pool the fixture set was recorded for, plus the accounts themselves
+# (None for accounts that did not exist, e.g. a missing ATA).
+#
+class RaydiumFixtures(NamedTuple):
+    poolAddress:   Pubkey                          #
+    walletAddress: Pubkey                          #
+    slot:          int                             #
+    accounts:      Dict[Pubkey, Optional[Account]] #
+
+# =============================================================================
+#
+def _AccountToJson(account: Optional[Account]) -> Optional[Dict[str, Any]]:
+    if account is None:
+        return None
+    return {
+        "lamports":   account.lamports,                               #
+        "owner":      str(account.owner),                             #
+        "executable": account.executable,                             #
+        "rent_epoch": account.rent_epoch,                             #
+        "data":       base64.b64encode(bytes(account.data)).decode(), #
+    }
+
+def _AccountFromJson(obj: Optional[Dict[str, Any]]) -> Optional[Account]:
+    if obj is None:
+        return None
+    return Account(lamports   = obj["lamports"],
+                   data       = base64.b64decode(obj["data"]),
+                   owner      = Pubkey.from_string(obj["owner"]),
+                   executable = obj["executable"],
+                   rent_epoch = obj["rent_epoch"])
+
+# =============================================================================
+#
+def SaveFixtures(path: str, fixtures: RaydiumFixtures):
+    with open(path, "w") as f:
+        json.dump({
+            "FIXTURES_VERSION": FIXTURES_VERSION,            #
+            "pool_address":     str(fixtures.poolAddress),   #
+            "wallet_address":   str(fixtures.walletAddress), #
+            "slot":             fixtures.slot,               #
+            "accounts":         {str(pubkey): _AccountToJson(account) for pubkey, account in fixtures.accounts.items()},
+        }, f, indent=1)
+
+def LoadFixtures(path: str) -> RaydiumFixtures:
+    with open(path) as f:
+        obj = json.load(f)
+    if obj.get("FIXTURES_VERSION") != FIXTURES_VERSION:
+        raise ValueError(f"Unsupported fixtures file: {path}")
+    return RaydiumFixtures(poolAddress   = Pubkey.from_string(obj["pool_address"]),
+                           walletAddress = Pubkey.from_string(obj["wallet_address"]),
+                           slot          = obj["slot"],
+                           accounts      = {Pubkey.from_string(pubkey): _AccountFromJson(account) for pubkey, account in obj["accounts"].items()})
+
+# =============================================================================
+# Serum v3 bids or asks account holding `ordersPerLevel` orders at each of
+# `levels` random prices in [minPrice, minPrice + 10 * levels) (in lots), as
+# a valid critbit tree followed by a few free nodes and unused capacity.
+#
+def MakeSyntheticSlab(rng: random.Random, isBids: bool, minPrice: int, levels: int = 50, ordersPerLevel: int = 3, capacity: int = 1024) -> bytes:
+    prices: List[int] = rng.sample(range(minPrice, minPrice + 10 * levels), levels)
+    keys:   List[int] = sorted({(price << 64) | rng.getrandbits(64) for price in prices for _ in range(ordersPerLevel)})
+    nodes:  List[bytes] = []
+
+    def Build(keys: List[int]) -> int:
+        index: int = len(nodes)
+        if len(keys) == 1:
+            nodes.append(struct.pack("<IBB2x16s32sQQ", 2, 0, 0, keys[0].to_bytes(16, "little"), rng.randbytes(32), rng.randint(1, 1000), 0))
+            return index
+        critBit: int = (keys[0] ^ keys[-1]).bit_length() - 1
+        split:   int = next(i for i, key in enumerate(keys) if key >> critBit & 1)
+        nodes.append(b"")
+        children: List[int] = [Build(keys[:split]), Build(keys[split:])]
+        nodes[index] = struct.pack("<II16sII40x", 1, 127 - critBit, keys[0].to_bytes(16, "little"), *children)
+        return index
+
+    root:      int = Build(keys)
+    freeNodes: int = 4
+    for i in range(freeNodes):
+        nodes.append(struct.pack("<II", 3 if i < freeNodes - 1 else 4, len(nodes) + 1) + rng.randbytes(64))
+    flags:  int   = SERUM_ACCOUNT_FLAG_INITIALIZED | (SERUM_ACCOUNT_FLAG_BIDS if isBids else SERUM_ACCOUNT_FLAG_ASKS)
+    header: bytes = struct.pack("<5sQI4xI4xIII4x", b"serum", flags, len(nodes), freeNodes, len(nodes) - freeNodes, root, len(keys))
+    return header + b"".join(nodes) + bytes(72 * (capacity - len(nodes))) + b"padding"
+
+# =============================================================================
+# Deterministic stand-in for a recorded set: one AMM v4 pool (base token with
+# 6 decimals / WSOL) with its market, orderbook and both mints. Everything that is not
+# needed for addressing is random.
+#
+def MakeSyntheticFixtures(seed: int = 1) -> RaydiumFixtures:
+    rng = random.Random(seed)
+    def MakeKey() -> Pubkey:
+        return Pubkey(rng.randbytes(32))
+    def MakeMint(decimals: int) -> Account:
+        data: bytes = bytes(36) + struct.pack("<QBB", 10**15, decimals, 1) + bytes(36)
+        return Account(lamports=1461600, data=data, owner=TOKEN_PROGRAM_ID, executable=False, rent_epoch=0)
+
+    poolAddress:   Pubkey = MakeKey()
+    marketAddress: Pubkey = MakeKey()
+    walletAddress: Pubkey = MakeKey()
+    baseMint:      Pubkey = MakeKey()
+
+    ammInfo = dataclasses.replace(RaydiumLiquidityPoolV4.decode_fast(rng.randbytes(RaydiumLiquidityPoolV4.codec.SIZE)),
+                                  status       = 6,
+                                  baseDecimal  = 6,
+                                  quoteDecimal = 9,
+                                  marketId     = marketAddress,
+                                  baseMint     = baseMint,
+                                  quoteMint    = WRAPPED_SOL_MINT)
+    serumInfo = dataclasses.replace(SerumMarketV3.decode_fast(rng.randbytes(SerumMarketV3.codec.SIZE)),
+                                    ownAddress = marketAddress,
+                                    baseMint   = baseMint,
+                                    quoteMint  = WRAPPED_SOL_MINT)
+
+    accounts: Dict[Pubkey, Optional[Account]] = {
+        poolAddress:      Account(lamports=6124800, data=ammInfo.encode(),   owner=RAYDIUM_LIQUIDITY_POOL_V4, executable=False, rent_epoch=0),
+        marketAddress:    Account(lamports=3591360, data=serumInfo.encode(), owner=RAYDIUM_SERUM_PROGAM_ID,   executable=False, rent_epoch=0),
+        serumInfo.bids:   Account(lamports=1000000,  data=MakeSyntheticSlab(rng=rng, isBids=True,  minPrice=500),  owner=RAYDIUM_SERUM_PROGAM_ID, executable=False, rent_epoch=0),
+        serumInfo.asks:   Account(lamports=1000000,  data=MakeSyntheticSlab(rng=rng, isBids=False, minPrice=1000), owner=RAYDIUM_SERUM_PROGAM_ID, executable=False, rent_epoch=0),
+        baseMint:         MakeMint(decimals=6),
+        WRAPPED_SOL_MINT: MakeMint(decimals=9),
+    }
+    return RaydiumFixtures(poolAddress=poolAddress, walletAddress=walletAddress, slot=250_000_000, accounts=accounts)
+
+# =============================================================================
+# Serves account reads from fixtures, unknown accounts do not exist.
+#
+class FixtureClient:
+    def __init__(self, fixtures: RaydiumFixtures):
+        self.FIXTURES: RaydiumFixtures = fixtures
+        self.CALLS:    int             = 0
+
+    # ========================================
+    #
+    def __Get(self, pubkey: Pubkey, dataSlice: Any) -> Optional[Account]:
+        account: Optional[Account] = self.FIXTURES.accounts.get(pubkey)
+        if account is None or dataSlice is None:
+            return account
+        return Account(lamports   = account.lamports,
+                       data       = bytes(account.data)[dataSlice.offset:dataSlice.offset + dataSlice.length],
+                       owner      = account.owner,
+                       executable = account.executable,
+                       rent_epoch = account.rent_epoch)
+
+    # ========================================
+    #
+    def get_account_info(self, pubkey: SapysolPubkey, commitment: Optional[Commitment] = None, encoding: str = "base64", data_slice: Any = None) -> GetAccountInfoResp:
+        self.CALLS += 1
+        return GetAccountInfoResp(value=self.__Get(MakePubkey(pubkey), data_slice), context=RpcResponseContext(slot=self.FIXTURES.slot))
+
+    def get_multiple_accounts(self, pubkeys: List[SapysolPubkey], commitment: Optional[Commitment] = None, encoding: str = "base64", data_slice: Any = None) -> GetMultipleAccountsResp:
+        self.CALLS += 1
+        return GetMultipleAccountsResp(value=[self.__Get(MakePubkey(pubkey), data_slice) for pubkey in pubkeys], context=RpcResponseContext(slot=self.FIXTURES.slot))
+
+# =============================================================================
+# Forwards to a live `Client` and keeps every account it returned.
+#
+class RecordingClient:
+    def __init__(self, connection: Client):
+        self.CONNECTION: Client                          = connection
+        self.ACCOUNTS:   Dict[Pubkey, Optional[Account]] = {}
+        self.SLOT:       int                             = 0
+
+    # ========================================
+    #
+    def get_account_info(self, pubkey: SapysolPubkey, commitment: Optional[Commitment] = None, encoding: str = "base64", data_slice: Any = None) -> GetAccountInfoResp:
+        resp = self.CONNECTION.get_account_info(pubkey=MakePubkey(pubkey), commitment=commitment, encoding=encoding, data_slice=data_slice)
+        if data_slice is None:
+            self.ACCOUNTS[MakePubkey(pubkey)] = resp.value
+        self.SLOT = max(self.SLOT, resp.context.slot)
+        return resp
+
+    def get_multiple_accounts(self, pubkeys: List[SapysolPubkey], commitment: Optional[Commitment] = None, encoding: str = "base64", data_slice: Any = None) -> GetMultipleAccountsResp:
+        resp = self.CONNECTION.get_multiple_accounts(pubkeys=[MakePubkey(pubkey) for pubkey in pubkeys], commitment=commitment, encoding=encoding, data_slice=data_slice)
+        if data_slice is None:
+            self.ACCOUNTS.update(zip([MakePubkey(pubkey) for pubkey in pubkeys], resp.value))
+        self.SLOT = max(self.SLOT, resp.context.slot)
+        return resp
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.CONNECTION, name)
+
+# =============================================================================
+# Bypasses every local cache so all accounts the swap path needs are fetched.
+#
+def RecordFixtures(connection: Client, poolAddress: SapysolPubkey, walletAddress: SapysolPubkey) -> RaydiumFixtures:
+    from sapysol_raydium_amm import SapysolRaydiumAMM, RaydiumAmmCache, RaydiumSerumCache, RaydiumSwapCache, FetchSerumOrderbook
+    from sapysol.token_cache  import TokenCache
+
+    recorder = RecordingClient(connection=connection)
+    RaydiumAmmCache.UpdateRaydiumAmmCache(connection=recorder, poolAddress=poolAddress)
+    amm = SapysolRaydiumAMM(connection=recorder, swapCache=RaydiumSwapCache.UpdateSwapCacheFromPoolAddress(connection=recorder, poolAddress=poolAddress))
+    market = RaydiumSerumCache.UpdateRaydiumSerumCache(connection=recorder, marketAddress=amm.SWAP_CACHE.market_id)
+    FetchSerumOrderbook(connection=recorder, market=market)
+    for tokenMint in [amm.SWAP_CACHE.base_mint, amm.SWAP_CACHE.quote_mint]:
+        TokenCache.UpdateTokenCache(connection=recorder, tokenMint=tokenMint)
+    for tokenFrom, tokenTo in [(amm.SWAP_CACHE.quote_mint, amm.SWAP_CACHE.base_mint), (amm.SWAP_CACHE.base_mint, amm.SWAP_CACHE.quote_mint)]:
+        amm.GetSwapInstruction(walletAddress=walletAddress, tokenFrom=tokenFrom, tokenTo=tokenTo, amountIn=1000, txComputeUnits=200_000)
+    return RaydiumFixtures(poolAddress=MakePubkey(poolAddress), walletAddress=MakePubkey(walletAddress), slot=recorder.SLOT, accounts=recorder.ACCOUNTS)
+
+# =============================================================================
+#
+if __name__ == "__main__":
+    if len(sys.argv) != 5:
+        sys.exit(f"Usage: {sys.argv[0]} <rpcUrl> <poolAddress> <walletAddress> <output.json>")
+    SaveFixtures(path=sys.argv[4], fixtures=RecordFixtures(connection=Client(sys.argv[1]), poolAddress=sys.argv[2], walletAddress=sys.argv[3]))
+
+# =============================================================================
+#
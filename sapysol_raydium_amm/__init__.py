@@ -18,13 +18,117 @@
 #
 # =============================================================================
 # 
-from .accounts                import *
-from .instructions            import *
-from .src.constants           import *
-from .src.raydium_amm_cache   import *
-from .src.raydium_serum_cache import *
-from .src.raydium_swap_cache  import *
-from .raydium_amm             import SapysolRaydiumAMM
+# Public names are resolved lazily (PEP 562): `import sapysol_raydium_amm`
+# only loads this table, and the first access to a name imports the module
+# that defines it. The instruction builders (`Swap`, `SwapTemplate`,
+# `CreateAtaIdempotentIx`) and constants import neither sapysol nor anchorpy.
+#
+from   typing    import List, Dict, Any
+import importlib
+
+# =============================================================================
+# Module -> names it exports, in the order the package used to star-import
+# them.
+#
+_LAZY_MODULES: Dict[str, List[str]] = {
+    ".accounts":                     ["RaydiumLiquidityPoolV4_JSON", "RaydiumLiquidityPoolV4", "SerumMarketV3_JSON",
+                                      "SerumMarketV3", "OpenOrdersV3_JSON", "OpenOrdersV3"],
+    ".instructions":                 ["SwapArgs", "Swap", "SwapAccountMetas", "SwapTemplate", "CreateAtaIdempotentIx"],
+    ".src.constants":                ["RAYDIUM_LIQUIDITY_POOL_V4", "RAYDIUM_AUTHORITY_V4", "RAYDIUM_SERUM_PROGAM_ID"],
+    ".src.derive":                   ["PROGRAM_ID", "SERUM_PROGRAM_ID", "DERIVE_CACHE_SIZE", "DeriveAssociatedMarketAuthority",
+                                      "DeriveLiquidityV4AssociatedAuthority", "DeriveLiquidityV4AssociatedID",
+                                      "DeriveLiquidityV4AssociatedBaseVault", "DeriveLiquidityV4AssociatedQuoteVault",
+                                      "DeriveLiquidityV4AssociatedLpMint", "DeriveLiquidityV4AssociatedLpVault",
+                                      "DeriveLiquidityV4AssociatedTargetOrders", "DeriveLiquidityV4AssociatedWithdrawQueue",
+                                      "DeriveLiquidityV4AssociatedOpenOrders", "DeriveLiquidityV4AssociatedConfigId",
+                                      "RaydiumLiquidityV4Addresses", "DeriveLiquidityV4Addresses",
+                                      "DeriveAllLiquidityV4Addresses"],
+    ".src.codec":                    ["FIELD_SCALAR", "FIELD_U128", "FIELD_PUBKEY", "FIELD_ARRAY", "FIELD_U128S",
+                                      "CompiledField", "CompiledLayout", "CompiledProjection"],
+    ".src.single_flight":            ["RaydiumFileLock", "RaydiumAtomicWrite", "RaydiumSingleFlight"],
+    ".src.async_token_cache":        ["AsyncTokenCache"],
+    ".src.storage":                  ["RaydiumCacheCodec", "RaydiumCacheStorage", "RaydiumJsonDirStorage",
+                                      "RaydiumSqliteStorage", "RaydiumCacheRootPath", "MigrateRaydiumCacheStorage",
+                                      "MakeDefaultRaydiumCacheStorage"],
+    ".src.raydium_amm_cache":        ["RAYDIUM_AMM_CACHE_CODEC", "RaydiumAmmCache"],
+    ".src.raydium_serum_cache":      ["RAYDIUM_SERUM_CACHE_CODEC", "RaydiumSerumCache"],
+    ".src.raydium_swap_cache":       ["SAPYSOL_RAYDIUM_VERSION", "RaydiumSwapCacheEntryJSON", "RaydiumSwapCacheEntry",
+                                      "RAYDIUM_SWAP_CACHE_CODEC", "RaydiumSwapCacheStats",
+                                      "RaydiumSwapCacheBatchResult", "RaydiumSwapCache"],
+    ".src.raydium_amm_state":        ["RAYDIUM_AMM_DYNAMIC_FIELDS", "RAYDIUM_AMM_SWAP_FIELDS", "RaydiumAmmStateEntry",
+                                      "RaydiumAmmStateCache"],
+    ".src.quote":                    ["RaydiumCeilDiv", "RaydiumSwapBaseIn", "RaydiumSwapBaseOut",
+                                      "RaydiumMinAmountOut", "RaydiumAmmReserves"],
+    ".src.quote_grid":               ["RaydiumQuoteGrid", "RaydiumQuoteGridBaseIn", "RaydiumQuoteGridFromReserves"],
+    ".src.reserve_snapshot":         ["TOKEN_ACCOUNT_AMOUNT_OFFSET", "RAYDIUM_AMM_ORDERBOOK_STATUSES",
+                                      "ReserveSnapshotEntry", "ReserveSnapshot"],
+    ".src.reserve_stream":           ["STREAM_ACCOUNT_AMM", "STREAM_ACCOUNT_BASE_VAULT", "STREAM_ACCOUNT_QUOTE_VAULT",
+                                      "STREAM_ACCOUNT_OPEN_ORDERS", "ReserveStreamUpdate", "ReserveStreamGap",
+                                      "ReserveStream"],
+    ".src.reserve_stream_replay":    ["LoadReserveStreamRecording", "ReserveStreamReplayServer"],
+    ".src.persistent_wsol":          ["PersistentWsol"],
+    ".src.compute_units":            ["RAYDIUM_DEFAULT_COMPUTE_UNITS", "RaydiumComputeUnitsEntry",
+                                      "RAYDIUM_COMPUTE_UNITS_CODEC", "RaydiumComputeUnits"],
+    ".src.pool_index":               ["RaydiumPoolIndexPool", "RaydiumPoolIndexEntry", "RAYDIUM_POOL_INDEX_CODEC",
+                                      "RaydiumPoolIndex"],
+    ".src.program_accounts_stream":  ["ProgramAccountsStreamParser", "MakeProgramAccountsRequest",
+                                      "StreamProgramAccounts", "StreamProgramAccountsAsync", "StreamRaydiumPools",
+                                      "StreamSerumMarkets", "StreamRaydiumPoolsAsync", "StreamSerumMarketsAsync"],
+    ".src.pool_columns":             ["CompiledLayoutDtype", "DecodeColumns", "DecodeRaydiumPoolColumns",
+                                      "RaydiumPoolColumnsFromAccounts", "U128Column", "PubkeyColumn", "FilterStatus",
+                                      "FilterPoolOpenTime", "FilterMint", "FilterMintPair"],
+    ".src.rpc_pool":                 ["RAYDIUM_RPC_UNHEDGED_METHODS", "RaydiumRpcEndpointStats", "RaydiumRpcPool",
+                                      "AsyncRaydiumRpcPool"],
+    ".src.rpc_stand_in":             ["RaydiumRpcStandInServer"],
+    ".src.metrics":                  ["RAYDIUM_METRIC_CACHE_LOOKUPS", "RAYDIUM_METRIC_RPC_SECONDS",
+                                      "RAYDIUM_METRIC_RPC_ERRORS", "RAYDIUM_METRIC_DECODE",
+                                      "RAYDIUM_METRIC_SWAP_STAGE", "RAYDIUM_METRICS_HELP", "RAYDIUM_METRICS_BUCKETS",
+                                      "RaydiumMetricsSink", "RaydiumHistogram", "RaydiumMetricsRegistry",
+                                      "StartPrometheusServer", "RaydiumMetricsStages", "RaydiumMetrics",
+                                      "RaydiumMetricsClient"],
+    ".src.orderbook":                ["SERUM_ACCOUNT_FLAG_INITIALIZED", "SERUM_ACCOUNT_FLAG_BIDS", "SERUM_ACCOUNT_FLAG_ASKS",
+                                      "SERUM_SLAB_HEADER_OFFSET", "SERUM_SLAB_NODES_OFFSET", "SERUM_SLAB_NODE_SIZE",
+                                      "SERUM_SLAB_TRAILER_SIZE", "SERUM_SLAB_NODE_INNER", "SERUM_SLAB_NODE_LEAF",
+                                      "SerumOrderbookSide", "SerumOrderbook", "DecodeSerumSlab",
+                                      "DecodeSerumOrderbookSide", "FetchSerumOrderbook", "FetchSerumOrderbookAsync"],
+    ".raydium_amm":                  ["SapysolRaydiumAMM"],
+    ".raydium_amm_async":            ["AsyncSapysolRaydiumAMM"],
+    ".prepared_swap":                ["PreparedSwap"],
+}
+_LAZY_ATTRS: Dict[str, str] = {name: module for module, names in _LAZY_MODULES.items() for name in names}
+
+# =============================================================================
+# Names that are not in the table (sapysol/solana names the modules used to
+# re-export through star-imports, submodules) load every module, as the
+# eager package did. So does `from sapysol_raydium_amm import *`: `__all__`
+# is resolved here and lists every public name the eager package exported.
+#
+def _LoadAll():
+    for module in _LAZY_MODULES:
+        imported = importlib.import_module(module, __name__)
+        names: List[str] = getattr(imported, "__all__", None) or [name for name in vars(imported) if not name.startswith("_")]
+        for name in names:
+            globals()[name] = getattr(imported, name)
+
+def __getattr__(name: str) -> Any:
+    module: str = _LAZY_ATTRS.get(name)
+    if module is not None:
+        value = getattr(importlib.import_module(module, __name__), name)
+    elif name == "__all__":
+        _LoadAll()
+        value = [name for name in globals() if not name.startswith("_") and name != "importlib"]
+    else:
+        if name.startswith("__"):
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+        _LoadAll()
+        if name not in globals():
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+        value = globals()[name]
+    globals()[name] = value
+    return value
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
 
 # =============================================================================
 # 
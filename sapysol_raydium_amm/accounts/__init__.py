@@ -1,7 +1,5 @@
 # =============================================================================
 # 
-from .raydium_amm_v4  import RaydiumLiquidityPoolV4_JSON, RaydiumLiquidityPoolV4
-from .serum_market_v3 import SerumMarketV3_JSON,          SerumMarketV3
-
-# =============================================================================
-# 
+from .raydium_amm_v4       import RaydiumLiquidityPoolV4_JSON, RaydiumLiquidityPoolV4
+from .serum_market_v3      import SerumMarketV3_JSON,          SerumMarketV3
+from .serum_open_orders_v3 import OpenOrdersV3_JSON,           OpenOrdersV3
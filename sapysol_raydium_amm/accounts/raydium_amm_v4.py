@@ -22,12 +22,17 @@ import borsh_construct as borsh
 from   dataclasses              import dataclass
 from   solders.pubkey           import Pubkey
 from   solana.rpc.api           import Client
+from   solana.rpc.async_api     import AsyncClient
 from   solana.rpc.commitment    import Commitment
+from   solana.rpc.types         import DataSliceOpts
 from   anchorpy.error           import AccountInvalidDiscriminator
 from   anchorpy.utils.rpc       import get_multiple_accounts
 from   anchorpy.borsh_extension import BorshPubkey
-from   typing                   import List, Any, TypedDict, Union, Optional, ClassVar
-from   sapysol                  import FetchAccount, FetchAccounts
+from   typing                   import List, Any, TypedDict, Union, Optional, ClassVar, Dict
+from ..src.codec                import CompiledLayout
+from ..src.metrics              import RaydiumMetrics, RAYDIUM_METRIC_DECODE
+from   sapysol                  import MakePubkey, FetchAccount, FetchAccounts, ListToChunks
+import time
 
 # =============================================================================
 #
@@ -155,6 +160,7 @@ class RaydiumLiquidityPoolV4:
         "lpReserve"              / borsh.U64,
         "padding"                / borsh.U64[3],
     )
+    codec: ClassVar = CompiledLayout(layout)
     status:                 int
     nonce:                  int
     maxOrder:               int
@@ -224,7 +230,18 @@ class RaydiumLiquidityPoolV4:
         resp = FetchAccount(connection    = conn, 
                             pubkey        = address,
                             commitment    = commitment)
-        return None if resp is None else cls.decode(resp.data)
+        return None if resp is None else cls.decode_fast(resp.data)
+
+    # ========================================
+    #
+    @classmethod
+    async def fetch_async(cls,
+                          conn:       AsyncClient,
+                          address:    Pubkey,
+                          commitment: Optional[Commitment] = None) -> Optional["RaydiumLiquidityPoolV4"]:
+
+        resp = await conn.get_account_info(pubkey=MakePubkey(address), commitment=commitment)
+        return None if resp.value is None else cls.decode_fast(resp.value.data)
 
     # ========================================
     #
@@ -234,13 +251,46 @@ class RaydiumLiquidityPoolV4:
                        addresses:  list[Pubkey],
                        commitment: Optional[Commitment] = None) -> List[Optional["RaydiumLiquidityPoolV4"]]:
 
-        infos = get_multiple_accounts(conn, addresses, commitment=commitment)
-        res: List[Optional["RaydiumLiquidityPoolV4"]] = []
-        for info in infos:
-            if info is None:
-                res.append(None)
-                continue
-            res.append(cls.decode(info.account.data))
+        entries = FetchAccounts(connection   = conn, 
+                                pubkeys      = addresses,
+                                commitment   = commitment)
+        return [ RaydiumLiquidityPoolV4.decode_fast(entry.data) if entry else None for entry in entries ]
+
+    # ========================================
+    # Fetches only the byte range covering `fields` (RPC `dataSlice`) and
+    # decodes only those fields, e.g. fields=["baseVault", "quoteVault"].
+    #
+    @classmethod
+    def fetch_fields(cls,
+                     conn:       Client,
+                     address:    Pubkey,
+                     fields:     List[str],
+                     commitment: Optional[Commitment] = None) -> Optional[Dict[str, Any]]:
+
+        projection = cls.codec.Projection(fields)
+        resp = conn.get_account_info(pubkey     = MakePubkey(address),
+                                     commitment = commitment,
+                                     data_slice = DataSliceOpts(offset=projection.OFFSET, length=projection.LENGTH))
+        if resp.value is None or len(resp.value.data) < projection.LENGTH:
+            return None
+        return projection.decode(resp.value.data)
+
+    # ========================================
+    #
+    @classmethod
+    def fetch_fields_multiple(cls,
+                              conn:       Client,
+                              addresses:  list[Pubkey],
+                              fields:     List[str],
+                              commitment: Optional[Commitment] = None,
+                              chunkSize:  int = 100) -> List[Optional[Dict[str, Any]]]:
+
+        projection = cls.codec.Projection(fields)
+        dataSlice  = DataSliceOpts(offset=projection.OFFSET, length=projection.LENGTH)
+        res: List[Optional[Dict[str, Any]]] = []
+        for chunk in ListToChunks(baseList=[MakePubkey(address) for address in addresses], chunkSize=chunkSize):
+            entries = conn.get_multiple_accounts(pubkeys=chunk, commitment=commitment, data_slice=dataSlice).value
+            res += [ projection.decode(entry.data) if entry and len(entry.data) >= projection.LENGTH else None for entry in entries ]
         return res
 
     # ========================================
@@ -308,6 +358,25 @@ class RaydiumLiquidityPoolV4:
             padding                = dec.padding
         )
 
+    # ========================================
+    # Same result as `decode`, but uses precompiled `struct` offsets instead
+    # of generic `CStruct.parse`.
+    #
+    @classmethod
+    def decode_fast(cls, data: bytes) -> "RaydiumLiquidityPoolV4":
+        if RaydiumMetrics.SINK is None:
+            return cls(*cls.codec.unpack(data))
+        start: float = time.perf_counter()
+        result = cls(*cls.codec.unpack(data))
+        RaydiumMetrics.Observe(RAYDIUM_METRIC_DECODE, time.perf_counter() - start, account="RaydiumLiquidityPoolV4")
+        return result
+
+    # ========================================
+    # Inverse of `decode_fast`, raw account bytes.
+    #
+    def encode(self) -> bytes:
+        return self.codec.pack(self)
+
     # ========================================
     #
     def to_json(self) -> RaydiumLiquidityPoolV4_JSON:
@@ -0,0 +1,204 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: Raydium Serum Open Orders Layout
+#
+# =============================================================================
+#
+import borsh_construct as borsh
+from   dataclasses              import dataclass
+from   solders.pubkey           import Pubkey
+from   solana.rpc.api           import Client
+from   solana.rpc.async_api     import AsyncClient
+from   solana.rpc.commitment    import Commitment
+from   anchorpy.borsh_extension import BorshPubkey
+from   typing                   import List, Any, TypedDict, Union, Optional, ClassVar, Dict
+from ..src.codec                import CompiledLayout
+from ..src.metrics              import RaydiumMetrics, RAYDIUM_METRIC_DECODE
+from   sapysol                  import MakePubkey, FetchAccount, FetchAccounts
+import time
+
+# =============================================================================
+#
+class OpenOrdersV3_JSON(TypedDict):
+    padding1:               List[int]
+    accountFlags:           int
+    market:                 Pubkey
+    owner:                  Pubkey
+    baseTokenFree:          int
+    baseTokenTotal:         int
+    quoteTokenFree:         int
+    quoteTokenTotal:        int
+    freeSlotBits:           int
+    isBidBits:              int
+    orders:                 List[int]
+    clientIds:              List[int]
+    referrerRebatesAccrued: int
+    padding2:               List[int]
+
+# =============================================================================
+#
+@dataclass
+class OpenOrdersV3:
+    layout: ClassVar = borsh.CStruct(
+        "padding1"               / borsh.U8[5],
+        "accountFlags"           / borsh.U64,
+        "market"                 / BorshPubkey,
+        "owner"                  / BorshPubkey,
+        "baseTokenFree"          / borsh.U64,
+        "baseTokenTotal"         / borsh.U64,
+        "quoteTokenFree"         / borsh.U64,
+        "quoteTokenTotal"        / borsh.U64,
+        "freeSlotBits"           / borsh.U128,
+        "isBidBits"              / borsh.U128,
+        "orders"                 / borsh.U128[128],
+        "clientIds"              / borsh.U64[128],
+        "referrerRebatesAccrued" / borsh.U64,
+        "padding2"               / borsh.U8[7],
+    )
+    codec: ClassVar = CompiledLayout(layout)
+    padding1:               List[int]
+    accountFlags:           int
+    market:                 Pubkey
+    owner:                  Pubkey
+    baseTokenFree:          int
+    baseTokenTotal:         int
+    quoteTokenFree:         int
+    quoteTokenTotal:        int
+    freeSlotBits:           int
+    isBidBits:              int
+    orders:                 List[int]
+    clientIds:              List[int]
+    referrerRebatesAccrued: int
+    padding2:               List[int]
+
+    # ========================================
+    #
+    @classmethod
+    def fetch(cls,
+              conn:       Client,
+              address:    Pubkey,
+              commitment: Optional[Commitment] = None) -> Optional["OpenOrdersV3"]:
+
+        resp = FetchAccount(connection    = conn, 
+                            pubkey        = address,
+                            commitment    = commitment)
+        return None if resp is None else cls.decode_fast(resp.data)
+
+    # ========================================
+    #
+    @classmethod
+    async def fetch_async(cls,
+                          conn:       AsyncClient,
+                          address:    Pubkey,
+                          commitment: Optional[Commitment] = None) -> Optional["OpenOrdersV3"]:
+
+        resp = await conn.get_account_info(pubkey=MakePubkey(address), commitment=commitment)
+        return None if resp.value is None else cls.decode_fast(resp.value.data)
+
+    # ========================================
+    #
+    @classmethod
+    def fetch_multiple(cls,
+                       conn:       Client,
+                       addresses:  list[Pubkey],
+                       commitment: Optional[Commitment] = None) -> List[Optional["OpenOrdersV3"]]:
+
+        entries = FetchAccounts(connection   = conn, 
+                                pubkeys      = addresses,
+                                commitment   = commitment)
+        return [ OpenOrdersV3.decode_fast(entry.data) if entry else None for entry in entries ]
+
+    # ========================================
+    #
+    @classmethod
+    def decode(cls, data: bytes) -> "OpenOrdersV3":
+        dec = OpenOrdersV3.layout.parse(data)
+        return cls(padding1               = dec.padding1,
+                   accountFlags           = dec.accountFlags,
+                   market                 = dec.market,
+                   owner                  = dec.owner,
+                   baseTokenFree          = dec.baseTokenFree,
+                   baseTokenTotal         = dec.baseTokenTotal,
+                   quoteTokenFree         = dec.quoteTokenFree,
+                   quoteTokenTotal        = dec.quoteTokenTotal,
+                   freeSlotBits           = dec.freeSlotBits,
+                   isBidBits              = dec.isBidBits,
+                   orders                 = dec.orders,
+                   clientIds              = dec.clientIds,
+                   referrerRebatesAccrued = dec.referrerRebatesAccrued,
+                   padding2               = dec.padding2)
+
+    # ========================================
+    # Same result as `decode`, but uses precompiled `struct` offsets instead
+    # of generic `CStruct.parse`.
+    #
+    @classmethod
+    def decode_fast(cls, data: bytes) -> "OpenOrdersV3":
+        if RaydiumMetrics.SINK is None:
+            return cls(*cls.codec.unpack(data))
+        start: float = time.perf_counter()
+        result = cls(*cls.codec.unpack(data))
+        RaydiumMetrics.Observe(RAYDIUM_METRIC_DECODE, time.perf_counter() - start, account="OpenOrdersV3")
+        return result
+
+    # ========================================
+    # Inverse of `decode_fast`, raw account bytes.
+    #
+    def encode(self) -> bytes:
+        return self.codec.pack(self)
+
+    # ========================================
+    #
+    def to_json(self) -> OpenOrdersV3_JSON:
+        return {
+            "padding1":               self.padding1,
+            "accountFlags":           self.accountFlags,
+            "market":             str(self.market),
+            "owner":              str(self.owner),
+            "baseTokenFree":          self.baseTokenFree,
+            "baseTokenTotal":         self.baseTokenTotal,
+            "quoteTokenFree":         self.quoteTokenFree,
+            "quoteTokenTotal":        self.quoteTokenTotal,
+            "freeSlotBits":           self.freeSlotBits,
+            "isBidBits":              self.isBidBits,
+            "orders":                 self.orders,
+            "clientIds":              self.clientIds,
+            "referrerRebatesAccrued": self.referrerRebatesAccrued,
+            "padding2":               self.padding2,
+        }
+
+    # ========================================
+    #
+    @classmethod
+    def from_json(cls, obj: OpenOrdersV3_JSON) -> "OpenOrdersV3":
+        return cls(padding1               =            obj["padding1"],
+                   accountFlags           =            obj["accountFlags"],
+                   market                 = MakePubkey(obj["market"]),
+                   owner                  = MakePubkey(obj["owner"]),
+                   baseTokenFree          =            obj["baseTokenFree"],
+                   baseTokenTotal         =            obj["baseTokenTotal"],
+                   quoteTokenFree         =            obj["quoteTokenFree"],
+                   quoteTokenTotal        =            obj["quoteTokenTotal"],
+                   freeSlotBits           =            obj["freeSlotBits"],
+                   isBidBits              =            obj["isBidBits"],
+                   orders                 =            obj["orders"],
+                   clientIds              =            obj["clientIds"],
+                   referrerRebatesAccrued =            obj["referrerRebatesAccrued"],
+                   padding2               =            obj["padding2"])
+
+# =============================================================================
+# 
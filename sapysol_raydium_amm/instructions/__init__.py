@@ -1,6 +1,7 @@
 # =============================================================================
 # 
-from .swap import SwapArgs, Swap
+from .swap import SwapArgs, Swap, SwapAccountMetas, SwapTemplate
+from .ata  import CreateAtaIdempotentIx
 
 # =============================================================================
 # 
@@ -0,0 +1,16 @@
+# ================================================================================
+#
+from  __future__ import annotations
+from    solders.instruction    import Instruction
+from  ..src.pubkey             import SapysolPubkey, CreateAtaIx
+
+# ================================================================================
+# `CreateIdempotent` of the associated token program: same accounts as
+# `Create`, succeeds if the ATA already exists.
+#
+def CreateAtaIdempotentIx(tokenMint: SapysolPubkey, owner: SapysolPubkey, payer: SapysolPubkey) -> Instruction:
+    ix: Instruction = CreateAtaIx(tokenMint=tokenMint, owner=owner, payer=payer)
+    return Instruction(ix.program_id, bytes([1]), ix.accounts)
+
+# ================================================================================
+#
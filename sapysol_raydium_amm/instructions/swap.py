@@ -1,13 +1,15 @@
 # ================================================================================
 #
 from  __future__ import annotations
-from    typing                 import Optional, TypedDict, List
+from    typing                 import Optional, TypedDict, List, Tuple, ClassVar, Any, TYPE_CHECKING
 from    solders.instruction    import Instruction, AccountMeta
 from    spl.token.constants    import ASSOCIATED_TOKEN_PROGRAM_ID, TOKEN_PROGRAM_ID
-from    sapysol                import SapysolPubkey, MakePubkey, GetAta
-import  borsh_construct        as borsh
+import  struct
+from  ..src.pubkey             import SapysolPubkey, MakePubkey, GetAta
 from  ..src.constants          import RAYDIUM_SERUM_PROGAM_ID, RAYDIUM_LIQUIDITY_POOL_V4
-from  ..src.raydium_swap_cache import RaydiumSwapCacheEntry
+if TYPE_CHECKING:
+    # Annotations only, the swap cache module imports sapysol and solana-py
+    from ..src.raydium_swap_cache import RaydiumSwapCacheEntry
 
 # ================================================================================
 #
@@ -16,23 +18,30 @@ class SwapArgs(TypedDict):
     min_amount_out: int = 0
 
 # ================================================================================
+# Opcode, amount_in, min_amount_out. The borsh `layout` of the same data is
+# built on first access only, borsh_construct is slow to import.
 #
-layout = borsh.CStruct(
-    "amount_in"      / borsh.U64,
-    "min_amount_out" / borsh.U64,
-)
+SWAP_DATA: struct.Struct = struct.Struct("<BQQ")
+
+def __getattr__(name: str) -> Any:
+    if name == "layout":
+        import borsh_construct as borsh
+        global layout
+        layout = borsh.CStruct(
+            "amount_in"      / borsh.U64,
+            "min_amount_out" / borsh.U64,
+        )
+        return layout
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # ================================================================================
 #
-def Swap(args:               SwapArgs,
-         swapCache:          RaydiumSwapCacheEntry,
-         walletAddress:      SapysolPubkey,
-         tokenAtaFrom:       SapysolPubkey,
-         tokenAtaTo:         SapysolPubkey,
-         tokenProgramID:     SapysolPubkey = TOKEN_PROGRAM_ID,
-         remaining_accounts: Optional[List[AccountMeta]] = None) -> Instruction:
-
-    keys: list[AccountMeta] = [
+def SwapAccountMetas(swapCache:      RaydiumSwapCacheEntry,
+                     walletAddress:  SapysolPubkey,
+                     tokenAtaFrom:   SapysolPubkey,
+                     tokenAtaTo:     SapysolPubkey,
+                     tokenProgramID: SapysolPubkey = TOKEN_PROGRAM_ID) -> List[AccountMeta]:
+    return [
         AccountMeta(pubkey=MakePubkey(tokenProgramID),   is_signer=False, is_writable=False),
         AccountMeta(pubkey=swapCache.amm_id,             is_signer=False, is_writable=True ),
         AccountMeta(pubkey=swapCache.authority,          is_signer=False, is_writable=False),
@@ -52,15 +61,59 @@ def Swap(args:               SwapArgs,
         AccountMeta(pubkey=MakePubkey(tokenAtaTo),       is_signer=False, is_writable=True ), # UserDestTokenAccount
         AccountMeta(pubkey=MakePubkey(walletAddress),    is_signer=True,  is_writable=False)  # UserOwner
     ]
+
+# ================================================================================
+#
+def Swap(args:               SwapArgs,
+         swapCache:          RaydiumSwapCacheEntry,
+         walletAddress:      SapysolPubkey,
+         tokenAtaFrom:       SapysolPubkey,
+         tokenAtaTo:         SapysolPubkey,
+         tokenProgramID:     SapysolPubkey = TOKEN_PROGRAM_ID,
+         remaining_accounts: Optional[List[AccountMeta]] = None) -> Instruction:
+
+    keys: list[AccountMeta] = SwapAccountMetas(swapCache      = swapCache,
+                                               walletAddress  = walletAddress,
+                                               tokenAtaFrom   = tokenAtaFrom,
+                                               tokenAtaTo     = tokenAtaTo,
+                                               tokenProgramID = tokenProgramID)
     if remaining_accounts is not None:
         keys += remaining_accounts
-    identifier = b"\x09"
-    encoded_args = layout.build({
-        "amount_in":      args["amount_in"],
-        "min_amount_out": args["min_amount_out"],
-    })
-    data = identifier + encoded_args
+    data = SWAP_DATA.pack(9, args["amount_in"], args["min_amount_out"])
     return Instruction(RAYDIUM_LIQUIDITY_POOL_V4, data, keys)
 
+# ================================================================================
+# `Swap` for one pool and one pair of user ATAs with the account metas built
+# once. `build()` packs both u64 amounts into a preallocated buffer after
+# the opcode, the only per-call allocations are the data bytes and the
+# instruction itself.
+#
+class SwapTemplate:
+    DATA: ClassVar[struct.Struct] = SWAP_DATA
+
+    def __init__(self,
+                 swapCache:          RaydiumSwapCacheEntry,
+                 walletAddress:      SapysolPubkey,
+                 tokenAtaFrom:       SapysolPubkey,
+                 tokenAtaTo:         SapysolPubkey,
+                 tokenProgramID:     SapysolPubkey = TOKEN_PROGRAM_ID,
+                 remaining_accounts: Optional[List[AccountMeta]] = None):
+
+        keys: List[AccountMeta] = SwapAccountMetas(swapCache      = swapCache,
+                                                   walletAddress  = walletAddress,
+                                                   tokenAtaFrom   = tokenAtaFrom,
+                                                   tokenAtaTo     = tokenAtaTo,
+                                                   tokenProgramID = tokenProgramID)
+        if remaining_accounts is not None:
+            keys += remaining_accounts
+        self.ACCOUNTS: Tuple[AccountMeta, ...] = tuple(keys)
+        self.__DATA:   bytearray               = bytearray(SwapTemplate.DATA.pack(9, 0, 0))
+
+    # ========================================
+    #
+    def build(self, amountIn: int, minAmountOut: int = 0) -> Instruction:
+        SwapTemplate.DATA.pack_into(self.__DATA, 0, 9, amountIn, minAmountOut)
+        return Instruction(RAYDIUM_LIQUIDITY_POOL_V4, bytes(self.__DATA), self.ACCOUNTS)
+
 # ================================================================================
 #
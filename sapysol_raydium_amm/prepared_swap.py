@@ -0,0 +1,213 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: Raydium AMM prepared swap
+#
+# =============================================================================
+# 
+from   solana.rpc.api            import Client
+from   solana.rpc.async_api      import AsyncClient
+from   solders.pubkey            import Pubkey
+from   typing                    import List, Any, Union, Optional
+from   sapysol                   import *
+from   sapysol.token_cache       import TokenCacheEntry, TokenCache
+from   solders.instruction       import Instruction
+from   solders.system_program    import transfer, TransferParams
+from   spl.token.constants       import WRAPPED_SOL_MINT, TOKEN_PROGRAM_ID
+from   spl.token.instructions    import sync_native, SyncNativeParams
+from  .src.raydium_swap_cache    import RaydiumSwapCacheEntry
+from  .src.async_token_cache     import AsyncTokenCache
+from  .instructions.swap         import SwapTemplate
+from  .instructions.ata          import CreateAtaIdempotentIx
+from  .src.persistent_wsol       import PersistentWsol
+from  .src.compute_units         import RaydiumComputeUnits
+import asyncio
+
+# =============================================================================
+# Everything `GetSwapInstruction` resolves per call (token info, ATAs, ATA
+# existence, budget and wrap/unwrap instructions, the pool's compute unit
+# limits), resolved once per (pool, wallet, direction). `build()` does no
+# I/O.
+#
+# ATAs that are not known to exist are created with `CreateIdempotent`, so a
+# stale existence flag costs an instruction, never a failed transaction.
+#
+class PreparedSwap:
+    def __init__(self,
+                 swapCache:          RaydiumSwapCacheEntry,
+                 walletAddress:      SapysolPubkey,
+                 tokenFrom:          TokenCacheEntry,
+                 tokenTo:            TokenCacheEntry,
+                 tokenAtaFromExists: bool,
+                 tokenAtaToExists:   bool,
+                 wrapSol:            bool = True,
+                 unwrapSol:          bool = True,
+                 txComputePrice:     int  = 1,
+                 txComputeUnits:     Optional[int] = None):
+
+        # `TokenCache` returns the mint as a string on a cold fetch
+        mintFrom: Pubkey = MakePubkey(tokenFrom.token_mint)
+        mintTo:   Pubkey = MakePubkey(tokenTo.token_mint)
+        assert(mintFrom in [swapCache.base_mint, swapCache.quote_mint])
+        assert(mintTo   in [swapCache.base_mint, swapCache.quote_mint])
+        assert(mintFrom != mintTo)
+
+        self.SWAP_CACHE:            RaydiumSwapCacheEntry = swapCache
+        self.WALLET_ADDRESS:        Pubkey                = MakePubkey(walletAddress)
+        self.TOKEN_FROM:            TokenCacheEntry       = tokenFrom
+        self.TOKEN_TO:              TokenCacheEntry       = tokenTo
+        self.TOKEN_FROM_MINT:       Pubkey                = mintFrom
+        self.TOKEN_TO_MINT:         Pubkey                = mintTo
+        self.BASE_TO_QUOTE:         bool                  = mintFrom == swapCache.base_mint
+        self.TOKEN_ATA_FROM:        Pubkey                = GetAta(tokenMint=mintFrom, owner=self.WALLET_ADDRESS)
+        self.TOKEN_ATA_TO:          Pubkey                = GetAta(tokenMint=mintTo,   owner=self.WALLET_ADDRESS)
+        self.WRAP_SOL:              bool                  = wrapSol   and mintFrom == WRAPPED_SOL_MINT
+        self.UNWRAP_SOL:            bool                  = unwrapSol and mintTo   == WRAPPED_SOL_MINT
+        self.USES_WSOL:             bool                  = WRAPPED_SOL_MINT in (mintFrom, mintTo)
+        self.TOKEN_ATA_FROM_EXISTS: bool                  = tokenAtaFromExists
+        self.TOKEN_ATA_TO_EXISTS:   bool                  = tokenAtaToExists
+
+        self.__COMPUTE_BUDGET_IX:  Optional[Instruction] = None if txComputeUnits is None else ComputeBudgetIx(units=txComputeUnits)
+        self.__COMPUTE_PRICE_IX:   Instruction  = ComputePriceIx(txComputePrice)
+        self.__CREATE_ATA_FROM_IX: Instruction  = CreateAtaIdempotentIx(tokenMint=mintFrom, owner=self.WALLET_ADDRESS, payer=self.WALLET_ADDRESS)
+        self.__CREATE_ATA_TO_IX:   Instruction  = CreateAtaIdempotentIx(tokenMint=mintTo,   owner=self.WALLET_ADDRESS, payer=self.WALLET_ADDRESS)
+        self.__SYNC_NATIVE_IX:     Instruction  = sync_native(SyncNativeParams(program_id=TOKEN_PROGRAM_ID, account=self.TOKEN_ATA_FROM))
+        self.__UNWRAP_SOL_IX:      Instruction  = UnwrapSolInstruction(owner=self.WALLET_ADDRESS)
+        self.__SWAP_TEMPLATE:      SwapTemplate = SwapTemplate(swapCache      = swapCache,
+                                                                walletAddress  = self.WALLET_ADDRESS,
+                                                                tokenAtaFrom   = self.TOKEN_ATA_FROM,
+                                                                tokenAtaTo     = self.TOKEN_ATA_TO,
+                                                                tokenProgramID = tokenTo.program_id)
+        # Loads the pool's measured limits now (storage read, possibly opening
+        # the database), so a `build()` without fixed units does no I/O
+        RaydiumComputeUnits.GetUnits(poolAddress=swapCache.amm_id, variant=RaydiumComputeUnits.Variant(baseToQuote=self.BASE_TO_QUOTE, wrapSol=False, createAta=False))
+
+    # ========================================
+    #
+    def SetComputePrice(self, txComputePrice: int):
+        self.__COMPUTE_PRICE_IX = ComputePriceIx(txComputePrice)
+
+    # None: per-pool limit from `RaydiumComputeUnits`, looked up on every `build()`.
+    def SetComputeUnits(self, txComputeUnits: Optional[int]):
+        self.__COMPUTE_BUDGET_IX = None if txComputeUnits is None else ComputeBudgetIx(units=txComputeUnits)
+
+    # ========================================
+    # Call after a swap transaction landed: ATAs it created now exist
+    # (the WSOL ATA closed by unwrapping does not).
+    #
+    def MarkAtasCreated(self):
+        self.TOKEN_ATA_FROM_EXISTS = self.TOKEN_ATA_FROM_EXISTS or self.WRAP_SOL
+        self.TOKEN_ATA_TO_EXISTS   = not self.UNWRAP_SOL
+
+    # ========================================
+    #
+    def RefreshAtas(self, connection: Client):
+        accounts = connection.get_multiple_accounts(pubkeys=[self.TOKEN_ATA_FROM, self.TOKEN_ATA_TO]).value
+        self.TOKEN_ATA_FROM_EXISTS = accounts[0] is not None
+        self.TOKEN_ATA_TO_EXISTS   = accounts[1] is not None
+
+    async def RefreshAtasAsync(self, connection: AsyncClient):
+        accounts = (await connection.get_multiple_accounts(pubkeys=[self.TOKEN_ATA_FROM, self.TOKEN_ATA_TO])).value
+        self.TOKEN_ATA_FROM_EXISTS = accounts[0] is not None
+        self.TOKEN_ATA_TO_EXISTS   = accounts[1] is not None
+
+    # ========================================
+    # Amounts are in lamports (raw token units). `dryRun` is for simulated
+    # transactions: persistent WSOL top-ups are built but not recorded as
+    # pending.
+    #
+    def build(self, amountIn: int, minOut: int = 0, dryRun: bool = False) -> List[Instruction]:
+        ixList: List[Instruction] = [self.__COMPUTE_BUDGET_IX, self.__COMPUTE_PRICE_IX]
+        # Persistent WSOL account replaces wrap/unwrap when enabled for the wallet
+        persistentWsol: Optional[PersistentWsol] = PersistentWsol.Get(self.WALLET_ADDRESS) if self.USES_WSOL else None
+        # Wrap SOL?
+        if persistentWsol is not None and self.TOKEN_FROM_MINT == WRAPPED_SOL_MINT:
+            ixList += persistentWsol.GetTopUpInstructions(amountIn=amountIn, dryRun=dryRun)
+        elif self.WRAP_SOL:
+            if not self.TOKEN_ATA_FROM_EXISTS:
+                ixList.append(self.__CREATE_ATA_FROM_IX)
+            ixList.append(transfer(TransferParams(from_pubkey=self.WALLET_ADDRESS, to_pubkey=self.TOKEN_ATA_FROM, lamports=amountIn)))
+            ixList.append(self.__SYNC_NATIVE_IX)
+        # Create ATA of a token TO if needed
+        if persistentWsol is not None and self.TOKEN_TO_MINT == WRAPPED_SOL_MINT:
+            ixList += persistentWsol.GetCreateInstructions()
+        elif not self.TOKEN_ATA_TO_EXISTS:
+            ixList.append(self.__CREATE_ATA_TO_IX)
+        # Swap
+        ixList.append(self.__SWAP_TEMPLATE.build(amountIn=amountIn, minAmountOut=minOut))
+        # Unwrap SOL and close account if needed
+        if self.UNWRAP_SOL and persistentWsol is None:
+            ixList.append(self.__UNWRAP_SOL_IX)
+        # Budget
+        if ixList[0] is None:
+            ixList[0] = RaydiumComputeUnits.GetBudgetIx(poolAddress = self.SWAP_CACHE.amm_id,
+                                                        variant     = RaydiumComputeUnits.VariantFromInstructions(baseToQuote=self.BASE_TO_QUOTE, ixList=ixList[1:]))
+        return ixList
+
+    # ========================================
+    # One token lookup per side (cached) and one `getMultipleAccounts` for
+    # both ATAs.
+    #
+    @staticmethod
+    def Prepare(connection:     Client,
+                swapCache:      RaydiumSwapCacheEntry,
+                walletAddress:  SapysolPubkey,
+                tokenFrom:      SapysolPubkey,
+                tokenTo:        SapysolPubkey,
+                wrapSol:        bool = True,
+                unwrapSol:      bool = True,
+                txComputePrice: int  = 1) -> "PreparedSwap":
+
+        prepared = PreparedSwap(swapCache          = swapCache,
+                                walletAddress      = walletAddress,
+                                tokenFrom          = TokenCache.GetToken(connection=connection, tokenMint=tokenFrom),
+                                tokenTo            = TokenCache.GetToken(connection=connection, tokenMint=tokenTo  ),
+                                tokenAtaFromExists = False,
+                                tokenAtaToExists   = False,
+                                wrapSol            = wrapSol,
+                                unwrapSol          = unwrapSol,
+                                txComputePrice     = txComputePrice)
+        prepared.RefreshAtas(connection=connection)
+        return prepared
+
+    # ========================================
+    #
+    @staticmethod
+    async def PrepareAsync(connection:     AsyncClient,
+                           swapCache:      RaydiumSwapCacheEntry,
+                           walletAddress:  SapysolPubkey,
+                           tokenFrom:      SapysolPubkey,
+                           tokenTo:        SapysolPubkey,
+                           wrapSol:        bool = True,
+                           unwrapSol:      bool = True,
+                           txComputePrice: int  = 1) -> "PreparedSwap":
+
+        cachedTokenFrom, cachedTokenTo = await asyncio.gather(AsyncTokenCache.GetToken(connection=connection, tokenMint=tokenFrom),
+                                                              AsyncTokenCache.GetToken(connection=connection, tokenMint=tokenTo  ))
+        prepared = PreparedSwap(swapCache          = swapCache,
+                                walletAddress      = walletAddress,
+                                tokenFrom          = cachedTokenFrom,
+                                tokenTo            = cachedTokenTo,
+                                tokenAtaFromExists = False,
+                                tokenAtaToExists   = False,
+                                wrapSol            = wrapSol,
+                                unwrapSol          = unwrapSol,
+                                txComputePrice     = txComputePrice)
+        await prepared.RefreshAtasAsync(connection=connection)
+        return prepared
+
+# =============================================================================
+# 
@@ -19,13 +19,23 @@
 # =============================================================================
 # 
 from   solana.rpc.api          import Client, Pubkey, Keypair
-from   typing                  import List, Any, TypedDict, Union, Optional
+from   solana.rpc.commitment   import Commitment
+from   typing                  import List, Dict, Any, TypedDict, Union, Optional
 from   sapysol                 import *
 from   sapysol.token_cache     import TokenCacheEntry, TokenCache
 from   solders.instruction     import Instruction
 from   spl.token.constants     import WRAPPED_SOL_MINT
 from  .src.raydium_swap_cache  import RaydiumSwapCacheEntry, RaydiumSwapCache
+from  .src.reserve_snapshot    import ReserveSnapshot, ReserveSnapshotEntry
 from  .instructions.swap       import SwapArgs, Swap
+from  .prepared_swap           import PreparedSwap
+from  .src.persistent_wsol     import PersistentWsol
+from  .src.compute_units       import RaydiumComputeUnits, RAYDIUM_DEFAULT_COMPUTE_UNITS
+from  .src.pool_index          import RaydiumPoolIndex
+from  .src.raydium_amm_state   import RaydiumAmmStateCache, RaydiumAmmStateEntry
+from  .src.metrics             import RaydiumMetrics, RAYDIUM_METRIC_SWAP_STAGE
+from  .src.raydium_serum_cache import RaydiumSerumCache
+from  .src.orderbook           import SerumOrderbook, FetchSerumOrderbook
 import logging
 import json
 import os
@@ -51,12 +61,67 @@ class SapysolRaydiumAMM:
         swapCache: RaydiumSwapCacheEntry = RaydiumSwapCache.GetSwapCacheFromMarketAddress(connection=connection, marketAddress=marketAddress)
         return SapysolRaydiumAMM(connection=connection, swapCache=swapCache)
 
+    # ========================================
+    # Looks the pool up in `RaydiumPoolIndex` (a missing or stale entry for
+    # `baseMint` is rescanned); pools listed as quote/base are used when
+    # there is no base/quote one. With several pools the first is used.
+    #
+    @staticmethod
+    def FromMintPair(connection: Client, baseMint: SapysolPubkey, quoteMint: SapysolPubkey) -> "SapysolRaydiumAMM":
+        pools: List[Pubkey] = RaydiumPoolIndex.GetPools(baseMint=baseMint, quoteMint=quoteMint, connection=connection) or \
+                              RaydiumPoolIndex.GetPools(baseMint=quoteMint, quoteMint=baseMint, connection=connection)
+        if not pools:
+            raise ValueError(f"Raydium AMM pool not found: {str(baseMint)}/{str(quoteMint)}")
+        return SapysolRaydiumAMM.FromPoolAddress(connection=connection, poolAddress=pools[0])
+
     # ========================================
     #
     def UpdateCache(self):
         self.SWAP_CACHE: RaydiumSwapCacheEntry = RaydiumSwapCache.UpdateSwapCacheFromPoolAddress(connection  = self.CONNECTION, 
                                                                                                  poolAddress = self.SWAP_CACHE.amm_id)
 
+    # ========================================
+    # Dynamic pool state (status, fees, PnL, swap counters, lpReserve),
+    # refreshed with one sliced account read when older than `maxAgeSlots`
+    # (default `RaydiumAmmStateCache.TTL_SLOTS`).
+    #
+    def GetState(self, maxAgeSlots: Optional[int] = None, commitment: Optional[Commitment] = None) -> Optional[RaydiumAmmStateEntry]:
+        return RaydiumAmmStateCache.GetState(connection=self.CONNECTION, poolAddress=self.SWAP_CACHE.amm_id, maxAgeSlots=maxAgeSlots, commitment=commitment)
+
+    def RefreshState(self, commitment: Optional[Commitment] = None) -> Optional[RaydiumAmmStateEntry]:
+        return RaydiumAmmStateCache.Refresh(connection=self.CONNECTION, poolAddresses=[self.SWAP_CACHE.amm_id], commitment=commitment).get(self.SWAP_CACHE.amm_id)
+
+    # ========================================
+    # Context slot / local unix time of the last dynamic state refresh,
+    # None if it was never loaded.
+    #
+    def GetStateRefreshSlot(self) -> Optional[int]:
+        entry = RaydiumAmmStateCache.Get(poolAddress=self.SWAP_CACHE.amm_id)
+        return None if entry is None else entry.slot
+
+    def GetStateRefreshTime(self) -> Optional[float]:
+        entry = RaydiumAmmStateCache.Get(poolAddress=self.SWAP_CACHE.amm_id)
+        return None if entry is None else entry.refreshTime
+
+    # ========================================
+    # Effective reserves and vault balances at the latest slot.
+    #
+    def GetReserveSnapshot(self, commitment: Optional[Commitment] = None) -> Optional[ReserveSnapshotEntry]:
+        return ReserveSnapshot.Fetch(connection=self.CONNECTION, swapCache=self.SWAP_CACHE, commitment=commitment)
+
+    # ========================================
+    # Serum bids and asks in UI units, best `depth` price levels per side
+    # (whole book if None). Lot sizes come from the cached market.
+    #
+    def GetOrderbook(self, depth: Optional[int] = None, commitment: Optional[Commitment] = None) -> SerumOrderbook:
+        market = RaydiumSerumCache.GetRaydiumSerum(connection=self.CONNECTION, marketAddress=self.SWAP_CACHE.market_id)
+        return FetchSerumOrderbook(connection    = self.CONNECTION,
+                                   market        = market,
+                                   baseDecimals  = self.SWAP_CACHE.base_decimals,
+                                   quoteDecimals = self.SWAP_CACHE.quote_decimals,
+                                   depth         = depth,
+                                   commitment    = commitment)
+
     # ========================================
     #
     def GetSwapInstruction(self, 
@@ -68,13 +133,16 @@ class SapysolRaydiumAMM:
                            inLamports:        bool = True,
                            wrapSol:           bool = True,
                            unwrapSol:         bool = True,
-                           txComputePrice:    int = 1) -> Optional[List[Instruction]]:
+                           txComputePrice:    int = 1,
+                           txComputeUnits:    Optional[int] = None) -> Optional[List[Instruction]]:
 
         assert(MakePubkey(tokenFrom) in [self.SWAP_CACHE.base_mint, self.SWAP_CACHE.quote_mint])
         assert(MakePubkey(tokenTo)   in [self.SWAP_CACHE.base_mint, self.SWAP_CACHE.quote_mint])
 
+        stages = RaydiumMetrics.Stages(RAYDIUM_METRIC_SWAP_STAGE)
         cachedTokenFrom: TokenCacheEntry = TokenCache.GetToken(connection=self.CONNECTION, tokenMint=tokenFrom)
         cachedTokenTo:   TokenCacheEntry = TokenCache.GetToken(connection=self.CONNECTION, tokenMint=tokenTo  )
+        stages.Mark("tokens")
 
         amountInLamports:           int = amountIn if inLamports else amountIn * (10**cachedTokenFrom.decimals)
         desiredAmountOutInLamports: int = 0 if desiredAmountOut is None       \
@@ -90,27 +158,105 @@ class SapysolRaydiumAMM:
                       tokenAtaFrom   = GetAta(tokenMint=tokenFrom, owner=walletAddress),
                       tokenAtaTo     = GetAta(tokenMint=tokenTo,   owner=walletAddress),
                       tokenProgramID = cachedTokenTo.program_id)
+        stages.Mark("swap")
+
+        # Persistent WSOL account replaces wrap/unwrap when enabled for the wallet
+        persistentWsol: Optional[PersistentWsol] = PersistentWsol.Get(walletAddress)
 
         ixList: List[Instruction] = []
-        # 1. Budget
-        ixList.append(ComputeBudgetIx())
+        # 1. Budget (limit is filled in at step 6)
+        ixList.append(None)
         ixList.append(ComputePriceIx(txComputePrice))
+        stages.Mark("budget")
         # 2. Wrap SOL?
-        if tokenFrom == WRAPPED_SOL_MINT:
-            if wrapSol:
+        if MakePubkey(tokenFrom) == WRAPPED_SOL_MINT:
+            if persistentWsol is not None:
+                ixList += persistentWsol.GetTopUpInstructions(amountIn=amountInLamports)
+            elif wrapSol:
                 ixList += WrapSolInstructions(connection=self.CONNECTION, lamports=amountInLamports, owner=walletAddress)
+        stages.Mark("wrap")
 
         # 3. Create ATA of a token TO if needed
-        tokenToAtaIx = GetOrCreateAtaIx(connection=self.CONNECTION, tokenMint=tokenTo, owner=walletAddress)
-        if tokenToAtaIx.ix:
-            ixList.append(tokenToAtaIx.ix)
+        if MakePubkey(tokenTo) == WRAPPED_SOL_MINT and persistentWsol is not None:
+            ixList += persistentWsol.GetCreateInstructions()
+        else:
+            tokenToAtaIx = GetOrCreateAtaIx(connection=self.CONNECTION, tokenMint=tokenTo, owner=walletAddress)
+            if tokenToAtaIx.ix:
+                ixList.append(tokenToAtaIx.ix)
+        stages.Mark("ata")
         # 4. Swap
         ixList.append(ixSwap)
         # 5. Unwrap SOL and close account if needed
-        if tokenTo == WRAPPED_SOL_MINT and unwrapSol:
+        if MakePubkey(tokenTo) == WRAPPED_SOL_MINT and unwrapSol and persistentWsol is None:
             ixList.append(UnwrapSolInstruction(owner=walletAddress))
+        stages.Mark("unwrap")
 
+        # 6. Budget: explicit units or the per-pool limit measured by `ProfileComputeUnits`
+        if txComputeUnits is None:
+            variant: str = RaydiumComputeUnits.VariantFromInstructions(baseToQuote=MakePubkey(tokenFrom) == self.SWAP_CACHE.base_mint, ixList=ixList[1:])
+            ixList[0] = RaydiumComputeUnits.GetBudgetIx(poolAddress=self.SWAP_CACHE.amm_id, variant=variant)
+        else:
+            ixList[0] = ComputeBudgetIx(units=txComputeUnits)
+        stages.Mark("budget")
+        stages.Done()
         return ixList
 
+    # ========================================
+    # Keeps a long-lived WSOL account for `walletAddress`: swaps from/to SOL
+    # stop wrapping/unwrapping and top up the account in batches of
+    # `topUpAmount` lamports once it drops below `minBalance`.
+    #
+    def EnablePersistentWsol(self, walletAddress: SapysolPubkey, minBalance: int, topUpAmount: int) -> PersistentWsol:
+        return PersistentWsol.Enable(connection=self.CONNECTION, walletAddress=walletAddress, minBalance=minBalance, topUpAmount=topUpAmount)
+
+    # ========================================
+    # Simulates the swap with and without ATA creation and records the
+    # compute units per variant, `GetSwapInstruction` and `PreparedSwap`
+    # then request a tight limit for this pool instead of 1.4M.
+    # Returns {variant: units} for successful simulations. Simulated
+    # transactions do not touch persistent WSOL pending amounts.
+    #
+    def ProfileComputeUnits(self,
+                            walletAddress: SapysolPubkey,
+                            tokenFrom:     SapysolPubkey,
+                            tokenTo:       SapysolPubkey,
+                            amountIn:      int,
+                            minOut:        int  = 0,
+                            wrapSol:       bool = True,
+                            unwrapSol:     bool = True) -> Dict[str, int]:
+        prepared: PreparedSwap = self.PrepareSwap(walletAddress=walletAddress, tokenFrom=tokenFrom, tokenTo=tokenTo, wrapSol=wrapSol, unwrapSol=unwrapSol)
+        prepared.SetComputeUnits(RAYDIUM_DEFAULT_COMPUTE_UNITS)
+
+        result: Dict[str, int] = {}
+        for atasExist in [True, False]:
+            prepared.TOKEN_ATA_FROM_EXISTS = prepared.TOKEN_ATA_TO_EXISTS = atasExist
+            ixList:  List[Instruction] = prepared.build(amountIn=amountIn, minOut=minOut, dryRun=True)
+            variant: str               = RaydiumComputeUnits.VariantFromInstructions(baseToQuote=prepared.BASE_TO_QUOTE, ixList=ixList[1:])
+            units:   Optional[int]     = RaydiumComputeUnits.Simulate(connection=self.CONNECTION, payer=walletAddress, ixList=ixList)
+            if units is not None:
+                RaydiumComputeUnits.Record(poolAddress=self.SWAP_CACHE.amm_id, variant=variant, unitsConsumed=units)
+                result[variant] = units
+        return result
+
+    # ========================================
+    # Resolves token info and ATAs once for (pool, wallet, direction); the
+    # returned `PreparedSwap.build(amountIn, minOut)` does no I/O.
+    #
+    def PrepareSwap(self,
+                    walletAddress:  SapysolPubkey,
+                    tokenFrom:      SapysolPubkey,
+                    tokenTo:        SapysolPubkey,
+                    wrapSol:        bool = True,
+                    unwrapSol:      bool = True,
+                    txComputePrice: int  = 1) -> PreparedSwap:
+        return PreparedSwap.Prepare(connection     = self.CONNECTION,
+                                    swapCache      = self.SWAP_CACHE,
+                                    walletAddress  = walletAddress,
+                                    tokenFrom      = tokenFrom,
+                                    tokenTo        = tokenTo,
+                                    wrapSol        = wrapSol,
+                                    unwrapSol      = unwrapSol,
+                                    txComputePrice = txComputePrice)
+
 # =============================================================================
 # 
@@ -0,0 +1,275 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: Raydium AMM async
+#
+# =============================================================================
+# 
+from   solana.rpc.async_api      import AsyncClient
+from   solana.rpc.commitment     import Commitment
+from   solders.pubkey            import Pubkey
+from   typing                    import List, Dict, Union, Optional
+from   sapysol                   import *
+from   solders.instruction       import Instruction
+from   solders.system_program    import transfer, TransferParams
+from   spl.token.constants       import WRAPPED_SOL_MINT, TOKEN_PROGRAM_ID
+from   spl.token.instructions    import sync_native, SyncNativeParams
+from  .src.raydium_swap_cache    import RaydiumSwapCacheEntry, RaydiumSwapCache
+from  .src.async_token_cache     import AsyncTokenCache
+from  .src.reserve_snapshot      import ReserveSnapshot, ReserveSnapshotEntry
+from  .instructions.swap         import SwapArgs, Swap
+from  .prepared_swap             import PreparedSwap
+from  .src.persistent_wsol       import PersistentWsol
+from  .src.compute_units         import RaydiumComputeUnits, RAYDIUM_DEFAULT_COMPUTE_UNITS
+from  .src.pool_index            import RaydiumPoolIndex
+from  .src.raydium_amm_state     import RaydiumAmmStateCache, RaydiumAmmStateEntry
+from  .src.metrics               import RaydiumMetrics, RAYDIUM_METRIC_SWAP_STAGE
+from  .src.raydium_serum_cache   import RaydiumSerumCache
+from  .src.orderbook             import SerumOrderbook, FetchSerumOrderbookAsync
+import asyncio
+
+# =============================================================================
+# 
+class AsyncSapysolRaydiumAMM:
+    def __init__(self, connection: AsyncClient, swapCache: RaydiumSwapCacheEntry):
+        self.CONNECTION: AsyncClient           = connection
+        self.SWAP_CACHE: RaydiumSwapCacheEntry = swapCache
+
+    # ========================================
+    #
+    @staticmethod
+    async def FromPoolAddress(connection: AsyncClient, poolAddress: SapysolPubkey) -> "AsyncSapysolRaydiumAMM":
+        swapCache: RaydiumSwapCacheEntry = await RaydiumSwapCache.GetSwapCacheFromPoolAddressAsync(connection=connection, poolAddress=poolAddress)
+        return AsyncSapysolRaydiumAMM(connection=connection, swapCache=swapCache)
+
+    # ========================================
+    #
+    @staticmethod
+    async def FromMarketAddress(connection: AsyncClient, marketAddress: SapysolPubkey) -> "AsyncSapysolRaydiumAMM":
+        swapCache: RaydiumSwapCacheEntry = await RaydiumSwapCache.GetSwapCacheFromMarketAddressAsync(connection=connection, marketAddress=marketAddress)
+        return AsyncSapysolRaydiumAMM(connection=connection, swapCache=swapCache)
+
+    # ========================================
+    # See `SapysolRaydiumAMM.FromMintPair`.
+    #
+    @staticmethod
+    async def FromMintPair(connection: AsyncClient, baseMint: SapysolPubkey, quoteMint: SapysolPubkey) -> "AsyncSapysolRaydiumAMM":
+        pools: List[Pubkey] = await RaydiumPoolIndex.GetPoolsAsync(baseMint=baseMint, quoteMint=quoteMint, connection=connection) or \
+                              await RaydiumPoolIndex.GetPoolsAsync(baseMint=quoteMint, quoteMint=baseMint, connection=connection)
+        if not pools:
+            raise ValueError(f"Raydium AMM pool not found: {str(baseMint)}/{str(quoteMint)}")
+        return await AsyncSapysolRaydiumAMM.FromPoolAddress(connection=connection, poolAddress=pools[0])
+
+    # ========================================
+    #
+    async def UpdateCache(self):
+        self.SWAP_CACHE: RaydiumSwapCacheEntry = await RaydiumSwapCache.UpdateSwapCacheFromPoolAddressAsync(connection  = self.CONNECTION, 
+                                                                                                            poolAddress = self.SWAP_CACHE.amm_id)
+
+    # ========================================
+    # See `SapysolRaydiumAMM.GetState`.
+    #
+    async def GetState(self, maxAgeSlots: Optional[int] = None, commitment: Optional[Commitment] = None) -> Optional[RaydiumAmmStateEntry]:
+        return await RaydiumAmmStateCache.GetStateAsync(connection=self.CONNECTION, poolAddress=self.SWAP_CACHE.amm_id, maxAgeSlots=maxAgeSlots, commitment=commitment)
+
+    async def RefreshState(self, commitment: Optional[Commitment] = None) -> Optional[RaydiumAmmStateEntry]:
+        return (await RaydiumAmmStateCache.RefreshAsync(connection=self.CONNECTION, poolAddresses=[self.SWAP_CACHE.amm_id], commitment=commitment)).get(self.SWAP_CACHE.amm_id)
+
+    # ========================================
+    # Context slot / local unix time of the last dynamic state refresh,
+    # None if it was never loaded.
+    #
+    def GetStateRefreshSlot(self) -> Optional[int]:
+        entry = RaydiumAmmStateCache.Get(poolAddress=self.SWAP_CACHE.amm_id)
+        return None if entry is None else entry.slot
+
+    def GetStateRefreshTime(self) -> Optional[float]:
+        entry = RaydiumAmmStateCache.Get(poolAddress=self.SWAP_CACHE.amm_id)
+        return None if entry is None else entry.refreshTime
+
+    # ========================================
+    # Effective reserves and vault balances at the latest slot.
+    #
+    async def GetReserveSnapshot(self, commitment: Optional[Commitment] = None) -> Optional[ReserveSnapshotEntry]:
+        return await ReserveSnapshot.FetchAsync(connection=self.CONNECTION, swapCache=self.SWAP_CACHE, commitment=commitment)
+
+    # ========================================
+    # Serum bids and asks in UI units, best `depth` price levels per side
+    # (whole book if None). Lot sizes come from the cached market.
+    #
+    async def GetOrderbook(self, depth: Optional[int] = None, commitment: Optional[Commitment] = None) -> SerumOrderbook:
+        market = await RaydiumSerumCache.GetRaydiumSerumAsync(connection=self.CONNECTION, marketAddress=self.SWAP_CACHE.market_id)
+        return await FetchSerumOrderbookAsync(connection    = self.CONNECTION,
+                                              market        = market,
+                                              baseDecimals  = self.SWAP_CACHE.base_decimals,
+                                              quoteDecimals = self.SWAP_CACHE.quote_decimals,
+                                              depth         = depth,
+                                              commitment    = commitment)
+
+    # ========================================
+    #
+    async def __AccountExists(self, pubkey: Pubkey) -> bool:
+        return (await self.CONNECTION.get_account_info(pubkey=pubkey)).value is not None
+
+    async def __NoAccountCheck(self) -> bool:
+        return True
+
+    # ========================================
+    # Same as `SapysolRaydiumAMM.GetSwapInstruction`; token lookups and ATA
+    # existence checks are independent and run concurrently.
+    #
+    async def GetSwapInstruction(self, 
+                                 walletAddress:     SapysolPubkey,
+                                 tokenFrom:         SapysolPubkey, # Sanity
+                                 tokenTo:           SapysolPubkey, # Sanity
+                                 amountIn:          Union[int, float],
+                                 desiredAmountOut:  Optional[Union[int, float]] = None,
+                                 inLamports:        bool = True,
+                                 wrapSol:           bool = True,
+                                 unwrapSol:         bool = True,
+                                 txComputePrice:    int = 1,
+                                 txComputeUnits:    Optional[int] = None) -> Optional[List[Instruction]]:
+
+        walletAddress: Pubkey = MakePubkey(walletAddress)
+        tokenFrom:     Pubkey = MakePubkey(tokenFrom)
+        tokenTo:       Pubkey = MakePubkey(tokenTo)
+        assert(tokenFrom in [self.SWAP_CACHE.base_mint, self.SWAP_CACHE.quote_mint])
+        assert(tokenTo   in [self.SWAP_CACHE.base_mint, self.SWAP_CACHE.quote_mint])
+
+        stages = RaydiumMetrics.Stages(RAYDIUM_METRIC_SWAP_STAGE)
+        tokenAtaFrom: Pubkey = GetAta(tokenMint=tokenFrom, owner=walletAddress)
+        tokenAtaTo:   Pubkey = GetAta(tokenMint=tokenTo,   owner=walletAddress)
+        # Persistent WSOL account replaces wrap/unwrap when enabled for the wallet
+        persistentWsol: Optional[PersistentWsol] = PersistentWsol.Get(walletAddress)
+        needWrap:       bool = tokenFrom == WRAPPED_SOL_MINT and wrapSol   and persistentWsol is None
+        needUnwrap:     bool = tokenTo   == WRAPPED_SOL_MINT and unwrapSol and persistentWsol is None
+        managedAtaTo:   bool = tokenTo   == WRAPPED_SOL_MINT and persistentWsol is not None
+
+        cachedTokenFrom, cachedTokenTo, tokenToAtaExists, wsolAtaExists = await asyncio.gather(
+            AsyncTokenCache.GetToken(connection=self.CONNECTION, tokenMint=tokenFrom),
+            AsyncTokenCache.GetToken(connection=self.CONNECTION, tokenMint=tokenTo  ),
+            self.__AccountExists(pubkey=tokenAtaTo)   if not managedAtaTo else self.__NoAccountCheck(),
+            self.__AccountExists(pubkey=tokenAtaFrom) if needWrap         else self.__NoAccountCheck())
+        # Token and ATA lookups run concurrently and are timed together
+        stages.Mark("tokens")
+
+        amountInLamports:           int = amountIn if inLamports else amountIn * (10**cachedTokenFrom.decimals)
+        desiredAmountOutInLamports: int = 0 if desiredAmountOut is None       \
+                                          else desiredAmountOut if inLamports \
+                                                              else desiredAmountOut * (10**cachedTokenTo.decimals)
+
+        amountInLamports           = int(amountInLamports)
+        desiredAmountOutInLamports = int(desiredAmountOutInLamports)
+
+        ixSwap = Swap(args           = SwapArgs(amount_in=amountInLamports, min_amount_out=desiredAmountOutInLamports),
+                      swapCache      = self.SWAP_CACHE,
+                      walletAddress  = walletAddress,
+                      tokenAtaFrom   = tokenAtaFrom,
+                      tokenAtaTo     = tokenAtaTo,
+                      tokenProgramID = cachedTokenTo.program_id)
+        stages.Mark("swap")
+
+        ixList: List[Instruction] = []
+        # 1. Budget (limit is filled in at step 6)
+        ixList.append(None)
+        ixList.append(ComputePriceIx(txComputePrice))
+        stages.Mark("budget")
+        # 2. Wrap SOL?
+        if tokenFrom == WRAPPED_SOL_MINT and persistentWsol is not None:
+            ixList += persistentWsol.GetTopUpInstructions(amountIn=amountInLamports)
+        if needWrap:
+            if not wsolAtaExists:
+                ixList.append(CreateAtaIx(tokenMint=WRAPPED_SOL_MINT, owner=walletAddress, payer=walletAddress))
+            ixList.append(transfer(TransferParams(from_pubkey=walletAddress, to_pubkey=tokenAtaFrom, lamports=amountInLamports)))
+            ixList.append(sync_native(SyncNativeParams(program_id=TOKEN_PROGRAM_ID, account=tokenAtaFrom)))
+        stages.Mark("wrap")
+
+        # 3. Create ATA of a token TO if needed
+        if managedAtaTo:
+            ixList += persistentWsol.GetCreateInstructions()
+        elif not tokenToAtaExists:
+            ixList.append(CreateAtaIx(tokenMint=tokenTo, owner=walletAddress, payer=walletAddress))
+        stages.Mark("ata")
+        # 4. Swap
+        ixList.append(ixSwap)
+        # 5. Unwrap SOL and close account if needed
+        if needUnwrap:
+            ixList.append(UnwrapSolInstruction(owner=walletAddress))
+        stages.Mark("unwrap")
+
+        # 6. Budget: explicit units or the per-pool limit measured by `ProfileComputeUnits`
+        if txComputeUnits is None:
+            variant: str = RaydiumComputeUnits.VariantFromInstructions(baseToQuote=tokenFrom == self.SWAP_CACHE.base_mint, ixList=ixList[1:])
+            ixList[0] = RaydiumComputeUnits.GetBudgetIx(poolAddress=self.SWAP_CACHE.amm_id, variant=variant)
+        else:
+            ixList[0] = ComputeBudgetIx(units=txComputeUnits)
+        stages.Mark("budget")
+        stages.Done()
+        return ixList
+
+    # ========================================
+    # See `SapysolRaydiumAMM.EnablePersistentWsol`.
+    #
+    async def EnablePersistentWsol(self, walletAddress: SapysolPubkey, minBalance: int, topUpAmount: int) -> PersistentWsol:
+        return await PersistentWsol.EnableAsync(connection=self.CONNECTION, walletAddress=walletAddress, minBalance=minBalance, topUpAmount=topUpAmount)
+
+    # ========================================
+    # See `SapysolRaydiumAMM.ProfileComputeUnits`.
+    #
+    async def ProfileComputeUnits(self,
+                                  walletAddress: SapysolPubkey,
+                                  tokenFrom:     SapysolPubkey,
+                                  tokenTo:       SapysolPubkey,
+                                  amountIn:      int,
+                                  minOut:        int  = 0,
+                                  wrapSol:       bool = True,
+                                  unwrapSol:     bool = True) -> Dict[str, int]:
+        prepared: PreparedSwap = await self.PrepareSwap(walletAddress=walletAddress, tokenFrom=tokenFrom, tokenTo=tokenTo, wrapSol=wrapSol, unwrapSol=unwrapSol)
+        prepared.SetComputeUnits(RAYDIUM_DEFAULT_COMPUTE_UNITS)
+
+        result: Dict[str, int] = {}
+        for atasExist in [True, False]:
+            prepared.TOKEN_ATA_FROM_EXISTS = prepared.TOKEN_ATA_TO_EXISTS = atasExist
+            ixList:  List[Instruction] = prepared.build(amountIn=amountIn, minOut=minOut, dryRun=True)
+            variant: str               = RaydiumComputeUnits.VariantFromInstructions(baseToQuote=prepared.BASE_TO_QUOTE, ixList=ixList[1:])
+            units:   Optional[int]     = await RaydiumComputeUnits.SimulateAsync(connection=self.CONNECTION, payer=walletAddress, ixList=ixList)
+            if units is not None:
+                RaydiumComputeUnits.Record(poolAddress=self.SWAP_CACHE.amm_id, variant=variant, unitsConsumed=units)
+                result[variant] = units
+        return result
+
+    # ========================================
+    # Resolves token info and ATAs once for (pool, wallet, direction); the
+    # returned `PreparedSwap.build(amountIn, minOut)` does no I/O.
+    #
+    async def PrepareSwap(self,
+                          walletAddress:  SapysolPubkey,
+                          tokenFrom:      SapysolPubkey,
+                          tokenTo:        SapysolPubkey,
+                          wrapSol:        bool = True,
+                          unwrapSol:      bool = True,
+                          txComputePrice: int  = 1) -> PreparedSwap:
+        return await PreparedSwap.PrepareAsync(connection     = self.CONNECTION,
+                                               swapCache      = self.SWAP_CACHE,
+                                               walletAddress  = walletAddress,
+                                               tokenFrom      = tokenFrom,
+                                               tokenTo        = tokenTo,
+                                               wrapSol        = wrapSol,
+                                               unwrapSol      = unwrapSol,
+                                               txComputePrice = txComputePrice)
+
+# =============================================================================
+# 
@@ -0,0 +1,85 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: Raydium async token cache
+#
+# =============================================================================
+# 
+from   solana.rpc.async_api import AsyncClient
+from   solders.pubkey       import Pubkey
+from   sapysol              import SapysolPubkey, MakePubkey
+from   sapysol.token_cache  import TokenCacheEntry, SAPYSOL_TOKEN_VERSION
+from   spl.token._layouts   import MINT_LAYOUT
+from   typing               import Dict
+import asyncio
+import logging
+
+# =============================================================================
+# Minimal asyncio counterpart of `sapysol.token_cache.TokenCache`.
+# Mints are immutable for what we need (decimals, program id), so entries
+# are kept in memory for the lifetime of the process.
+#
+class AsyncTokenCache:
+    __TOKENS:  Dict[Pubkey, TokenCacheEntry] = {}
+    __PENDING: Dict[Pubkey, asyncio.Future]  = {}
+
+    # ========================================
+    #
+    @staticmethod
+    async def __LoadFromBlockchain(connection: AsyncClient, tokenMint: Pubkey) -> TokenCacheEntry:
+        logging.debug("Loading token info from Solana Node for token: %s", tokenMint)
+        accountInfo = (await connection.get_account_info(pubkey=tokenMint)).value
+        if accountInfo is None:
+            raise ValueError(f"Token mint not found: {str(tokenMint)}")
+
+        mintInfo = MINT_LAYOUT.parse(accountInfo.data)
+        return TokenCacheEntry(SAPYSOL_TOKEN_VERSION = SAPYSOL_TOKEN_VERSION,
+                               token_mint            = tokenMint,
+                               mint_authority        = Pubkey(mintInfo.mint_authority)   if mintInfo.mint_authority_option   else None,
+                               supply                = mintInfo.supply,
+                               decimals              = mintInfo.decimals,
+                               is_initialized        = bool(mintInfo.is_initialized),
+                               freeze_authority      = Pubkey(mintInfo.freeze_authority) if mintInfo.freeze_authority_option else None,
+                               program_id            = accountInfo.owner)
+
+    # ========================================
+    #
+    @staticmethod
+    async def GetToken(connection: AsyncClient, tokenMint: SapysolPubkey) -> TokenCacheEntry:
+        tokenMint: Pubkey = MakePubkey(tokenMint)
+        tokenInfo = AsyncTokenCache.__TOKENS.get(tokenMint)
+        if tokenInfo:
+            return tokenInfo
+
+        # Concurrent lookups of the same mint share one RPC call. The fetch
+        # outlives cancelled callers and cleans up after itself; a cancelled
+        # fetch or one from another (e.g. closed) event loop is not reused.
+        pending = AsyncTokenCache.__PENDING.get(tokenMint)
+        if pending is None or pending.cancelled() or pending.get_loop() is not asyncio.get_running_loop():
+            pending = asyncio.ensure_future(AsyncTokenCache.__LoadFromBlockchain(connection=connection, tokenMint=tokenMint))
+            AsyncTokenCache.__PENDING[tokenMint] = pending
+            pending.add_done_callback(lambda future: AsyncTokenCache.__OnLoaded(tokenMint=tokenMint, future=future))
+        return await asyncio.shield(pending)
+
+    @staticmethod
+    def __OnLoaded(tokenMint: Pubkey, future: asyncio.Future):
+        if AsyncTokenCache.__PENDING.get(tokenMint) is future:
+            AsyncTokenCache.__PENDING.pop(tokenMint)
+        if not future.cancelled() and future.exception() is None:
+            AsyncTokenCache.__TOKENS[tokenMint] = future.result()
+
+# =============================================================================
+# 
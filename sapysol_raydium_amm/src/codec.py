@@ -0,0 +1,203 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: Raydium fixed-offset codec
+#
+# =============================================================================
+# 
+import struct
+import construct
+from   solders.pubkey           import Pubkey
+from   anchorpy.borsh_extension import BorshPubkey
+from   typing                   import List, Any, Dict, Tuple, NamedTuple, Callable
+
+# =============================================================================
+# Field kinds supported by the compiled codec.
+#
+FIELD_SCALAR: str = "scalar" # u8/u16/u32/u64 -> int
+FIELD_U128:   str = "u128"   # u128 stored as two little-endian u64 -> int
+FIELD_PUBKEY: str = "pubkey" # 32 raw bytes -> Pubkey
+FIELD_ARRAY:  str = "array"  # fixed array of scalars -> list[int]
+FIELD_U128S:  str = "u128s"  # fixed array of u128 -> list[int]
+
+# =============================================================================
+#
+class CompiledField(NamedTuple):
+    name:   str #
+    kind:   str #
+    fmt:    str # struct format without byte order prefix
+    offset: int #
+    size:   int #
+    count:  int # number of values produced by `struct` for this field
+
+# =============================================================================
+#
+def _CompileSubcon(name: str, subcon: Any) -> Tuple[str, str, int]:
+    if isinstance(subcon, construct.FormatField):
+        return (FIELD_SCALAR, subcon.fmtstr[1:], 1)
+    if isinstance(subcon, construct.BytesInteger):
+        if subcon.length != 16 or subcon.signed or not subcon.swapped:
+            raise ValueError(f"Unsupported integer field `{name}` in compiled codec!")
+        return (FIELD_U128, "QQ", 2)
+    if isinstance(subcon, type(BorshPubkey)):
+        return (FIELD_PUBKEY, "32s", 1)
+    if isinstance(subcon, construct.Array) and isinstance(subcon.subcon, construct.FormatField):
+        return (FIELD_ARRAY, f"{subcon.count}{subcon.subcon.fmtstr[1:]}", subcon.count)
+    if isinstance(subcon, construct.Array) and isinstance(subcon.subcon, construct.BytesInteger):
+        _CompileSubcon(name=name, subcon=subcon.subcon)
+        return (FIELD_U128S, f"{subcon.count * 2}Q", subcon.count * 2)
+    raise ValueError(f"Unsupported field `{name}` in compiled codec!")
+
+# =============================================================================
+# Compiles a flat `borsh.CStruct` layout into a single `struct.Struct` and
+# generates a decoder that returns field values in layout order.
+#
+class CompiledLayout:
+    def __init__(self, layout: construct.Struct):
+        self.FIELDS: List[CompiledField] = []
+        offset: int = 0
+        for subcon in layout.subcons:
+            kind, fmt, count = _CompileSubcon(name=subcon.name, subcon=subcon.subcon)
+            size: int = struct.calcsize(f"<{fmt}")
+            self.FIELDS.append(CompiledField(name=subcon.name, kind=kind, fmt=fmt, offset=offset, size=size, count=count))
+            offset += size
+
+        self.SIZE:    int                        = offset
+        self.NAMES:   List[str]                  = [field.name for field in self.FIELDS]
+        self.OFFSETS: Dict[str, CompiledField]   = {field.name: field for field in self.FIELDS}
+        self.STRUCT:  struct.Struct              = struct.Struct("<" + "".join(field.fmt for field in self.FIELDS))
+        self.unpack:  Callable[[bytes], tuple]   = self.__GenerateUnpack(fields=self.FIELDS, unpacker=self.STRUCT.unpack_from)
+        self.pack:    Callable[[Any], bytes]     = self.__GeneratePack  (fields=self.FIELDS, packer=self.STRUCT.pack)
+        self.__projections: Dict[Tuple[str, ...], "CompiledProjection"] = {}
+        assert self.STRUCT.size == self.SIZE
+
+    # ========================================
+    # Returns (and memoizes) a projection that decodes only `fields`.
+    #
+    def Projection(self, fields: List[str]) -> "CompiledProjection":
+        key: Tuple[str, ...] = tuple(fields)
+        projection = self.__projections.get(key)
+        if projection is None:
+            if not key:
+                raise ValueError("Projection needs at least one field")
+            unknown: List[str] = [name for name in fields if name not in self.OFFSETS]
+            if unknown:
+                raise ValueError(f"Unknown fields for projection: {unknown}")
+            projection = CompiledProjection(fields=[self.OFFSETS[name] for name in key])
+            self.__projections[key] = projection
+        return projection
+
+    # ========================================
+    # Generates `unpack(data) -> tuple` with every conversion inlined,
+    # so the hot path is one `unpack_from` plus one tuple build.
+    #
+    @staticmethod
+    def __GenerateUnpack(fields: List[CompiledField], unpacker: Callable) -> Callable[[bytes], tuple]:
+        source: str = "def unpack(data, _unpack=_unpack, _pubkey=_pubkey):\n" \
+                      "    v = _unpack(data)\n"                                 \
+                     f"    return ({', '.join(_FieldExpressions(fields))},)\n"
+        return _CompileFunction(source=source, name="unpack", unpacker=unpacker)
+
+    # ========================================
+    # Generates `pack(obj) -> bytes`, the inverse of `unpack`, reading
+    # field values as attributes of `obj` (e.g. a decoded dataclass).
+    #
+    @staticmethod
+    def __GeneratePack(fields: List[CompiledField], packer: Callable) -> Callable[[Any], bytes]:
+        items: List[str] = []
+        for field in fields:
+            if field.kind == FIELD_SCALAR:
+                items.append(f"o.{field.name}")
+            elif field.kind == FIELD_U128:
+                items.append(f"o.{field.name} & 0xFFFFFFFFFFFFFFFF, o.{field.name} >> 64")
+            elif field.kind == FIELD_PUBKEY:
+                items.append(f"bytes(o.{field.name})")
+            elif field.kind == FIELD_ARRAY:
+                items.append(f"*o.{field.name}")
+            elif field.kind == FIELD_U128S:
+                items.append(f"*[half for value in o.{field.name} for half in (value & 0xFFFFFFFFFFFFFFFF, value >> 64)]")
+
+        source: str = "def pack(o, _pack=_pack):\n" \
+                     f"    return _pack({', '.join(items)})\n"
+        namespace: Dict[str, Any] = {"_pack": packer}
+        exec(compile(source, "<sapysol_raydium_amm.codec>", "exec"), namespace)
+        return namespace["pack"]
+
+# =============================================================================
+# Decodes a subset of layout fields from a contiguous byte range that starts
+# at `OFFSET` and spans `LENGTH` bytes (suitable for RPC `dataSlice`).
+#
+class CompiledProjection:
+    def __init__(self, fields: List[CompiledField]):
+        ordered: List[CompiledField] = sorted(fields, key=lambda field: field.offset)
+        self.NAMES:  List[str] = [field.name for field in fields]
+        self.OFFSET: int       = ordered[0].offset
+        self.LENGTH: int       = max(field.offset + field.size for field in ordered) - self.OFFSET
+
+        fmt:      str = "<"
+        position: int = self.OFFSET
+        for field in ordered:
+            if field.offset > position:
+                fmt += f"{field.offset - position}x"
+            fmt += field.fmt
+            position = field.offset + field.size
+        self.STRUCT: struct.Struct = struct.Struct(fmt)
+
+        # Values come out of `struct` in offset order, results are keyed by name.
+        pairs:  List[str] = [f"{field.name!r}: {expr}" for field, expr in zip(ordered, _FieldExpressions(ordered))]
+        source: str       = "def unpack(data, _unpack=_unpack, _pubkey=_pubkey):\n" \
+                            "    v = _unpack(data)\n"                                 \
+                           f"    return {{{', '.join(pairs)}}}\n"
+        self.unpack: Callable[[bytes], Dict[str, Any]] = _CompileFunction(source=source, name="unpack", unpacker=self.STRUCT.unpack_from)
+
+    # ========================================
+    # Decodes a slice previously fetched with `dataSlice(OFFSET, LENGTH)`.
+    #
+    def decode(self, data: bytes) -> Dict[str, Any]:
+        return self.unpack(data)
+
+    # ========================================
+    # Decodes the same fields from full account data.
+    #
+    def decode_account(self, data: bytes) -> Dict[str, Any]:
+        return self.unpack(memoryview(data)[self.OFFSET:self.OFFSET + self.LENGTH])
+
+# =============================================================================
+#
+def _FieldExpressions(fields: List[CompiledField]) -> List[str]:
+    items: List[str] = []
+    index: int       = 0
+    for field in fields:
+        if field.kind == FIELD_SCALAR:
+            items.append(f"v[{index}]")
+        elif field.kind == FIELD_U128:
+            items.append(f"v[{index}] | (v[{index + 1}] << 64)")
+        elif field.kind == FIELD_PUBKEY:
+            items.append(f"_pubkey(v[{index}])")
+        elif field.kind == FIELD_ARRAY:
+            items.append(f"list(v[{index}:{index + field.count}])")
+        elif field.kind == FIELD_U128S:
+            items.append(f"[lo | (hi << 64) for lo, hi in zip(v[{index}:{index + field.count}:2], v[{index + 1}:{index + field.count}:2])]")
+        index += field.count
+    return items
+
+def _CompileFunction(source: str, name: str, unpacker: Callable) -> Callable:
+    namespace: Dict[str, Any] = {"_unpack": unpacker, "_pubkey": Pubkey.from_bytes}
+    exec(compile(source, "<sapysol_raydium_amm.codec>", "exec"), namespace)
+    return namespace[name]
+
+# =============================================================================
+#
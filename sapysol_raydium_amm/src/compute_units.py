@@ -0,0 +1,182 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: Raydium AMM compute units
+#
+# =============================================================================
+# 
+from   solana.rpc.api          import Client
+from   solana.rpc.async_api    import AsyncClient
+from   solders.pubkey          import Pubkey
+from   solders.instruction     import Instruction
+from   solders.message         import MessageV0
+from   solders.signature       import Signature
+from   solders.transaction     import VersionedTransaction
+from   spl.token.constants     import TOKEN_PROGRAM_ID, ASSOCIATED_TOKEN_PROGRAM_ID
+from   sapysol                 import SapysolPubkey, MakePubkey, ComputeBudgetIx
+from  .storage                 import RaydiumCacheCodec, RaydiumCacheStorage, MakeDefaultRaydiumCacheStorage
+from   typing                  import List, Dict, NamedTuple, Optional
+import threading
+import logging
+import json
+import math
+
+# =============================================================================
+#
+RAYDIUM_DEFAULT_COMPUTE_UNITS: int = 1_400_000
+
+# =============================================================================
+# Observed compute units per swap variant of one pool, see
+# `RaydiumComputeUnits.Variant`.
+#
+class RaydiumComputeUnitsEntry(NamedTuple):
+    poolAddress: Pubkey         #
+    units:       Dict[str, int] # variant -> units consumed in simulation
+
+    def to_json(self) -> dict:
+        return {"poolAddress": str(self.poolAddress), "units": self.units}
+
+    @staticmethod
+    def from_json(obj: dict) -> "RaydiumComputeUnitsEntry":
+        return RaydiumComputeUnitsEntry(poolAddress=MakePubkey(obj["poolAddress"]), units=dict(obj["units"]))
+
+RAYDIUM_COMPUTE_UNITS_CODEC = RaydiumCacheCodec(toJson    = lambda entry: entry.to_json(),
+                                                fromJson  = lambda obj:   RaydiumComputeUnitsEntry.from_json(obj) if "units" in obj else None,
+                                                toBytes   = lambda entry: json.dumps(entry.to_json()).encode(),
+                                                fromBytes = lambda data:  RaydiumComputeUnitsEntry.from_json(json.loads(data)))
+
+# =============================================================================
+# Per-pool compute unit limits measured with `simulateTransaction`.
+# Limit = observed * (1 + MARGIN), at least observed + MIN_MARGIN; pools
+# and variants never profiled get RAYDIUM_DEFAULT_COMPUTE_UNITS.
+# Entries are persisted (`raydium_compute_units.sqlite`) and kept in memory.
+#
+class RaydiumComputeUnits:
+    MARGIN:       float = 0.10
+    MIN_MARGIN:   int   = 5_000
+    __ENTRIES:    Dict[Pubkey, RaydiumComputeUnitsEntry] = {}
+    __BUDGET_IXS: Dict[int, Instruction] = {}
+    __LOCK:       threading.Lock = threading.Lock()
+    __STORAGE:    Optional[RaydiumCacheStorage] = None
+
+    # ========================================
+    #
+    @staticmethod
+    def GetStorage() -> RaydiumCacheStorage:
+        if RaydiumComputeUnits.__STORAGE is None:
+            RaydiumComputeUnits.__STORAGE = MakeDefaultRaydiumCacheStorage(codec    = RAYDIUM_COMPUTE_UNITS_CODEC,
+                                                                           fileName = "raydium_compute_units.sqlite")
+        return RaydiumComputeUnits.__STORAGE
+
+    @staticmethod
+    def SetStorage(storage: RaydiumCacheStorage):
+        with RaydiumComputeUnits.__LOCK:
+            RaydiumComputeUnits.__STORAGE = storage
+            RaydiumComputeUnits.__ENTRIES.clear()
+
+    # ========================================
+    # Variant key: direction, whether SOL is wrapped/unwrapped (or a
+    # persistent WSOL top-up) and whether an ATA is created.
+    #
+    @staticmethod
+    def Variant(baseToQuote: bool, wrapSol: bool, createAta: bool) -> str:
+        return ("base_to_quote" if baseToQuote else "quote_to_base") + ("+wrap" if wrapSol else "") + ("+ata" if createAta else "")
+
+    @staticmethod
+    def VariantFromInstructions(baseToQuote: bool, ixList: List[Instruction]) -> str:
+        programs = {ix.program_id for ix in ixList}
+        return RaydiumComputeUnits.Variant(baseToQuote = baseToQuote,
+                                           wrapSol     = TOKEN_PROGRAM_ID            in programs,
+                                           createAta   = ASSOCIATED_TOKEN_PROGRAM_ID in programs)
+
+    # ========================================
+    #
+    @staticmethod
+    def __GetEntry(poolAddress: Pubkey) -> RaydiumComputeUnitsEntry:
+        entry = RaydiumComputeUnits.__ENTRIES.get(poolAddress)
+        if entry is None:
+            entry = RaydiumComputeUnits.GetStorage().Get(key=poolAddress) or RaydiumComputeUnitsEntry(poolAddress=poolAddress, units={})
+            RaydiumComputeUnits.__ENTRIES[poolAddress] = entry
+        return entry
+
+    @staticmethod
+    def GetUnits(poolAddress: SapysolPubkey, variant: str) -> Optional[int]:
+        return RaydiumComputeUnits.__GetEntry(poolAddress=MakePubkey(poolAddress)).units.get(variant)
+
+    @staticmethod
+    def GetLimit(poolAddress: SapysolPubkey, variant: str) -> int:
+        units: Optional[int] = RaydiumComputeUnits.GetUnits(poolAddress=poolAddress, variant=variant)
+        if units is None:
+            return RAYDIUM_DEFAULT_COMPUTE_UNITS
+        return min(RAYDIUM_DEFAULT_COMPUTE_UNITS, max(math.ceil(units * (1 + RaydiumComputeUnits.MARGIN)), units + RaydiumComputeUnits.MIN_MARGIN))
+
+    # ========================================
+    # `ComputeBudgetIx` with the tight limit, instructions are shared per limit.
+    #
+    @staticmethod
+    def GetBudgetIx(poolAddress: SapysolPubkey, variant: str) -> Instruction:
+        units: int = RaydiumComputeUnits.GetLimit(poolAddress=poolAddress, variant=variant)
+        ix = RaydiumComputeUnits.__BUDGET_IXS.get(units)
+        if ix is None:
+            ix = ComputeBudgetIx(units=units)
+            RaydiumComputeUnits.__BUDGET_IXS[units] = ix
+        return ix
+
+    # ========================================
+    # Keeps the highest observation per variant.
+    #
+    @staticmethod
+    def Record(poolAddress: SapysolPubkey, variant: str, unitsConsumed: int):
+        poolAddress = MakePubkey(poolAddress)
+        with RaydiumComputeUnits.__LOCK:
+            entry = RaydiumComputeUnits.__GetEntry(poolAddress=poolAddress)
+            if unitsConsumed <= entry.units.get(variant, 0):
+                return
+            entry = RaydiumComputeUnitsEntry(poolAddress=poolAddress, units={**entry.units, variant: unitsConsumed})
+            RaydiumComputeUnits.__ENTRIES[poolAddress] = entry
+            RaydiumComputeUnits.GetStorage().Put(key=poolAddress, entry=entry)
+        logging.debug("Compute units for AMM ID %s %s: %s", poolAddress, variant, unitsConsumed)
+
+    # ========================================
+    # Units consumed by `ixList` in `simulateTransaction` (no signature
+    # check), None if simulation failed.
+    #
+    @staticmethod
+    def __MakeSimulationTx(payer: Pubkey, ixList: List[Instruction], blockhash) -> VersionedTransaction:
+        message = MessageV0.try_compile(payer=payer, instructions=ixList, address_lookup_table_accounts=[], recent_blockhash=blockhash)
+        return VersionedTransaction.populate(message, [Signature.default()] * message.header.num_required_signatures)
+
+    @staticmethod
+    def __UnitsConsumed(resp) -> Optional[int]:
+        if resp.value.err is not None:
+            logging.debug("Compute units simulation failed: %s, logs: %s", resp.value.err, resp.value.logs)
+            return None
+        return resp.value.units_consumed
+
+    @staticmethod
+    def Simulate(connection: Client, payer: SapysolPubkey, ixList: List[Instruction]) -> Optional[int]:
+        blockhash = connection.get_latest_blockhash().value.blockhash
+        tx = RaydiumComputeUnits.__MakeSimulationTx(payer=MakePubkey(payer), ixList=ixList, blockhash=blockhash)
+        return RaydiumComputeUnits.__UnitsConsumed(connection.simulate_transaction(tx, sig_verify=False))
+
+    @staticmethod
+    async def SimulateAsync(connection: AsyncClient, payer: SapysolPubkey, ixList: List[Instruction]) -> Optional[int]:
+        blockhash = (await connection.get_latest_blockhash()).value.blockhash
+        tx = RaydiumComputeUnits.__MakeSimulationTx(payer=MakePubkey(payer), ixList=ixList, blockhash=blockhash)
+        return RaydiumComputeUnits.__UnitsConsumed(await connection.simulate_transaction(tx, sig_verify=False))
+
+# =============================================================================
+# 
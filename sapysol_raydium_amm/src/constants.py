@@ -18,7 +18,7 @@
 #
 # =============================================================================
 # 
-from sapysol import MakePubkey
+from .pubkey import MakePubkey
 
 # =============================================================================
 # 
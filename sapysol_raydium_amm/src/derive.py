@@ -18,12 +18,23 @@
 #
 # =============================================================================
 # 
-from solana.rpc.api import Client, Pubkey, Keypair, Commitment
-from .constants     import RAYDIUM_LIQUIDITY_POOL_V4 as PROGRAM_ID, RAYDIUM_SERUM_PROGAM_ID as SERUM_PROGRAM_ID
+from solana.rpc.api      import Client, Pubkey, Keypair, Commitment
+from .constants          import RAYDIUM_LIQUIDITY_POOL_V4 as PROGRAM_ID, RAYDIUM_SERUM_PROGAM_ID as SERUM_PROGRAM_ID
+from typing              import List, Dict, NamedTuple, Optional
+from concurrent.futures  import ProcessPoolExecutor
 import contextlib
+import functools
+import hashlib
+import os
+
+# =============================================================================
+# Per-market derivations never change, keep the most recent ones in memory.
+#
+DERIVE_CACHE_SIZE: int = 65536
 
 # =============================================================================
 # 
+@functools.lru_cache(maxsize=DERIVE_CACHE_SIZE)
 def _DeriveLiquidityV4_Common(marketID: Pubkey, paramName: str) -> tuple[Pubkey, int]:
     return Pubkey.find_program_address(seeds      = [bytes(PROGRAM_ID),
                                                      bytes(marketID ),
@@ -32,20 +43,17 @@ def _DeriveLiquidityV4_Common(marketID: Pubkey, paramName: str) -> tuple[Pubkey,
                                        program_id = PROGRAM_ID)
 
 # =============================================================================
-# 
+# Same as `create_program_address` with seeds [marketID, nonce, 7 zero bytes],
+# but checks the curve directly instead of catching an exception per nonce.
+#
+@functools.lru_cache(maxsize=DERIVE_CACHE_SIZE)
 def DeriveAssociatedMarketAuthority(marketID: Pubkey, programID: Pubkey=SERUM_PROGRAM_ID) -> tuple[Pubkey, int]:
-    seeds  = bytes(marketID)
-    nonce  = 0
-    pubkey = None
-    while nonce < 100:
-        try:
-            # Buffer.alloc(7) nonce u64 equivalent in Python is creating a bytes array of length 7
-            seeds_with_nonce = [seeds, bytes([nonce]), bytes(7)]
-            pubkey = Pubkey.create_program_address(seeds=seeds_with_nonce, program_id=programID)
-        except:
-            nonce += 1
-            continue
-        return (pubkey, nonce)
+    prefix: bytes = bytes(marketID)
+    suffix: bytes = bytes(programID) + b"ProgramDerivedAddress"
+    for nonce in range(100):
+        pubkey = Pubkey(hashlib.sha256(prefix + nonce.to_bytes(8, "little") + suffix).digest())
+        if not pubkey.is_on_curve():
+            return (pubkey, nonce)
     # If nonce was not found within the limit
     raise ValueError('Unable to find a viable program address nonce', {
         'programID': programID,
@@ -54,6 +62,7 @@ def DeriveAssociatedMarketAuthority(marketID: Pubkey, programID: Pubkey=SERUM_PR
 
 # =============================================================================
 # 
+@functools.lru_cache(maxsize=None)
 def DeriveLiquidityV4AssociatedAuthority(programID: Pubkey=PROGRAM_ID) -> Pubkey:
     seed = bytes([97, 109, 109, 32, 97, 117, 116, 104, 111, 114, 105, 116, 121])
     return Pubkey.find_program_address(seeds      = [seed], 
@@ -87,9 +96,61 @@ def DeriveLiquidityV4AssociatedOpenOrders(marketID: Pubkey) -> Pubkey:
 
 # =============================================================================
 # 
+@functools.lru_cache(maxsize=None)
 def DeriveLiquidityV4AssociatedConfigId() -> Pubkey:
     return Pubkey.find_program_address(seeds      = [b"amm_config_account_seed"], 
                                        program_id = PROGRAM_ID)[0]
 
+# =============================================================================
+# All AMM v4 addresses that can be derived from a market ID alone.
+#
+class RaydiumLiquidityV4Addresses(NamedTuple):
+    amm_id:           Pubkey #
+    base_vault:       Pubkey #
+    quote_vault:      Pubkey #
+    lp_mint:          Pubkey #
+    lp_vault:         Pubkey #
+    target_orders:    Pubkey #
+    withdraw_queue:   Pubkey #
+    open_orders:      Pubkey #
+    market_authority: Pubkey #
+
+# =============================================================================
+# 
+def DeriveLiquidityV4Addresses(marketID: Pubkey) -> RaydiumLiquidityV4Addresses:
+    return RaydiumLiquidityV4Addresses(amm_id           = DeriveLiquidityV4AssociatedID           (marketID),
+                                       base_vault       = DeriveLiquidityV4AssociatedBaseVault    (marketID),
+                                       quote_vault      = DeriveLiquidityV4AssociatedQuoteVault   (marketID),
+                                       lp_mint          = DeriveLiquidityV4AssociatedLpMint       (marketID),
+                                       lp_vault         = DeriveLiquidityV4AssociatedLpVault      (marketID),
+                                       target_orders    = DeriveLiquidityV4AssociatedTargetOrders (marketID),
+                                       withdraw_queue   = DeriveLiquidityV4AssociatedWithdrawQueue(marketID),
+                                       open_orders      = DeriveLiquidityV4AssociatedOpenOrders   (marketID),
+                                       market_authority = DeriveAssociatedMarketAuthority(marketID=marketID)[0])
+
+def _DeriveLiquidityV4AddressesChunk(marketIDs: List[bytes]) -> List[tuple]:
+    return [tuple(bytes(pubkey) for pubkey in DeriveLiquidityV4Addresses(Pubkey.from_bytes(marketID))) for marketID in marketIDs]
+
+# =============================================================================
+# Derives addresses for many markets. Batches of at least `parallelThreshold`
+# markets are spread across a process pool; results are keyed by market ID.
+#
+def DeriveAllLiquidityV4Addresses(marketIDs:         List[Pubkey],
+                                  processes:         Optional[int] = None,
+                                  parallelThreshold: int           = 8192) -> Dict[Pubkey, RaydiumLiquidityV4Addresses]:
+    marketIDs: List[Pubkey] = list(dict.fromkeys(marketIDs))
+    processes: int          = processes if processes else (os.cpu_count() or 1)
+    if len(marketIDs) < parallelThreshold or processes < 2:
+        return {marketID: DeriveLiquidityV4Addresses(marketID) for marketID in marketIDs}
+
+    chunkSize: int               = -(-len(marketIDs) // (processes * 4))
+    chunks:    List[List[bytes]] = [[bytes(marketID) for marketID in marketIDs[i:i + chunkSize]] for i in range(0, len(marketIDs), chunkSize)]
+    result:    Dict[Pubkey, RaydiumLiquidityV4Addresses] = {}
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        for chunk, rows in zip(chunks, executor.map(_DeriveLiquidityV4AddressesChunk, chunks)):
+            for marketID, row in zip(chunk, rows):
+                result[Pubkey.from_bytes(marketID)] = RaydiumLiquidityV4Addresses(*[Pubkey.from_bytes(pubkey) for pubkey in row])
+    return result
+
 # =============================================================================
 # 
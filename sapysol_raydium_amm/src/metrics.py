@@ -0,0 +1,305 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: Raydium metrics
+#
+# =============================================================================
+# 
+from   solana.rpc.api          import Client
+from   solana.rpc.async_api    import AsyncClient
+from   http.server             import ThreadingHTTPServer, BaseHTTPRequestHandler
+from   typing                  import List, Dict, Any, Tuple, Union, NamedTuple, Optional
+from   abc                     import ABC, abstractmethod
+import threading
+import inspect
+import bisect
+import time
+
+_MetricKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+# =============================================================================
+# Metric names used by the library.
+#
+RAYDIUM_METRIC_CACHE_LOOKUPS = "sapysol_raydium_cache_lookups_total"
+RAYDIUM_METRIC_RPC_SECONDS   = "sapysol_raydium_rpc_seconds"
+RAYDIUM_METRIC_RPC_ERRORS    = "sapysol_raydium_rpc_errors_total"
+RAYDIUM_METRIC_DECODE        = "sapysol_raydium_decode_seconds"
+RAYDIUM_METRIC_SWAP_STAGE    = "sapysol_raydium_swap_stage_seconds"
+
+RAYDIUM_METRICS_HELP: Dict[str, str] = {
+    RAYDIUM_METRIC_CACHE_LOOKUPS: "Cache lookups by cache (amm, serum, swap) and source (memory, disk, rpc).",
+    RAYDIUM_METRIC_RPC_SECONDS:   "RPC call latency by method.",
+    RAYDIUM_METRIC_RPC_ERRORS:    "Failed RPC calls by method.",
+    RAYDIUM_METRIC_DECODE:        "Account decode time by account type.",
+    RAYDIUM_METRIC_SWAP_STAGE:    "Time spent in each GetSwapInstruction stage.",
+}
+
+# Seconds, from single decodes (~10us) to slow RPC calls
+RAYDIUM_METRICS_BUCKETS: Tuple[float, ...] = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001,
+                                              0.0025,  0.005,    0.01,    0.025,  0.05,    0.1,    0.25,
+                                              0.5,     1.0,      2.5,     5.0,    10.0)
+
+# =============================================================================
+# Receives every counter increment and latency observation. Implement it to
+# forward metrics elsewhere (statsd, prometheus_client, ...), or use
+# `RaydiumMetricsRegistry`.
+#
+class RaydiumMetricsSink(ABC):
+    @abstractmethod
+    def Inc(self, name: str, labels: Dict[str, str], value: float = 1):
+        pass
+
+    @abstractmethod
+    def Observe(self, name: str, labels: Dict[str, str], value: float):
+        pass
+
+# =============================================================================
+#
+class RaydiumHistogram(NamedTuple):
+    buckets: Tuple[float, ...] # upper bounds
+    counts:  Tuple[int,   ...] # per bucket, not cumulative; last one is +Inf
+    count:   int               #
+    sum:     float             #
+
+# =============================================================================
+# In-memory counters and fixed-bucket histograms with a Prometheus text
+# exporter.
+#
+class RaydiumMetricsRegistry(RaydiumMetricsSink):
+    def __init__(self, buckets: Tuple[float, ...] = RAYDIUM_METRICS_BUCKETS):
+        self.BUCKETS:      Tuple[float, ...]       = tuple(sorted(buckets))
+        self.__LOCK:       threading.Lock          = threading.Lock()
+        self.__COUNTERS:   Dict[_MetricKey, float] = {}
+        self.__HISTOGRAMS: Dict[_MetricKey, list]  = {}
+
+    # ========================================
+    #
+    def Inc(self, name: str, labels: Dict[str, str], value: float = 1):
+        key = (name, tuple(sorted(labels.items())))
+        with self.__LOCK:
+            self.__COUNTERS[key] = self.__COUNTERS.get(key, 0) + value
+
+    def Observe(self, name: str, labels: Dict[str, str], value: float):
+        key   = (name, tuple(sorted(labels.items())))
+        index = bisect.bisect_left(self.BUCKETS, value)
+        with self.__LOCK:
+            histogram = self.__HISTOGRAMS.get(key)
+            if histogram is None:
+                # [per-bucket counts, count, sum]
+                histogram = self.__HISTOGRAMS[key] = [[0] * (len(self.BUCKETS) + 1), 0, 0.0]
+            histogram[0][index] += 1
+            histogram[1]        += 1
+            histogram[2]        += value
+
+    def Reset(self):
+        with self.__LOCK:
+            self.__COUNTERS.clear()
+            self.__HISTOGRAMS.clear()
+
+    # ========================================
+    #
+    def GetCounter(self, name: str, **labels: str) -> float:
+        with self.__LOCK:
+            return self.__COUNTERS.get((name, tuple(sorted(labels.items()))), 0)
+
+    def GetHistogram(self, name: str, **labels: str) -> Optional[RaydiumHistogram]:
+        with self.__LOCK:
+            histogram = self.__HISTOGRAMS.get((name, tuple(sorted(labels.items()))))
+            if histogram is None:
+                return None
+            return RaydiumHistogram(buckets=self.BUCKETS, counts=tuple(histogram[0]), count=histogram[1], sum=histogram[2])
+
+    # ========================================
+    # Prometheus text exposition format 0.0.4.
+    #
+    def ExportPrometheus(self) -> str:
+        with self.__LOCK:
+            counters   = sorted(self.__COUNTERS.items())
+            histograms = sorted((key, (list(value[0]), value[1], value[2])) for key, value in self.__HISTOGRAMS.items())
+
+        lines: List[str] = []
+        lastName: Optional[str] = None
+        for (name, labels), value in counters:
+            if name != lastName:
+                lines += _PrometheusHeader(name=name, kind="counter")
+                lastName = name
+            lines.append(f"{name}{_PrometheusLabels(labels)} {_PrometheusValue(value)}")
+
+        for (name, labels), (counts, count, total) in histograms:
+            if name != lastName:
+                lines += _PrometheusHeader(name=name, kind="histogram")
+                lastName = name
+            cumulative: int = 0
+            for bound, bucketCount in zip(self.BUCKETS + (float("inf"),), counts):
+                cumulative += bucketCount
+                lines.append(f"{name}_bucket{_PrometheusLabels(labels + (('le', _PrometheusValue(bound)),))} {cumulative}")
+            lines.append(f"{name}_sum{_PrometheusLabels(labels)} {_PrometheusValue(total)}")
+            lines.append(f"{name}_count{_PrometheusLabels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+# =============================================================================
+#
+def _PrometheusHeader(name: str, kind: str) -> List[str]:
+    helpText: Optional[str] = RAYDIUM_METRICS_HELP.get(name)
+    return ([f"# HELP {name} {helpText}"] if helpText else []) + [f"# TYPE {name} {kind}"]
+
+def _PrometheusLabels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    escaped = [(key, str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")) for key, value in labels]
+    return "{" + ",".join(f"{key}=\"{value}\"" for key, value in escaped) + "}"
+
+def _PrometheusValue(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+# =============================================================================
+# Serves `registry.ExportPrometheus()` on http://address:port/metrics from a
+# daemon thread. Call `shutdown()` on the returned server to stop it.
+#
+def StartPrometheusServer(registry: RaydiumMetricsRegistry, port: int = 9464, address: str = "") -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ["/", "/metrics"]:
+                self.send_error(404)
+                return
+            body: bytes = registry.ExportPrometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type",   "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any):
+            pass
+
+    server = ThreadingHTTPServer((address, port), Handler)
+    threading.Thread(target=server.serve_forever, name="raydium-metrics", daemon=True).start()
+    return server
+
+# =============================================================================
+# Times consecutive stages of one call: `Mark(stage)` adds the time since the
+# previous mark (or creation) to `stage`, `Done()` observes one value per
+# stage, so a stage marked twice is still counted once per call.
+#
+class RaydiumMetricsStages:
+    def __init__(self, name: str):
+        self.NAME:  str              = name
+        self.LAST:  float            = time.perf_counter()
+        self.TIMES: Dict[str, float] = {}
+
+    def Mark(self, stage: str):
+        now: float = time.perf_counter()
+        self.TIMES[stage] = self.TIMES.get(stage, 0.0) + now - self.LAST
+        self.LAST = now
+
+    def Done(self):
+        for stage, seconds in self.TIMES.items():
+            RaydiumMetrics.Observe(self.NAME, seconds, stage=stage)
+        self.TIMES = {}
+
+class _RaydiumNoStages:
+    def Mark(self, stage: str):
+        pass
+
+    def Done(self):
+        pass
+
+_RAYDIUM_NO_STAGES = _RaydiumNoStages()
+
+# =============================================================================
+# Global metrics switch. Collection is off until `Enable()`; while off every
+# hook is a single attribute check. Hot paths test `RaydiumMetrics.SINK`
+# before taking timestamps.
+#
+class RaydiumMetrics:
+    SINK: Optional[RaydiumMetricsSink] = None
+
+    # ========================================
+    #
+    @staticmethod
+    def Enable(sink: Optional[RaydiumMetricsSink] = None) -> RaydiumMetricsSink:
+        RaydiumMetrics.SINK = sink if sink is not None else RaydiumMetricsRegistry()
+        return RaydiumMetrics.SINK
+
+    @staticmethod
+    def Disable():
+        RaydiumMetrics.SINK = None
+
+    # ========================================
+    #
+    @staticmethod
+    def Inc(name: str, value: float = 1, **labels: str):
+        sink = RaydiumMetrics.SINK
+        if sink is not None:
+            sink.Inc(name, labels, value)
+
+    @staticmethod
+    def Observe(name: str, value: float, **labels: str):
+        sink = RaydiumMetrics.SINK
+        if sink is not None:
+            sink.Observe(name, labels, value)
+
+    @staticmethod
+    def Stages(name: str) -> Union[RaydiumMetricsStages, _RaydiumNoStages]:
+        return _RAYDIUM_NO_STAGES if RaydiumMetrics.SINK is None else RaydiumMetricsStages(name=name)
+
+# =============================================================================
+# Wraps a `Client` / `AsyncClient` (or `RaydiumRpcPool`) and records the
+# latency and failures of every RPC method called through it. Pass it
+# wherever the wrapped connection would be used.
+#
+class RaydiumMetricsClient:
+    def __init__(self, connection: Union[Client, AsyncClient]):
+        self.CONNECTION: Union[Client, AsyncClient] = connection
+
+    # ========================================
+    #
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.CONNECTION, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        # Async-ness is decided from the returned value: proxies such as
+        # `AsyncRaydiumRpcPool` hand out plain callables returning coroutines.
+        async def Await(awaitable: Any, start: float):
+            try:
+                return await awaitable
+            except Exception:
+                RaydiumMetrics.Inc(RAYDIUM_METRIC_RPC_ERRORS, method=name)
+                raise
+            finally:
+                RaydiumMetrics.Observe(RAYDIUM_METRIC_RPC_SECONDS, time.perf_counter() - start, method=name)
+
+        def Call(*args, **kwargs):
+            if RaydiumMetrics.SINK is None:
+                return attr(*args, **kwargs)
+            start: float = time.perf_counter()
+            try:
+                result = attr(*args, **kwargs)
+            except Exception:
+                RaydiumMetrics.Inc(RAYDIUM_METRIC_RPC_ERRORS, method=name)
+                RaydiumMetrics.Observe(RAYDIUM_METRIC_RPC_SECONDS, time.perf_counter() - start, method=name)
+                raise
+            if inspect.isawaitable(result):
+                return Await(result, start)
+            RaydiumMetrics.Observe(RAYDIUM_METRIC_RPC_SECONDS, time.perf_counter() - start, method=name)
+            return result
+        return Call
+
+# =============================================================================
+#
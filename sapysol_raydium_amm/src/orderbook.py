@@ -0,0 +1,255 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: Raydium Serum orderbook
+#
+# =============================================================================
+# 
+# Serum v3 / OpenBook bids and asks accounts ("slabs"). A slab is a critbit
+# tree of 72-byte nodes; leaf keys are `price << 64 | sequence number`, so an
+# in-order walk visits orders by price. Bids are walked from the highest key
+# (right child first), asks from the lowest.
+#
+# Account layout: "serum" (5 bytes), account flags (u64), slab header
+# (32 bytes), nodes, "padding" (7 bytes).
+#
+from   solana.rpc.api           import Client
+from   solana.rpc.async_api     import AsyncClient
+from   solana.rpc.commitment    import Commitment
+from   typing                   import List, Tuple, NamedTuple, Optional, Any, TYPE_CHECKING
+from  .metrics                  import RaydiumMetrics, RAYDIUM_METRIC_DECODE
+import struct
+import time
+try:
+    import numpy as np
+except ImportError:
+    np = None
+if TYPE_CHECKING:
+    from ..accounts.serum_market_v3 import SerumMarketV3
+
+# =============================================================================
+#
+SERUM_ACCOUNT_FLAG_INITIALIZED: int = 1 << 0
+SERUM_ACCOUNT_FLAG_BIDS:        int = 1 << 5
+SERUM_ACCOUNT_FLAG_ASKS:        int = 1 << 6
+
+SERUM_SLAB_HEADER_OFFSET:  int = 13
+SERUM_SLAB_NODES_OFFSET:   int = 45
+SERUM_SLAB_NODE_SIZE:      int = 72
+SERUM_SLAB_TRAILER_SIZE:   int = 7
+
+SERUM_SLAB_NODE_INNER:     int = 1
+SERUM_SLAB_NODE_LEAF:      int = 2
+
+# A tree walk costs ~0.4us per visited node, the vectorized full decode
+# ~15us plus ~0.02us per node, break-even is at 40 + nodes / 20 visited.
+# A depth-limited decode walks only when the estimated walk (two nodes per
+# order in the best depth + 1 levels, plus the way down) stays below that,
+# otherwise it slices the full decode. The walk still gives up at
+# break-even in case the book has far more orders per level than assumed.
+_WALK_BUDGET_BASE:      int = 40
+_WALK_BUDGET_RATIO:     int = 20
+_WALK_ORDERS_PER_LEVEL: int = 4
+
+# "serum", account flags, bumpIndex, freeListLen, freeListHead, root, leafCount
+_SLAB_HEADER: struct.Struct = struct.Struct("<5sQI4xI4xIII4x")
+# Inner and leaf nodes in one read: tag, key high half (leaf: price in lots),
+# children (inner only), quantity in base lots (leaf only)
+_SLAB_NODE:   struct.Struct = struct.Struct("<I12xQII24xQ")
+
+# =============================================================================
+# Price levels of one side, best price first. `priceLots` is quote lots per
+# base lot and `sizeLots` is base lots (summed over all orders at the level),
+# exactly as stored. `price` and `size` are converted with the market lot
+# sizes and token decimals (native units when decimals are 0). `complete` is
+# False when the walk stopped at `depth` levels.
+#
+class SerumOrderbookSide(NamedTuple):
+    isBids:    bool #
+    priceLots: Any  # np.ndarray[uint64]
+    sizeLots:  Any  # np.ndarray[uint64]
+    price:     Any  # np.ndarray[float64]
+    size:      Any  # np.ndarray[float64]
+    complete:  bool #
+
+class SerumOrderbook(NamedTuple):
+    slot: int                #
+    bids: SerumOrderbookSide #
+    asks: SerumOrderbookSide #
+
+# =============================================================================
+#
+def _RequireNumpy():
+    if np is None:
+        raise ImportError("Orderbook decoding requires `numpy`, please install it (pip install numpy)!")
+
+_LEAF_DTYPE: Any = None if np is None else np.dtype({"names":    ["tag", "priceLots", "quantity"],
+                                                     "formats":  ["<u4", "<u8",       "<u8"     ],
+                                                     "offsets":  [0,     16,          56        ],
+                                                     "itemsize": SERUM_SLAB_NODE_SIZE})
+
+# =============================================================================
+# Free nodes are re-tagged when an order is removed, so every node tagged as
+# a leaf is a live order: the full side is decoded without walking the tree.
+#
+def _DecodeAllLevels(data: bytes, nodeCount: int, leafCount: int, isBids: bool) -> Tuple[Any, Any]:
+    nodes:  Any = np.frombuffer(data, dtype=_LEAF_DTYPE, count=nodeCount, offset=SERUM_SLAB_NODES_OFFSET)
+    leaves: Any = nodes[nodes["tag"] == SERUM_SLAB_NODE_LEAF]
+    if len(leaves) != leafCount:
+        raise ValueError(f"Slab has {len(leaves)} leaf nodes, header says {leafCount}!")
+    if leafCount == 0:
+        return (np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.uint64))
+
+    order:     Any = np.argsort(leaves["priceLots"], kind="stable")
+    prices:    Any = leaves["priceLots"][order]
+    starts:    Any = np.flatnonzero(np.concatenate(([True], prices[1:] != prices[:-1])))
+    priceLots: Any = prices[starts]
+    sizeLots:  Any = np.add.reduceat(leaves["quantity"][order], starts)
+    if isBids:
+        return (priceLots[::-1].copy(), sizeLots[::-1].copy())
+    return (priceLots, sizeLots)
+
+# =============================================================================
+# In-order walk from the best price, stops before the (depth + 1)-th level.
+# Touches only the nodes on the way, not the whole slab. Returns None when
+# more than `budget` nodes would have to be visited.
+#
+def _WalkLevels(data: bytes, nodeCount: int, root: int, isBids: bool, depth: int, budget: int) -> Optional[Tuple[List[int], List[int], bool]]:
+    unpack               = _SLAB_NODE.unpack_from
+    priceLots: List[int] = []
+    sizeLots:  List[int] = []
+    stack:     List[int] = [root]
+    lastPrice: int       = -1
+    while stack:
+        index: int = stack.pop()
+        budget -= 1
+        if budget < 0:
+            return None
+        if index >= nodeCount:
+            raise ValueError(f"Slab node {index} is out of range, the slab is corrupted!")
+        tag, price, left, right, quantity = unpack(data, SERUM_SLAB_NODES_OFFSET + index * SERUM_SLAB_NODE_SIZE)
+        if tag == SERUM_SLAB_NODE_INNER:
+            if isBids:
+                stack += (left, right)
+            else:
+                stack += (right, left)
+        elif tag == SERUM_SLAB_NODE_LEAF:
+            if price == lastPrice:
+                sizeLots[-1] += quantity
+            elif len(priceLots) == depth:
+                return (priceLots, sizeLots, False)
+            else:
+                priceLots.append(price)
+                sizeLots.append(quantity)
+                lastPrice = price
+        else:
+            raise ValueError(f"Slab node {index} has unexpected tag {tag}!")
+    return (priceLots, sizeLots, True)
+
+# =============================================================================
+# Decodes a raw bids or asks account into price levels. `depth` limits the
+# result to the best N levels, walking only that part of the tree when it
+# is cheaper than decoding everything; None decodes the whole side.
+#
+def DecodeSerumSlab(data:          bytes,
+                    baseLotSize:   int,
+                    quoteLotSize:  int,
+                    baseDecimals:  int           = 0,
+                    quoteDecimals: int           = 0,
+                    depth:         Optional[int] = None) -> SerumOrderbookSide:
+    _RequireNumpy()
+    start: float = time.perf_counter() if RaydiumMetrics.SINK is not None else 0.0
+    if len(data) < SERUM_SLAB_NODES_OFFSET + SERUM_SLAB_TRAILER_SIZE:
+        raise ValueError(f"Slab account has {len(data)} bytes, too short!")
+    head, flags, bumpIndex, _, _, root, leafCount = _SLAB_HEADER.unpack_from(data, 0)
+    if head != b"serum" or not flags & SERUM_ACCOUNT_FLAG_INITIALIZED or not flags & (SERUM_ACCOUNT_FLAG_BIDS | SERUM_ACCOUNT_FLAG_ASKS):
+        raise ValueError(f"Not a Serum bids/asks account (account flags {flags:#x})!")
+    if baseLotSize <= 0 or quoteLotSize <= 0:
+        raise ValueError(f"Invalid lot sizes: base {baseLotSize}, quote {quoteLotSize}!")
+
+    isBids:    bool = bool(flags & SERUM_ACCOUNT_FLAG_BIDS)
+    nodeCount: int  = min(bumpIndex, (len(data) - SERUM_SLAB_NODES_OFFSET - SERUM_SLAB_TRAILER_SIZE) // SERUM_SLAB_NODE_SIZE)
+    complete:  bool = True
+    if depth is None:
+        priceLots, sizeLots = _DecodeAllLevels(data=data, nodeCount=nodeCount, leafCount=leafCount, isBids=isBids)
+    else:
+        if depth < 0:
+            raise ValueError(f"Invalid depth: {depth}!")
+        budget: int = _WALK_BUDGET_BASE + nodeCount // _WALK_BUDGET_RATIO
+        walk = ([], [], leafCount == 0)
+        if leafCount and depth:
+            estimate: int = 2 * min(leafCount, (depth + 1) * _WALK_ORDERS_PER_LEVEL) + 2 * leafCount.bit_length()
+            walk = _WalkLevels(data=data, nodeCount=nodeCount, root=root, isBids=isBids, depth=depth, budget=budget) if estimate <= budget else None
+        if walk is None:
+            priceLots, sizeLots = _DecodeAllLevels(data=data, nodeCount=nodeCount, leafCount=leafCount, isBids=isBids)
+            complete            = len(priceLots) <= depth
+            priceLots, sizeLots = priceLots[:depth], sizeLots[:depth]
+        else:
+            priceLots = np.asarray(walk[0], dtype=np.uint64)
+            sizeLots  = np.asarray(walk[1], dtype=np.uint64)
+            complete  = walk[2]
+
+    priceScale: float = quoteLotSize * 10**baseDecimals / (baseLotSize * 10**quoteDecimals)
+    sizeScale:  float = baseLotSize / 10**baseDecimals
+    result = SerumOrderbookSide(isBids    = isBids,
+                                priceLots = priceLots,
+                                sizeLots  = sizeLots,
+                                price     = priceLots.astype(np.float64) * priceScale,
+                                size      = sizeLots.astype(np.float64) * sizeScale,
+                                complete  = complete)
+    if RaydiumMetrics.SINK is not None:
+        RaydiumMetrics.Observe(RAYDIUM_METRIC_DECODE, time.perf_counter() - start, account="SerumSlab")
+    return result
+
+def DecodeSerumOrderbookSide(data: bytes, market: "SerumMarketV3", baseDecimals: int = 0, quoteDecimals: int = 0, depth: Optional[int] = None) -> SerumOrderbookSide:
+    return DecodeSerumSlab(data          = data,
+                           baseLotSize   = market.baseLotSize,
+                           quoteLotSize  = market.quoteLotSize,
+                           baseDecimals  = baseDecimals,
+                           quoteDecimals = quoteDecimals,
+                           depth         = depth)
+
+# =============================================================================
+# Both sides of a market in one `getMultipleAccounts` call.
+#
+def _MakeOrderbook(market: "SerumMarketV3", resp: Any, baseDecimals: int, quoteDecimals: int, depth: Optional[int]) -> SerumOrderbook:
+    bidsAccount, asksAccount = resp.value
+    if bidsAccount is None or asksAccount is None:
+        raise ValueError(f"Orderbook accounts of market {str(market.ownAddress)} not found!")
+    return SerumOrderbook(slot = resp.context.slot,
+                          bids = DecodeSerumOrderbookSide(data=bytes(bidsAccount.data), market=market, baseDecimals=baseDecimals, quoteDecimals=quoteDecimals, depth=depth),
+                          asks = DecodeSerumOrderbookSide(data=bytes(asksAccount.data), market=market, baseDecimals=baseDecimals, quoteDecimals=quoteDecimals, depth=depth))
+
+def FetchSerumOrderbook(connection:    Client,
+                        market:        "SerumMarketV3",
+                        baseDecimals:  int                  = 0,
+                        quoteDecimals: int                  = 0,
+                        depth:         Optional[int]        = None,
+                        commitment:    Optional[Commitment] = None) -> SerumOrderbook:
+    resp = connection.get_multiple_accounts(pubkeys=[market.bids, market.asks], commitment=commitment)
+    return _MakeOrderbook(market=market, resp=resp, baseDecimals=baseDecimals, quoteDecimals=quoteDecimals, depth=depth)
+
+async def FetchSerumOrderbookAsync(connection:    AsyncClient,
+                                   market:        "SerumMarketV3",
+                                   baseDecimals:  int                  = 0,
+                                   quoteDecimals: int                  = 0,
+                                   depth:         Optional[int]        = None,
+                                   commitment:    Optional[Commitment] = None) -> SerumOrderbook:
+    resp = await connection.get_multiple_accounts(pubkeys=[market.bids, market.asks], commitment=commitment)
+    return _MakeOrderbook(market=market, resp=resp, baseDecimals=baseDecimals, quoteDecimals=quoteDecimals, depth=depth)
+
+# =============================================================================
+#
@@ -0,0 +1,165 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: Raydium AMM persistent WSOL account
+#
+# =============================================================================
+# 
+from   solana.rpc.api             import Client
+from   solana.rpc.async_api       import AsyncClient
+from   solders.pubkey             import Pubkey
+from   solders.instruction        import Instruction
+from   solders.system_program     import transfer, TransferParams
+from   spl.token.constants        import WRAPPED_SOL_MINT, TOKEN_PROGRAM_ID
+from   spl.token.instructions     import sync_native, SyncNativeParams
+from   sapysol                    import SapysolPubkey, MakePubkey, GetAta, UnwrapSolInstruction
+from ..instructions.ata           import CreateAtaIdempotentIx
+from   typing                     import List, Dict, Optional, ClassVar
+import threading
+import logging
+import struct
+
+# =============================================================================
+# Long-lived WSOL account of a wallet. Swaps that spend or receive SOL use
+# this ATA directly instead of wrapping/unwrapping every time; the balance
+# is tracked locally and topped up in batches when it drops below
+# `MIN_BALANCE`.
+#
+# Local balance only changes through `RecordSwap`/`RecordTopUp` (call them
+# for confirmed transactions) and `Sync` (re-reads the ATA). Top-ups and
+# swap amounts that were emitted but not confirmed yet count as pending, so
+# a burst of swaps built before the first one lands neither tops up twice
+# nor overspends the balance; `Sync` clears them.
+#
+class PersistentWsol:
+    __WALLETS: ClassVar[Dict[Pubkey, "PersistentWsol"]] = {}
+
+    def __init__(self, walletAddress: SapysolPubkey, minBalance: int, topUpAmount: int):
+        self.WALLET_ADDRESS:   Pubkey         = MakePubkey(walletAddress)
+        self.ATA:              Pubkey         = GetAta(tokenMint=WRAPPED_SOL_MINT, owner=self.WALLET_ADDRESS)
+        self.MIN_BALANCE:      int            = minBalance
+        self.TOP_UP_AMOUNT:    int            = topUpAmount
+        self.BALANCE:          int            = 0
+        self.PENDING_TOP_UP:   int            = 0
+        self.PENDING_SPEND:    int            = 0
+        self.EXISTS:           bool           = False
+        self.__LOCK:           threading.Lock = threading.Lock()
+        self.__SYNC_NATIVE_IX: Instruction    = sync_native(SyncNativeParams(program_id=TOKEN_PROGRAM_ID, account=self.ATA))
+        self.__CREATE_ATA_IX:  Instruction    = CreateAtaIdempotentIx(tokenMint=WRAPPED_SOL_MINT, owner=self.WALLET_ADDRESS, payer=self.WALLET_ADDRESS)
+
+    # ========================================
+    # Registry: swaps built for a wallet with persistent WSOL enabled skip
+    # wrap/unwrap.
+    #
+    @staticmethod
+    def Enable(connection: Client, walletAddress: SapysolPubkey, minBalance: int, topUpAmount: int) -> "PersistentWsol":
+        wsol = PersistentWsol(walletAddress=walletAddress, minBalance=minBalance, topUpAmount=topUpAmount)
+        wsol.Sync(connection=connection)
+        PersistentWsol.__WALLETS[wsol.WALLET_ADDRESS] = wsol
+        return wsol
+
+    @staticmethod
+    async def EnableAsync(connection: AsyncClient, walletAddress: SapysolPubkey, minBalance: int, topUpAmount: int) -> "PersistentWsol":
+        wsol = PersistentWsol(walletAddress=walletAddress, minBalance=minBalance, topUpAmount=topUpAmount)
+        await wsol.SyncAsync(connection=connection)
+        PersistentWsol.__WALLETS[wsol.WALLET_ADDRESS] = wsol
+        return wsol
+
+    @staticmethod
+    def Disable(walletAddress: SapysolPubkey):
+        PersistentWsol.__WALLETS.pop(MakePubkey(walletAddress), None)
+
+    @staticmethod
+    def Get(walletAddress: SapysolPubkey) -> Optional["PersistentWsol"]:
+        return PersistentWsol.__WALLETS.get(MakePubkey(walletAddress))
+
+    # ========================================
+    #
+    def __SetAccount(self, data: Optional[bytes]):
+        with self.__LOCK:
+            self.EXISTS         = data is not None
+            self.BALANCE        = 0 if data is None else struct.unpack_from("<Q", data, 64)[0]
+            self.PENDING_TOP_UP = 0
+            self.PENDING_SPEND  = 0
+        logging.debug("Persistent WSOL %s: exists=%s, balance=%s", self.ATA, self.EXISTS, self.BALANCE)
+
+    def Sync(self, connection: Client):
+        resp = connection.get_account_info(pubkey=self.ATA)
+        self.__SetAccount(data=None if resp.value is None else resp.value.data)
+
+    async def SyncAsync(self, connection: AsyncClient):
+        resp = await connection.get_account_info(pubkey=self.ATA)
+        self.__SetAccount(data=None if resp.value is None else resp.value.data)
+
+    # ========================================
+    # For swaps that receive WSOL: create the ATA if it is not known to exist.
+    #
+    def GetCreateInstructions(self) -> List[Instruction]:
+        return [] if self.EXISTS else [self.__CREATE_ATA_IX]
+
+    # ========================================
+    # Instructions to put in front of a swap that spends `amountIn` WSOL.
+    # Empty when the balance is enough. `amountIn` stays reserved as a
+    # pending spend until `RecordSwap` (or `ReleaseSpend` if the swap never
+    # lands). `dryRun` builds the same instructions without reserving
+    # anything, for transactions that are only simulated.
+    #
+    def GetTopUpInstructions(self, amountIn: int = 0, dryRun: bool = False) -> List[Instruction]:
+        ixList: List[Instruction] = []
+        with self.__LOCK:
+            if not self.EXISTS:
+                ixList.append(self.__CREATE_ATA_IX)
+            available: int = self.BALANCE + self.PENDING_TOP_UP - self.PENDING_SPEND - amountIn
+            if not dryRun:
+                self.PENDING_SPEND += amountIn
+            if available < self.MIN_BALANCE:
+                lamports: int = self.TOP_UP_AMOUNT + (self.MIN_BALANCE - available)
+                if not dryRun:
+                    self.PENDING_TOP_UP += lamports
+                ixList.append(transfer(TransferParams(from_pubkey=self.WALLET_ADDRESS, to_pubkey=self.ATA, lamports=lamports)))
+                ixList.append(self.__SYNC_NATIVE_IX)
+        return ixList
+
+    # ========================================
+    # Confirmed transactions. `RecordTopUp` settles a pending top-up,
+    # `RecordSwap` a pending spend.
+    #
+    def RecordTopUp(self, lamports: int):
+        with self.__LOCK:
+            self.EXISTS          = True
+            self.BALANCE        += lamports
+            self.PENDING_TOP_UP  = max(0, self.PENDING_TOP_UP - lamports)
+
+    def RecordSwap(self, wsolSpent: int = 0, wsolReceived: int = 0):
+        with self.__LOCK:
+            self.EXISTS         = True
+            self.BALANCE       += wsolReceived - wsolSpent
+            self.PENDING_SPEND  = max(0, self.PENDING_SPEND - wsolSpent)
+
+    # Swap built with `GetTopUpInstructions` that failed or was never sent.
+    def ReleaseSpend(self, lamports: int):
+        with self.__LOCK:
+            self.PENDING_SPEND = max(0, self.PENDING_SPEND - lamports)
+
+    # ========================================
+    # Unwraps everything back to SOL and stops managing the account.
+    #
+    def GetCloseInstruction(self) -> Instruction:
+        PersistentWsol.Disable(walletAddress=self.WALLET_ADDRESS)
+        return UnwrapSolInstruction(owner=self.WALLET_ADDRESS)
+
+# =============================================================================
+# 
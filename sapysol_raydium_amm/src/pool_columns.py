@@ -0,0 +1,130 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: Raydium AMM columnar decoding
+#
+# =============================================================================
+# 
+from   solders.pubkey                 import Pubkey
+from   sapysol                        import SapysolPubkey, MakePubkey
+from  .codec                          import CompiledLayout, FIELD_SCALAR, FIELD_U128, FIELD_PUBKEY, FIELD_ARRAY, FIELD_U128S
+from ..accounts.raydium_amm_v4        import RaydiumLiquidityPoolV4
+from   typing                         import List, Dict, Tuple, Iterable, Optional, Union, Any
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# =============================================================================
+#
+def _RequireNumpy():
+    if np is None:
+        raise ImportError("Columnar decoding requires `numpy`, please install it (pip install numpy)!")
+
+_NUMPY_SCALARS: Dict[str, str] = {"B": "u1", "H": "<u2", "I": "<u4", "Q": "<u8", "b": "i1", "h": "<i2", "i": "<i4", "q": "<i8"}
+
+# =============================================================================
+# Packed structured dtype mirroring a compiled layout (itemsize == SIZE):
+# u128 `x` becomes `x_lo`/`x_hi` u64 columns, pubkeys are 32 x u8 and
+# scalar arrays are subarrays (u128 arrays: (count, 2) lo/hi pairs).
+#
+_DTYPES: Dict[int, Any] = {}
+
+def CompiledLayoutDtype(layout: CompiledLayout) -> Any:
+    _RequireNumpy()
+    dtype = _DTYPES.get(id(layout))
+    if dtype is None:
+        items: List[tuple] = []
+        for field in layout.FIELDS:
+            if field.kind == FIELD_SCALAR:
+                items.append((field.name, _NUMPY_SCALARS[field.fmt]))
+            elif field.kind == FIELD_U128:
+                items += [(f"{field.name}_lo", "<u8"), (f"{field.name}_hi", "<u8")]
+            elif field.kind == FIELD_PUBKEY:
+                items.append((field.name, "u1", (32,)))
+            elif field.kind == FIELD_ARRAY:
+                items.append((field.name, _NUMPY_SCALARS[field.fmt[-1]], (field.count,)))
+            elif field.kind == FIELD_U128S:
+                items.append((field.name, "<u8", (field.count // 2, 2)))
+        dtype = np.dtype(items)
+        assert dtype.itemsize == layout.SIZE
+        _DTYPES[id(layout)] = dtype
+    return dtype
+
+# =============================================================================
+# Zero-copy view of N concatenated raw accounts as a structured array; the
+# array keeps `buffer` alive and is read-only for `bytes` input.
+#
+def DecodeColumns(layout: CompiledLayout, buffer: Union[bytes, bytearray, memoryview]) -> Any:
+    dtype = CompiledLayoutDtype(layout=layout)
+    if len(buffer) % dtype.itemsize:
+        raise ValueError(f"Buffer length {len(buffer)} is not a multiple of account size {dtype.itemsize}!")
+    return np.frombuffer(buffer, dtype=dtype)
+
+def DecodeRaydiumPoolColumns(buffer: Union[bytes, bytearray, memoryview]) -> Any:
+    return DecodeColumns(layout=RaydiumLiquidityPoolV4.codec, buffer=buffer)
+
+# =============================================================================
+# Collects (pubkey, data) pairs (e.g. `StreamProgramAccounts`) into one
+# contiguous buffer: returns pool addresses and the columnar view.
+#
+def RaydiumPoolColumnsFromAccounts(accounts: Iterable[Tuple[Pubkey, bytes]]) -> Tuple[List[Pubkey], Any]:
+    _RequireNumpy()
+    size:      int          = RaydiumLiquidityPoolV4.codec.SIZE
+    addresses: List[Pubkey] = []
+    buffer:    bytearray    = bytearray()
+    for pubkey, data in accounts:
+        if len(data) != size:
+            raise ValueError(f"Account {str(pubkey)} has {len(data)} bytes, expected {size}!")
+        addresses.append(pubkey)
+        buffer += data
+    return (addresses, DecodeRaydiumPoolColumns(buffer=buffer))
+
+# =============================================================================
+# Column helpers.
+#
+def U128Column(columns: Any, name: str) -> Any:
+    return (columns[f"{name}_hi"].astype(object) << 64) | columns[f"{name}_lo"].astype(object)
+
+def PubkeyColumn(columns: Any, name: str) -> List[Pubkey]:
+    return [Pubkey.from_bytes(row.tobytes()) for row in columns[name]]
+
+# =============================================================================
+# Vectorized filters, each returns a boolean mask over rows; combine with
+# `&` / `|` and index `columns[mask]`.
+#
+def FilterStatus(columns: Any, statuses: Iterable[int]) -> Any:
+    return np.isin(columns["status"], np.asarray(list(statuses), dtype=np.uint64))
+
+def FilterPoolOpenTime(columns: Any, openedBefore: Optional[int] = None, openedAfter: Optional[int] = None) -> Any:
+    mask = np.ones(len(columns), dtype=bool)
+    if openedBefore is not None:
+        mask &= columns["poolOpenTime"] < np.uint64(openedBefore)
+    if openedAfter is not None:
+        mask &= columns["poolOpenTime"] > np.uint64(openedAfter)
+    return mask
+
+def FilterMint(columns: Any, mint: SapysolPubkey, field: Optional[str] = None) -> Any:
+    key = np.frombuffer(bytes(MakePubkey(mint)), dtype=np.uint8)
+    if field is not None:
+        return (columns[field] == key).all(axis=1)
+    return (columns["baseMint"] == key).all(axis=1) | (columns["quoteMint"] == key).all(axis=1)
+
+def FilterMintPair(columns: Any, baseMint: SapysolPubkey, quoteMint: SapysolPubkey) -> Any:
+    return FilterMint(columns=columns, mint=baseMint, field="baseMint") & FilterMint(columns=columns, mint=quoteMint, field="quoteMint")
+
+# =============================================================================
+# 
@@ -0,0 +1,312 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: Raydium mint to pools index
+#
+# =============================================================================
+# 
+from   solana.rpc.api                 import Client
+from   solana.rpc.async_api           import AsyncClient
+from   solana.rpc.commitment          import Commitment
+from   solana.rpc.types               import DataSliceOpts, MemcmpOpts
+from   solders.pubkey                 import Pubkey
+from   sapysol                        import SapysolPubkey, MakePubkey
+from  .constants                      import RAYDIUM_LIQUIDITY_POOL_V4
+from  .storage                        import RaydiumCacheCodec, RaydiumCacheStorage, MakeDefaultRaydiumCacheStorage
+from ..accounts.raydium_amm_v4        import RaydiumLiquidityPoolV4
+from   typing                         import List, Dict, Set, Tuple, NamedTuple, Optional, Iterable
+import threading
+import asyncio
+import logging
+import struct
+import time
+
+# =============================================================================
+# (pool, base mint, quote mint)
+#
+class RaydiumPoolIndexPool(NamedTuple):
+    poolAddress: Pubkey #
+    baseMint:    Pubkey #
+    quoteMint:   Pubkey #
+
+# =============================================================================
+# Every Raydium V4 pool that has `mint` as base or quote mint, as of
+# `scanTime` (unix seconds). Binary form is `<Q` scanTime followed by
+# 96 bytes (pool, base, quote) per pool.
+#
+class RaydiumPoolIndexEntry(NamedTuple):
+    mint:     Pubkey                     #
+    scanTime: int                        #
+    pools:    List[RaydiumPoolIndexPool] #
+
+    def to_json(self) -> dict:
+        return {"mint":     str(self.mint),
+                "scanTime": self.scanTime,
+                "pools":    [[str(pool.poolAddress), str(pool.baseMint), str(pool.quoteMint)] for pool in self.pools]}
+
+    @staticmethod
+    def from_json(obj: dict) -> "RaydiumPoolIndexEntry":
+        return RaydiumPoolIndexEntry(mint     = MakePubkey(obj["mint"]),
+                                     scanTime = obj["scanTime"],
+                                     pools    = [RaydiumPoolIndexPool(*[MakePubkey(key) for key in pool]) for pool in obj["pools"]])
+
+    def to_bytes(self) -> bytes:
+        return struct.pack("<Q", self.scanTime) + b"".join(bytes(key) for pool in self.pools for key in pool)
+
+    @staticmethod
+    def from_bytes(data: bytes) -> "RaydiumPoolIndexEntry":
+        keys: List[Pubkey] = [Pubkey.from_bytes(data[offset:offset + 32]) for offset in range(8, len(data), 32)]
+        return RaydiumPoolIndexEntry(mint     = None, # filled in from the storage key, see `RaydiumPoolIndex.__Load`
+                                     scanTime = struct.unpack_from("<Q", data)[0],
+                                     pools    = [RaydiumPoolIndexPool(*keys[index:index + 3]) for index in range(0, len(keys), 3)])
+
+RAYDIUM_POOL_INDEX_CODEC = RaydiumCacheCodec(toJson    = lambda entry: entry.to_json(),
+                                             fromJson  = lambda obj:   RaydiumPoolIndexEntry.from_json(obj) if "pools" in obj else None,
+                                             toBytes   = lambda entry: entry.to_bytes(),
+                                             fromBytes = lambda data:  RaydiumPoolIndexEntry.from_bytes(data))
+
+# =============================================================================
+# Mint -> pools index of RAYDIUM_LIQUIDITY_POOL_V4.
+#
+# `getProgramAccounts` is called with a `dataSize` filter, `memcmp` on
+# `baseMint`/`quoteMint` and a `dataSlice` covering only both mints (64 bytes
+# per pool instead of 752). `ScanAll` indexes the whole program once, after
+# that `Refresh` rescans only mints whose entries are older than `maxAge`
+# (with one `ScanAll` when more than `FULL_SCAN_MINTS` are stale, e.g. all
+# entries of an earlier `ScanAll`), and lookups of unknown mints scan just
+# that mint.
+#
+# Entries are persisted per mint (`raydium_pool_index.sqlite`); in memory
+# pools are keyed by (base mint, quote mint) for O(1) lookups.
+#
+class RaydiumPoolIndex:
+    PROJECTION = RaydiumLiquidityPoolV4.codec.Projection(["baseMint", "quoteMint"])
+    MAX_AGE:         int = 24 * 3600
+    FULL_SCAN_MINTS: int = 16 # each mint rescan is two filtered `getProgramAccounts` calls
+    __ENTRIES: Dict[Pubkey, RaydiumPoolIndexEntry] = {}
+    __PAIRS:   Dict[Tuple[Pubkey, Pubkey], List[Pubkey]] = {}
+    __LOCK:    threading.Lock = threading.Lock()
+    __STORAGE: Optional[RaydiumCacheStorage] = None
+
+    # ========================================
+    #
+    @staticmethod
+    def GetStorage() -> RaydiumCacheStorage:
+        if RaydiumPoolIndex.__STORAGE is None:
+            RaydiumPoolIndex.__STORAGE = MakeDefaultRaydiumCacheStorage(codec=RAYDIUM_POOL_INDEX_CODEC, fileName="raydium_pool_index.sqlite")
+        return RaydiumPoolIndex.__STORAGE
+
+    @staticmethod
+    def SetStorage(storage: RaydiumCacheStorage):
+        with RaydiumPoolIndex.__LOCK:
+            RaydiumPoolIndex.__STORAGE = storage
+            RaydiumPoolIndex.__ENTRIES.clear()
+            RaydiumPoolIndex.__PAIRS.clear()
+
+    # ========================================
+    # A fresh entry is authoritative for every pair that contains its mint.
+    #
+    @staticmethod
+    def __Apply(entry: RaydiumPoolIndexEntry):
+        previous: Optional[RaydiumPoolIndexEntry] = RaydiumPoolIndex.__ENTRIES.get(entry.mint)
+        if previous is not None:
+            for pool in previous.pools:
+                RaydiumPoolIndex.__PAIRS.pop((pool.baseMint, pool.quoteMint), None)
+        pairs: Dict[Tuple[Pubkey, Pubkey], List[Pubkey]] = {}
+        for pool in entry.pools:
+            pairs.setdefault((pool.baseMint, pool.quoteMint), []).append(pool.poolAddress)
+        RaydiumPoolIndex.__PAIRS.update(pairs)
+        RaydiumPoolIndex.__ENTRIES[entry.mint] = entry
+
+    @staticmethod
+    def __Load(mint: Pubkey) -> Optional[RaydiumPoolIndexEntry]:
+        entry = RaydiumPoolIndex.__ENTRIES.get(mint)
+        if entry is None:
+            entry = RaydiumPoolIndex.GetStorage().Get(key=mint)
+            if entry is not None:
+                entry = entry._replace(mint=mint)
+                with RaydiumPoolIndex.__LOCK:
+                    RaydiumPoolIndex.__Apply(entry=entry)
+        return entry
+
+    @staticmethod
+    def __Save(entries: List[RaydiumPoolIndexEntry]):
+        with RaydiumPoolIndex.__LOCK:
+            for entry in entries:
+                RaydiumPoolIndex.__Apply(entry=entry)
+        RaydiumPoolIndex.GetStorage().PutMany(items={entry.mint: entry for entry in entries})
+
+    # ========================================
+    # Loads every persisted entry into memory.
+    #
+    @staticmethod
+    def LoadAll() -> int:
+        entries: List[RaydiumPoolIndexEntry] = [entry._replace(mint=mint) for mint, entry in RaydiumPoolIndex.GetStorage().LoadAll().items()]
+        with RaydiumPoolIndex.__LOCK:
+            for entry in entries:
+                RaydiumPoolIndex.__Apply(entry=entry)
+        return len(entries)
+
+    # ========================================
+    #
+    @staticmethod
+    def __Filters(mintField: str, mint: Pubkey) -> list:
+        return [RaydiumLiquidityPoolV4.codec.SIZE, MemcmpOpts(offset=RaydiumLiquidityPoolV4.codec.OFFSETS[mintField].offset, bytes=str(mint))]
+
+    @staticmethod
+    def __DataSlice() -> DataSliceOpts:
+        return DataSliceOpts(offset=RaydiumPoolIndex.PROJECTION.OFFSET, length=RaydiumPoolIndex.PROJECTION.LENGTH)
+
+    @staticmethod
+    def __DecodePools(accounts: Iterable) -> List[RaydiumPoolIndexPool]:
+        pools: List[RaydiumPoolIndexPool] = []
+        for account in accounts:
+            fields = RaydiumPoolIndex.PROJECTION.decode(account.account.data)
+            pools.append(RaydiumPoolIndexPool(poolAddress=account.pubkey, baseMint=fields["baseMint"], quoteMint=fields["quoteMint"]))
+        return pools
+
+    @staticmethod
+    def __MakeEntries(pools: List[RaydiumPoolIndexPool], scanTime: int) -> List[RaydiumPoolIndexEntry]:
+        byMint: Dict[Pubkey, List[RaydiumPoolIndexPool]] = {}
+        for pool in pools:
+            byMint.setdefault(pool.baseMint, []).append(pool)
+            if pool.quoteMint != pool.baseMint:
+                byMint.setdefault(pool.quoteMint, []).append(pool)
+        return [RaydiumPoolIndexEntry(mint=mint, scanTime=scanTime, pools=mintPools) for mint, mintPools in byMint.items()]
+
+    # A full scan is authoritative: indexed mints it did not find have no
+    # pools left.
+    @staticmethod
+    def __MakeFullScanEntries(pools: List[RaydiumPoolIndexPool], scanTime: int) -> List[RaydiumPoolIndexEntry]:
+        entries: List[RaydiumPoolIndexEntry] = RaydiumPoolIndex.__MakeEntries(pools=pools, scanTime=scanTime)
+        found:   Set[Pubkey]                 = {entry.mint for entry in entries}
+        return entries + [RaydiumPoolIndexEntry(mint=mint, scanTime=scanTime, pools=[]) for mint in list(RaydiumPoolIndex.__ENTRIES) if mint not in found]
+
+    # ========================================
+    # Two filtered `getProgramAccounts` calls: `mint` as base and as quote.
+    #
+    @staticmethod
+    def ScanMint(connection: Client, mint: SapysolPubkey, commitment: Optional[Commitment] = None) -> RaydiumPoolIndexEntry:
+        mint: Pubkey = MakePubkey(mint)
+        pools: List[RaydiumPoolIndexPool] = []
+        for mintField in ["baseMint", "quoteMint"]:
+            resp = connection.get_program_accounts(RAYDIUM_LIQUIDITY_POOL_V4, commitment=commitment, data_slice=RaydiumPoolIndex.__DataSlice(),
+                                                   filters=RaydiumPoolIndex.__Filters(mintField=mintField, mint=mint))
+            pools += RaydiumPoolIndex.__DecodePools(resp.value)
+        entry = RaydiumPoolIndexEntry(mint=mint, scanTime=int(time.time()), pools=pools)
+        RaydiumPoolIndex.__Save(entries=[entry])
+        logging.debug("Raydium pool index: %s pools for mint %s", len(pools), mint)
+        return entry
+
+    @staticmethod
+    async def ScanMintAsync(connection: AsyncClient, mint: SapysolPubkey, commitment: Optional[Commitment] = None) -> RaydiumPoolIndexEntry:
+        mint: Pubkey = MakePubkey(mint)
+        resps = await asyncio.gather(*[connection.get_program_accounts(RAYDIUM_LIQUIDITY_POOL_V4, commitment=commitment, data_slice=RaydiumPoolIndex.__DataSlice(),
+                                                                       filters=RaydiumPoolIndex.__Filters(mintField=mintField, mint=mint))
+                                       for mintField in ["baseMint", "quoteMint"]])
+        pools: List[RaydiumPoolIndexPool] = [pool for resp in resps for pool in RaydiumPoolIndex.__DecodePools(resp.value)]
+        entry = RaydiumPoolIndexEntry(mint=mint, scanTime=int(time.time()), pools=pools)
+        RaydiumPoolIndex.__Save(entries=[entry])
+        logging.debug("Raydium pool index: %s pools for mint %s", len(pools), mint)
+        return entry
+
+    # ========================================
+    # Indexes every pool of the program with one `getProgramAccounts`.
+    # Returns the number of pools.
+    #
+    @staticmethod
+    def ScanAll(connection: Client, commitment: Optional[Commitment] = None) -> int:
+        resp = connection.get_program_accounts(RAYDIUM_LIQUIDITY_POOL_V4, commitment=commitment, data_slice=RaydiumPoolIndex.__DataSlice(),
+                                               filters=[RaydiumLiquidityPoolV4.codec.SIZE])
+        pools: List[RaydiumPoolIndexPool] = RaydiumPoolIndex.__DecodePools(resp.value)
+        RaydiumPoolIndex.__Save(entries=RaydiumPoolIndex.__MakeFullScanEntries(pools=pools, scanTime=int(time.time())))
+        logging.debug("Raydium pool index: %s pools", len(pools))
+        return len(pools)
+
+    @staticmethod
+    async def ScanAllAsync(connection: AsyncClient, commitment: Optional[Commitment] = None) -> int:
+        resp = await connection.get_program_accounts(RAYDIUM_LIQUIDITY_POOL_V4, commitment=commitment, data_slice=RaydiumPoolIndex.__DataSlice(),
+                                                     filters=[RaydiumLiquidityPoolV4.codec.SIZE])
+        pools: List[RaydiumPoolIndexPool] = RaydiumPoolIndex.__DecodePools(resp.value)
+        RaydiumPoolIndex.__Save(entries=RaydiumPoolIndex.__MakeFullScanEntries(pools=pools, scanTime=int(time.time())))
+        logging.debug("Raydium pool index: %s pools", len(pools))
+        return len(pools)
+
+    # ========================================
+    # Incremental refresh: rescans `mints` (default: every indexed mint)
+    # whose entries are older than `maxAge` seconds, one by one or with one
+    # `ScanAll` when more than `FULL_SCAN_MINTS` are stale. Returns the stale
+    # mints.
+    #
+    @staticmethod
+    def __StaleMints(mints: Optional[List[SapysolPubkey]], maxAge: Optional[int]) -> List[Pubkey]:
+        if mints is None:
+            RaydiumPoolIndex.LoadAll()
+            mints = list(RaydiumPoolIndex.__ENTRIES.keys())
+        deadline: int = int(time.time()) - (RaydiumPoolIndex.MAX_AGE if maxAge is None else maxAge)
+        stale: List[Pubkey] = []
+        for mint in [MakePubkey(mint) for mint in mints]:
+            entry = RaydiumPoolIndex.__Load(mint=mint)
+            if entry is None or entry.scanTime <= deadline:
+                stale.append(mint)
+        return stale
+
+    @staticmethod
+    def Refresh(connection: Client, mints: Optional[List[SapysolPubkey]] = None, maxAge: Optional[int] = None) -> List[Pubkey]:
+        stale: List[Pubkey] = RaydiumPoolIndex.__StaleMints(mints=mints, maxAge=maxAge)
+        if len(stale) > RaydiumPoolIndex.FULL_SCAN_MINTS:
+            RaydiumPoolIndex.ScanAll(connection=connection)
+            return stale
+        for mint in stale:
+            RaydiumPoolIndex.ScanMint(connection=connection, mint=mint)
+        return stale
+
+    @staticmethod
+    async def RefreshAsync(connection: AsyncClient, mints: Optional[List[SapysolPubkey]] = None, maxAge: Optional[int] = None) -> List[Pubkey]:
+        stale: List[Pubkey] = RaydiumPoolIndex.__StaleMints(mints=mints, maxAge=maxAge)
+        if len(stale) > RaydiumPoolIndex.FULL_SCAN_MINTS:
+            await RaydiumPoolIndex.ScanAllAsync(connection=connection)
+            return stale
+        await asyncio.gather(*[RaydiumPoolIndex.ScanMintAsync(connection=connection, mint=mint) for mint in stale])
+        return stale
+
+    # ========================================
+    # Pools with exactly this base/quote order. Without `connection` only
+    # the index is consulted, with it a missing or stale `baseMint` entry
+    # is rescanned first.
+    #
+    @staticmethod
+    def GetPools(baseMint: SapysolPubkey, quoteMint: SapysolPubkey, connection: Optional[Client] = None, maxAge: Optional[int] = None) -> List[Pubkey]:
+        baseMint:  Pubkey = MakePubkey(baseMint)
+        quoteMint: Pubkey = MakePubkey(quoteMint)
+        if connection is not None:
+            RaydiumPoolIndex.Refresh(connection=connection, mints=[baseMint], maxAge=maxAge)
+        else:
+            RaydiumPoolIndex.__Load(mint=baseMint)
+        return list(RaydiumPoolIndex.__PAIRS.get((baseMint, quoteMint), []))
+
+    @staticmethod
+    async def GetPoolsAsync(baseMint: SapysolPubkey, quoteMint: SapysolPubkey, connection: Optional[AsyncClient] = None, maxAge: Optional[int] = None) -> List[Pubkey]:
+        baseMint:  Pubkey = MakePubkey(baseMint)
+        quoteMint: Pubkey = MakePubkey(quoteMint)
+        if connection is not None:
+            await RaydiumPoolIndex.RefreshAsync(connection=connection, mints=[baseMint], maxAge=maxAge)
+        else:
+            RaydiumPoolIndex.__Load(mint=baseMint)
+        return list(RaydiumPoolIndex.__PAIRS.get((baseMint, quoteMint), []))
+
+# =============================================================================
+# 
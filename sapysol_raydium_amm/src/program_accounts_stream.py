@@ -0,0 +1,209 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: Streaming getProgramAccounts
+#
+# =============================================================================
+# 
+from   solana.rpc.commitment          import Commitment
+from   solana.rpc.types               import DataSliceOpts, MemcmpOpts
+from   solders.pubkey                 import Pubkey
+from   sapysol                        import SapysolPubkey, MakePubkey
+from  .constants                      import RAYDIUM_LIQUIDITY_POOL_V4, RAYDIUM_SERUM_PROGAM_ID
+from ..accounts.raydium_amm_v4        import RaydiumLiquidityPoolV4
+from ..accounts.serum_market_v3       import SerumMarketV3
+from   typing                         import List, Dict, Tuple, Union, Optional, Iterator, AsyncIterator, Callable, Any
+import binascii
+import logging
+import httpx
+import json
+import re
+
+# =============================================================================
+# Account objects of a base64 `getProgramAccounts` response contain no
+# strings with braces (pubkeys, base64 and "base64"), so object boundaries
+# can be found by counting braces with a regex instead of a JSON parser.
+#
+_BRACE_RE:  re.Pattern = re.compile(rb"[{}]")
+_PUBKEY_RE: re.Pattern = re.compile(rb'"pubkey"\s*:\s*"([1-9A-HJ-NP-Za-km-z]+)"')
+_DATA_RE:   re.Pattern = re.compile(rb'"data"\s*:\s*\[\s*"([A-Za-z0-9+/=]*)"')
+_RESULT_RE: re.Pattern = re.compile(rb'"result"\s*:\s*\[')
+
+# =============================================================================
+# Incremental parser of a `getProgramAccounts` JSON-RPC response (base64
+# encoding, no `withContext`). `feed()` takes raw response chunks and yields
+# (pubkey, data) for every account completed so far; only the unfinished
+# tail of the response is buffered.
+# Account data is not decoded into a reused buffer: binascii has no
+# decode-into API, so copying `a2b_base64` output into a preallocated
+# bytearray would only add a copy. Each account gets its own short-lived
+# bytes object that the fast decoders consume immediately, which keeps
+# memory bounded just the same.
+#
+class ProgramAccountsStreamParser:
+    def __init__(self):
+        self.BUFFER:   bytearray = bytearray()
+        self.STARTED:  bool      = False # "result": [ seen
+        self.FINISHED: bool      = False # closing ] seen
+        self.ACCOUNTS: int       = 0
+
+    # ========================================
+    #
+    def feed(self, chunk: bytes) -> Iterator[Tuple[Pubkey, bytes]]:
+        buffer: bytearray = self.BUFFER
+        buffer += chunk
+        position: int = 0
+        if not self.STARTED:
+            match = _RESULT_RE.search(buffer)
+            if match is None:
+                if b'"error"' in buffer and buffer.rstrip().endswith(b"}"):
+                    raise ValueError(f"getProgramAccounts failed: {json.loads(bytes(buffer)).get('error')}")
+                return
+            self.STARTED = True
+            position = match.end()
+
+        while not self.FINISHED:
+            # Skip separators up to the next object or the end of the array
+            while position < len(buffer) and buffer[position] in b" \t\r\n,":
+                position += 1
+            if position >= len(buffer):
+                break
+            if buffer[position] == ord("]"):
+                self.FINISHED = True
+                position += 1
+                break
+
+            depth: int = 0
+            end:   int = -1
+            for brace in _BRACE_RE.finditer(buffer, position):
+                depth += 1 if brace.group() == b"{" else -1
+                if depth == 0:
+                    end = brace.end()
+                    break
+            if end < 0:
+                break # incomplete object, wait for more data
+
+            item = memoryview(buffer)[position:end]
+            try:
+                pubkey = _PUBKEY_RE.search(item)
+                data   = _DATA_RE.search(item)
+                if pubkey is None or data is None:
+                    raise ValueError(f"Unexpected getProgramAccounts item: {bytes(item[:200])}")
+                self.ACCOUNTS += 1
+                yieldPubkey = Pubkey.from_string(pubkey.group(1).decode())
+                yieldData   = binascii.a2b_base64(data.group(1))
+            finally:
+                item.release()
+            position = end
+            yield (yieldPubkey, yieldData)
+
+        del buffer[:position]
+
+    # ========================================
+    #
+    def close(self):
+        if not self.FINISHED:
+            raise ValueError(f"Truncated getProgramAccounts response after {self.ACCOUNTS} accounts!")
+
+# =============================================================================
+# JSON-RPC request body, `filters` are the same as in
+# `Client.get_program_accounts` (int for dataSize or `MemcmpOpts`).
+#
+def MakeProgramAccountsRequest(programID:  SapysolPubkey,
+                               filters:    Optional[List[Union[int, MemcmpOpts]]] = None,
+                               dataSlice:  Optional[DataSliceOpts]                = None,
+                               commitment: Optional[Commitment]                   = None) -> Dict[str, Any]:
+    config: Dict[str, Any] = {"encoding": "base64"}
+    if commitment is not None:
+        config["commitment"] = str(commitment)
+    if dataSlice is not None:
+        config["dataSlice"] = {"offset": dataSlice.offset, "length": dataSlice.length}
+    if filters:
+        config["filters"] = [{"dataSize": item} if isinstance(item, int) else {"memcmp": {"offset": item.offset, "bytes": str(item.bytes)}} for item in filters]
+    return {"jsonrpc": "2.0", "id": 1, "method": "getProgramAccounts", "params": [str(MakePubkey(programID)), config]}
+
+# =============================================================================
+# Streams (pubkey, data) of every matching account; memory use is bounded
+# by `chunkSize` plus one account, regardless of the response size.
+#
+def StreamProgramAccounts(endpoint:   str,
+                          programID:  SapysolPubkey,
+                          filters:    Optional[List[Union[int, MemcmpOpts]]] = None,
+                          dataSlice:  Optional[DataSliceOpts]                = None,
+                          commitment: Optional[Commitment]                   = None,
+                          chunkSize:  int                                    = 1 << 16,
+                          timeout:    Optional[float]                        = 600) -> Iterator[Tuple[Pubkey, bytes]]:
+    parser  = ProgramAccountsStreamParser()
+    request = MakeProgramAccountsRequest(programID=programID, filters=filters, dataSlice=dataSlice, commitment=commitment)
+    with httpx.stream("POST", endpoint, json=request, timeout=timeout) as resp:
+        resp.raise_for_status()
+        for chunk in resp.iter_bytes(chunk_size=chunkSize):
+            yield from parser.feed(chunk)
+    parser.close()
+    logging.debug("getProgramAccounts %s: %s accounts streamed", programID, parser.ACCOUNTS)
+
+async def StreamProgramAccountsAsync(endpoint:   str,
+                                     programID:  SapysolPubkey,
+                                     filters:    Optional[List[Union[int, MemcmpOpts]]] = None,
+                                     dataSlice:  Optional[DataSliceOpts]                = None,
+                                     commitment: Optional[Commitment]                   = None,
+                                     chunkSize:  int                                    = 1 << 16,
+                                     timeout:    Optional[float]                        = 600) -> AsyncIterator[Tuple[Pubkey, bytes]]:
+    parser  = ProgramAccountsStreamParser()
+    request = MakeProgramAccountsRequest(programID=programID, filters=filters, dataSlice=dataSlice, commitment=commitment)
+    async with httpx.AsyncClient(timeout=timeout) as client:
+        async with client.stream("POST", endpoint, json=request) as resp:
+            resp.raise_for_status()
+            async for chunk in resp.aiter_bytes(chunk_size=chunkSize):
+                for item in parser.feed(chunk):
+                    yield item
+    parser.close()
+    logging.debug("getProgramAccounts %s: %s accounts streamed", programID, parser.ACCOUNTS)
+
+# =============================================================================
+# Every AMM v4 pool / Serum market, decoded with the compiled codecs.
+# Extra `filters` (e.g. `MemcmpOpts` on a mint) are added to `dataSize`.
+#
+def StreamRaydiumPools(endpoint:   str,
+                       filters:    Optional[List[MemcmpOpts]] = None,
+                       commitment: Optional[Commitment]       = None) -> Iterator[Tuple[Pubkey, RaydiumLiquidityPoolV4]]:
+    decode: Callable = RaydiumLiquidityPoolV4.decode_fast
+    for pubkey, data in StreamProgramAccounts(endpoint=endpoint, programID=RAYDIUM_LIQUIDITY_POOL_V4, filters=[RaydiumLiquidityPoolV4.codec.SIZE] + (filters or []), commitment=commitment):
+        yield (pubkey, decode(data))
+
+def StreamSerumMarkets(endpoint:   str,
+                       filters:    Optional[List[MemcmpOpts]] = None,
+                       commitment: Optional[Commitment]       = None) -> Iterator[Tuple[Pubkey, SerumMarketV3]]:
+    decode: Callable = SerumMarketV3.decode_fast
+    for pubkey, data in StreamProgramAccounts(endpoint=endpoint, programID=RAYDIUM_SERUM_PROGAM_ID, filters=[SerumMarketV3.codec.SIZE] + (filters or []), commitment=commitment):
+        yield (pubkey, decode(data))
+
+async def StreamRaydiumPoolsAsync(endpoint:   str,
+                                  filters:    Optional[List[MemcmpOpts]] = None,
+                                  commitment: Optional[Commitment]       = None) -> AsyncIterator[Tuple[Pubkey, RaydiumLiquidityPoolV4]]:
+    decode: Callable = RaydiumLiquidityPoolV4.decode_fast
+    async for pubkey, data in StreamProgramAccountsAsync(endpoint=endpoint, programID=RAYDIUM_LIQUIDITY_POOL_V4, filters=[RaydiumLiquidityPoolV4.codec.SIZE] + (filters or []), commitment=commitment):
+        yield (pubkey, decode(data))
+
+async def StreamSerumMarketsAsync(endpoint:   str,
+                                  filters:    Optional[List[MemcmpOpts]] = None,
+                                  commitment: Optional[Commitment]       = None) -> AsyncIterator[Tuple[Pubkey, SerumMarketV3]]:
+    decode: Callable = SerumMarketV3.decode_fast
+    async for pubkey, data in StreamProgramAccountsAsync(endpoint=endpoint, programID=RAYDIUM_SERUM_PROGAM_ID, filters=[SerumMarketV3.codec.SIZE] + (filters or []), commitment=commitment):
+        yield (pubkey, decode(data))
+
+# =============================================================================
+# 
@@ -0,0 +1,73 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: Raydium pubkey helpers
+#
+# =============================================================================
+# 
+from   solders.pubkey      import Pubkey
+from   solders.keypair     import Keypair
+from   solders.instruction import Instruction, AccountMeta
+from   solders.sysvar      import RENT
+from   spl.token.constants import ASSOCIATED_TOKEN_PROGRAM_ID, TOKEN_PROGRAM_ID
+from   typing              import Union
+
+# =============================================================================
+# Same as sapysol's `SapysolPubkey`, `MakePubkey`, `GetAta` and
+# `CreateAtaIx`, for the instruction builders: importing sapysol pulls in
+# solana-py, anchorpy and construct, which dominates a cold start.
+#
+SapysolPubkey = Union[str, bytes, Keypair, Pubkey]
+
+SYSTEM_PROGRAM_ID: Pubkey = Pubkey.default() # 11111111111111111111111111111111
+
+# =============================================================================
+#
+def MakePubkey(pubkey: SapysolPubkey) -> Pubkey:
+    if pubkey is None:
+        return None
+    if isinstance(pubkey, Pubkey):
+        return pubkey
+    if isinstance(pubkey, Keypair):
+        return pubkey.pubkey()
+    elif isinstance(pubkey, bytes):
+        return Pubkey.from_bytes(pubkey)
+    elif isinstance(pubkey, str):
+        try:
+            return Pubkey.from_string(pubkey)
+        except:
+            return Pubkey.from_json(pubkey)
+    return None
+
+# =============================================================================
+#
+def GetAta(tokenMint: SapysolPubkey, owner: SapysolPubkey) -> Pubkey:
+    return Pubkey.find_program_address(seeds      = [bytes(MakePubkey(owner)), bytes(TOKEN_PROGRAM_ID), bytes(MakePubkey(tokenMint))],
+                                       program_id = ASSOCIATED_TOKEN_PROGRAM_ID)[0]
+
+def CreateAtaIx(tokenMint: SapysolPubkey, owner: SapysolPubkey, payer: SapysolPubkey) -> Instruction:
+    return Instruction(program_id = ASSOCIATED_TOKEN_PROGRAM_ID,
+                       data       = bytes(0),
+                       accounts   = [AccountMeta(pubkey=MakePubkey(payer),                        is_signer=True,  is_writable=True ),
+                                     AccountMeta(pubkey=GetAta(tokenMint=tokenMint, owner=owner), is_signer=False, is_writable=True ),
+                                     AccountMeta(pubkey=MakePubkey(owner),                        is_signer=False, is_writable=False),
+                                     AccountMeta(pubkey=MakePubkey(tokenMint),                    is_signer=False, is_writable=False),
+                                     AccountMeta(pubkey=SYSTEM_PROGRAM_ID,                        is_signer=False, is_writable=False),
+                                     AccountMeta(pubkey=TOKEN_PROGRAM_ID,                         is_signer=False, is_writable=False),
+                                     AccountMeta(pubkey=RENT,                                     is_signer=False, is_writable=False)])
+
+# =============================================================================
+#
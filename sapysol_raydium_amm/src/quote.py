@@ -0,0 +1,144 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: Raydium AMM v4 quotes
+#
+# =============================================================================
+# 
+from  ..accounts.raydium_amm_v4 import RaydiumLiquidityPoolV4
+from   typing                   import NamedTuple
+
+# =============================================================================
+# `CheckedCeilDiv` as implemented by the AMM v4 program: a zero quotient is
+# rounded to 1 only when the dividend is at least half of the divisor.
+# All amounts in this module are raw token units, math mirrors `math.rs`.
+#
+def RaydiumCeilDiv(dividend: int, divisor: int) -> int:
+    quotient, remainder = divmod(dividend, divisor)
+    if quotient == 0:
+        return 1 if dividend * 2 >= divisor else 0
+    return quotient + 1 if remainder > 0 else quotient
+
+# =============================================================================
+# Exact input: fee is taken from `amountIn` first, the rest goes through x*y=k.
+#
+def RaydiumSwapBaseIn(amountIn: int, reserveIn: int, reserveOut: int, swapFeeNumerator: int, swapFeeDenominator: int) -> int:
+    swapFee:    int = RaydiumCeilDiv(amountIn * swapFeeNumerator, swapFeeDenominator)
+    inAfterFee: int = amountIn - swapFee
+    return reserveOut * inAfterFee // (reserveIn + inAfterFee)
+
+# =============================================================================
+# Exact output: amount needed before fee, then grossed up by the fee.
+#
+def RaydiumSwapBaseOut(amountOut: int, reserveIn: int, reserveOut: int, swapFeeNumerator: int, swapFeeDenominator: int) -> int:
+    if amountOut >= reserveOut:
+        raise ValueError(f"Requested amount out {amountOut} exceeds pool reserve {reserveOut}!")
+    inBeforeFee: int = RaydiumCeilDiv(reserveIn * amountOut, reserveOut - amountOut)
+    return RaydiumCeilDiv(inBeforeFee * swapFeeDenominator, swapFeeDenominator - swapFeeNumerator)
+
+# =============================================================================
+# Applies slippage tolerance in basis points to a quoted amount out.
+#
+def RaydiumMinAmountOut(amountOut: int, slippageBps: int) -> int:
+    return amountOut * (10_000 - slippageBps) // 10_000
+
+# =============================================================================
+# Effective pool reserves plus fee parameters; everything needed to quote
+# a swap offline. `baseToQuote=True` means selling base (coin) for quote (pc).
+#
+class RaydiumAmmReserves(NamedTuple):
+    baseReserve:        int #
+    quoteReserve:       int #
+    swapFeeNumerator:   int #
+    swapFeeDenominator: int #
+
+    # ========================================
+    # Effective reserve = vault amount + open orders total - PnL owed to the
+    # protocol. Open orders totals are 0 for pools without an order book.
+    #
+    @staticmethod
+    def FromAmounts(baseVaultAmount:      int,
+                    quoteVaultAmount:     int,
+                    baseNeedTakePnl:      int,
+                    quoteNeedTakePnl:     int,
+                    swapFeeNumerator:     int,
+                    swapFeeDenominator:   int,
+                    baseOpenOrdersTotal:  int = 0,
+                    quoteOpenOrdersTotal: int = 0) -> "RaydiumAmmReserves":
+        baseReserve:  int = baseVaultAmount  + baseOpenOrdersTotal  - baseNeedTakePnl
+        quoteReserve: int = quoteVaultAmount + quoteOpenOrdersTotal - quoteNeedTakePnl
+        if baseReserve < 0 or quoteReserve < 0:
+            raise ValueError(f"Negative effective reserves: base={baseReserve}, quote={quoteReserve}!")
+        return RaydiumAmmReserves(baseReserve        = baseReserve,
+                                  quoteReserve       = quoteReserve,
+                                  swapFeeNumerator   = swapFeeNumerator,
+                                  swapFeeDenominator = swapFeeDenominator)
+
+    # ========================================
+    #
+    @staticmethod
+    def FromPool(pool:                 RaydiumLiquidityPoolV4,
+                 baseVaultAmount:      int,
+                 quoteVaultAmount:     int,
+                 baseOpenOrdersTotal:  int = 0,
+                 quoteOpenOrdersTotal: int = 0) -> "RaydiumAmmReserves":
+        return RaydiumAmmReserves.FromAmounts(baseVaultAmount      = baseVaultAmount,
+                                              quoteVaultAmount     = quoteVaultAmount,
+                                              baseNeedTakePnl      = pool.baseNeedTakePnl,
+                                              quoteNeedTakePnl     = pool.quoteNeedTakePnl,
+                                              swapFeeNumerator     = pool.swapFeeNumerator,
+                                              swapFeeDenominator   = pool.swapFeeDenominator,
+                                              baseOpenOrdersTotal  = baseOpenOrdersTotal,
+                                              quoteOpenOrdersTotal = quoteOpenOrdersTotal)
+
+    # ========================================
+    #
+    def GetReserves(self, baseToQuote: bool) -> tuple[int, int]:
+        return (self.baseReserve, self.quoteReserve) if baseToQuote else (self.quoteReserve, self.baseReserve)
+
+    # ========================================
+    # Amount out for an exact `amountIn` (`SwapBaseIn` instruction).
+    #
+    def GetAmountOut(self, amountIn: int, baseToQuote: bool) -> int:
+        reserveIn, reserveOut = self.GetReserves(baseToQuote=baseToQuote)
+        return RaydiumSwapBaseIn(amountIn           = amountIn,
+                                 reserveIn          = reserveIn,
+                                 reserveOut         = reserveOut,
+                                 swapFeeNumerator   = self.swapFeeNumerator,
+                                 swapFeeDenominator = self.swapFeeDenominator)
+
+    # ========================================
+    # Amount in required to receive an exact `amountOut` (`SwapBaseOut`).
+    #
+    def GetAmountIn(self, amountOut: int, baseToQuote: bool) -> int:
+        reserveIn, reserveOut = self.GetReserves(baseToQuote=baseToQuote)
+        return RaydiumSwapBaseOut(amountOut          = amountOut,
+                                  reserveIn          = reserveIn,
+                                  reserveOut         = reserveOut,
+                                  swapFeeNumerator   = self.swapFeeNumerator,
+                                  swapFeeDenominator = self.swapFeeDenominator)
+
+    # ========================================
+    # Reserves after executing an exact-in swap, useful for chaining quotes.
+    #
+    def AfterSwap(self, amountIn: int, baseToQuote: bool) -> "RaydiumAmmReserves":
+        amountOut: int = self.GetAmountOut(amountIn=amountIn, baseToQuote=baseToQuote)
+        if baseToQuote:
+            return self._replace(baseReserve=self.baseReserve + amountIn, quoteReserve=self.quoteReserve - amountOut)
+        return self._replace(baseReserve=self.baseReserve - amountOut, quoteReserve=self.quoteReserve + amountIn)
+
+# =============================================================================
+# 
@@ -0,0 +1,119 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: Raydium AMM v4 vectorized quotes
+#
+# =============================================================================
+# 
+from  .quote  import RaydiumAmmReserves
+from   typing import List, NamedTuple, Union, Any
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# =============================================================================
+# Products of two u64 values are computed in `uint64` only when they
+# provably fit (with headroom for the `2 * x` check in ceil-div); the rest
+# fall back to exact Python integers via `object` arrays.
+#
+_U64_SAFE_PRODUCT: float = float(2**62)
+
+# =============================================================================
+#
+class RaydiumQuoteGrid(NamedTuple):
+    amountOut:   Any # np.ndarray[uint64], shape (N pools, M amounts)
+    priceImpact: Any # np.ndarray[float64], shape (N, M), 1 - execution price / spot price (fee included)
+
+# =============================================================================
+#
+def _RequireNumpy():
+    if np is None:
+        raise ImportError("Vectorized quoting requires `numpy`, please install it (pip install numpy)!")
+
+def _AsU64(values: Any) -> Any:
+    return np.asarray(values, dtype=np.uint64)
+
+# =============================================================================
+# Exact `a * b // c` (or Raydium `CheckedCeilDiv`) on broadcast uint64 arrays.
+#
+def _MulDiv(a: Any, b: Any, c: Any, raydiumCeil: bool = False) -> Any:
+    a, b, c = np.broadcast_arrays(_AsU64(a), _AsU64(b), _AsU64(c))
+    divisor: Any = np.where(c == 0, np.uint64(1), c)
+    fits:    Any = a.astype(np.float64) * b.astype(np.float64) < _U64_SAFE_PRODUCT
+    if fits.all():
+        return _MulDivNative(product=a * b, divisor=divisor, raydiumCeil=raydiumCeil)
+
+    result: Any = np.zeros(a.shape, dtype=np.uint64)
+    wide:   Any = ~fits
+    result[fits] = _MulDivNative(product=a[fits] * b[fits], divisor=divisor[fits], raydiumCeil=raydiumCeil)
+    result[wide] = _MulDivNative(product=a[wide].astype(object) * b[wide].astype(object), divisor=divisor[wide].astype(object), raydiumCeil=raydiumCeil).astype(np.uint64)
+    return result
+
+def _MulDivNative(product: Any, divisor: Any, raydiumCeil: bool) -> Any:
+    quotient: Any = product // divisor
+    if raydiumCeil:
+        remainder: Any = product - quotient * divisor
+        quotient = np.where(quotient == 0, product * 2 >= divisor, quotient + (remainder > 0)).astype(product.dtype)
+    return quotient
+
+# =============================================================================
+# Vectorized `RaydiumSwapBaseIn`: N pools (1-D arrays of reserves and fees)
+# by M input amounts. Every cell equals the scalar quote exactly.
+#
+def RaydiumQuoteGridBaseIn(reserveIn:          Any,
+                           reserveOut:         Any,
+                           swapFeeNumerator:   Any,
+                           swapFeeDenominator: Any,
+                           amountsIn:          Any) -> RaydiumQuoteGrid:
+    _RequireNumpy()
+    reserveIn:          Any = _AsU64(reserveIn         ).reshape(-1, 1)
+    reserveOut:         Any = _AsU64(reserveOut        ).reshape(-1, 1)
+    swapFeeNumerator:   Any = _AsU64(swapFeeNumerator  ).reshape(-1, 1)
+    swapFeeDenominator: Any = _AsU64(swapFeeDenominator).reshape(-1, 1)
+    amountsIn:          Any = _AsU64(amountsIn         ).reshape( 1,-1)
+
+    swapFee:    Any = _MulDiv(amountsIn, swapFeeNumerator, swapFeeDenominator, raydiumCeil=True)
+    inAfterFee: Any = np.broadcast_to(amountsIn, swapFee.shape) - swapFee
+    # `reserveIn + inAfterFee` may exceed u64 too, divide as exact integers there.
+    sumFits:    Any = reserveIn.astype(np.float64) + inAfterFee.astype(np.float64) < _U64_SAFE_PRODUCT
+    if sumFits.all():
+        amountOut: Any = _MulDiv(reserveOut, inAfterFee, reserveIn + inAfterFee)
+    else:
+        wide:      Any = np.broadcast_to(reserveOut, inAfterFee.shape).astype(object) * inAfterFee.astype(object)
+        amountOut: Any = (wide // (reserveIn.astype(object) + inAfterFee.astype(object))).astype(np.uint64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        spotOut:     Any = amountsIn.astype(np.float64) * reserveOut.astype(np.float64) / reserveIn.astype(np.float64)
+        priceImpact: Any = np.where(spotOut > 0, 1.0 - amountOut.astype(np.float64) / spotOut, 0.0)
+    return RaydiumQuoteGrid(amountOut=amountOut, priceImpact=priceImpact)
+
+# =============================================================================
+# Same as above, built straight from `RaydiumAmmReserves` (see `FromPool`).
+#
+def RaydiumQuoteGridFromReserves(reserves: List[RaydiumAmmReserves], amountsIn: Any, baseToQuote: Union[bool, List[bool]] = True) -> RaydiumQuoteGrid:
+    _RequireNumpy()
+    directions:   Any = np.broadcast_to(np.asarray(baseToQuote, dtype=bool), (len(reserves),))
+    baseReserve:  Any = _AsU64([entry.baseReserve  for entry in reserves])
+    quoteReserve: Any = _AsU64([entry.quoteReserve for entry in reserves])
+    return RaydiumQuoteGridBaseIn(reserveIn          = np.where(directions, baseReserve,  quoteReserve),
+                                  reserveOut         = np.where(directions, quoteReserve, baseReserve ),
+                                  swapFeeNumerator   = [entry.swapFeeNumerator   for entry in reserves],
+                                  swapFeeDenominator = [entry.swapFeeDenominator for entry in reserves],
+                                  amountsIn          = amountsIn)
+
+# =============================================================================
+# 
@@ -19,69 +19,187 @@
 # =============================================================================
 # 
 from   solana.rpc.api           import Client, Pubkey, Keypair
-from   typing                   import List, Any, TypedDict, Union, Optional
+from   solana.rpc.async_api     import AsyncClient
+from   typing                   import List, Any, Dict, TypedDict, Union, Optional
 from   sapysol                  import *
 from ..accounts.raydium_amm_v4  import *
+from  .storage                  import RaydiumCacheCodec, RaydiumCacheStorage, RaydiumJsonDirStorage, RaydiumCacheRootPath, \
+                                       MakeDefaultRaydiumCacheStorage, MigrateRaydiumCacheStorage
+from  .single_flight            import RaydiumSingleFlight
+from  .metrics                  import RaydiumMetrics, RAYDIUM_METRIC_CACHE_LOOKUPS
+import dataclasses
 import logging
 import json
 import os
 
 # =============================================================================
-# 
+# AMM fields that change with trading or admin actions. Everything else
+# (addresses, mints, decimals, lot sizes) is addressing data that never
+# changes. Dynamic fields are kept in `RaydiumAmmStateCache`, never on disk.
+#
+RAYDIUM_AMM_DYNAMIC_FIELDS: List[str] = ["status", "state", "resetFlag",
+                                         "tradeFeeNumerator", "tradeFeeDenominator", "pnlNumerator", "pnlDenominator",
+                                         "swapFeeNumerator", "swapFeeDenominator",
+                                         "baseNeedTakePnl", "quoteNeedTakePnl", "quoteTotalPnl", "baseTotalPnl",
+                                         "poolOpenTime", "punishPcAmount", "punishCoinAmount", "orderbookToInitTime",
+                                         "swapBaseInAmount", "swapQuoteOutAmount", "swapBase2QuoteFee",
+                                         "swapQuoteInAmount", "swapBaseOutAmount", "swapQuote2BaseFee",
+                                         "lpReserve"]
+
+_DYNAMIC_ZEROS:  Dict[str, int] = {name: 0 for name in RAYDIUM_AMM_DYNAMIC_FIELDS}
+_DYNAMIC_RANGES: List[slice]    = [slice(field.offset, field.offset + field.size) for field in
+                                   (RaydiumLiquidityPoolV4.codec.OFFSETS[name] for name in RAYDIUM_AMM_DYNAMIC_FIELDS)]
+
+# =============================================================================
+# Stored entries have all dynamic fields zeroed (status 0 reads as
+# uninitialized), so stale values never come back from disk. Entries written
+# by older versions are zeroed on load.
+#
+def _StripDynamicFields(ammInfo: Optional[RaydiumLiquidityPoolV4]) -> Optional[RaydiumLiquidityPoolV4]:
+    return None if ammInfo is None else dataclasses.replace(ammInfo, **_DYNAMIC_ZEROS)
+
+def _DecodeStripped(data: bytes) -> RaydiumLiquidityPoolV4:
+    data = bytearray(data)
+    for fieldRange in _DYNAMIC_RANGES:
+        data[fieldRange] = bytes(fieldRange.stop - fieldRange.start)
+    return RaydiumLiquidityPoolV4.decode_fast(bytes(data))
+
+RAYDIUM_AMM_CACHE_CODEC = RaydiumCacheCodec(toJson    = lambda entry: entry.to_json(),
+                                            fromJson  = lambda obj:   _StripDynamicFields(RaydiumLiquidityPoolV4.from_json(obj)) if "status" in obj else None,
+                                            toBytes   = lambda entry: entry.encode(),
+                                            fromBytes = _DecodeStripped)
+
+# =============================================================================
+# Persistent AMM accounts, addressing data only (vaults, mints, market,
+# decimals) which never expires; dynamic fields are zeroed in storage and
+# live in `RaydiumAmmStateCache`. An RPC read stores the addressing data and
+# seeds the state cache from the same account at its slot.
+# `GetRaydiumAmm` / `UpdateRaydiumAmmCache` return both merged, with the
+# dynamic fields as of the last full state read (fetched when there is
+# none); `GetRaydiumAmmAddressing` returns the stored entry as is.
+# `RaydiumAmmStateCache.GetRaydiumAmm` merges state within a slot TTL.
+#
 class RaydiumAmmCache:
+    __STORAGE: Optional[RaydiumCacheStorage] = None
+    # One RPC fetch per address across threads and processes sharing the cache
+    __FLIGHT:  RaydiumSingleFlight = RaydiumSingleFlight(name="raydium_amm", lockDir=os.path.join(RaydiumCacheRootPath(), "locks"))
+
     # ========================================
     #
     @staticmethod
-    def __RaydiumAmmCachePath() -> str:
-        path = os.path.join(os.getenv("HOME"), ".sapysol", "raydium")
-        EnsurePathExists(path)
-        return path
+    def GetStorage() -> RaydiumCacheStorage:
+        if RaydiumAmmCache.__STORAGE is None:
+            RaydiumAmmCache.__STORAGE = MakeDefaultRaydiumCacheStorage(codec     = RAYDIUM_AMM_CACHE_CODEC,
+                                                                       fileName  = "raydium_amm.sqlite",
+                                                                       legacyDir = "raydium")
+        return RaydiumAmmCache.__STORAGE
 
     @staticmethod
-    def __RaydiumAmmFilename(poolAddress: Union[str, Pubkey]) -> str:
-        return os.path.join(RaydiumAmmCache.__RaydiumAmmCachePath(), f"{MakePubkey(poolAddress)}.json")
+    def SetStorage(storage: RaydiumCacheStorage):
+        RaydiumAmmCache.__STORAGE = storage
+
+    @staticmethod
+    def MigrateFromJsonFiles(path: Optional[str] = None) -> int:
+        source = RaydiumJsonDirStorage(codec=RAYDIUM_AMM_CACHE_CODEC, path=path if path else os.path.join(RaydiumCacheRootPath(), "raydium"))
+        return MigrateRaydiumCacheStorage(source=source, target=RaydiumAmmCache.GetStorage())
 
     # ========================================
     #
     @staticmethod
-    def __LoadAmmFromFile(poolAddress: Union[str, Pubkey]) -> RaydiumLiquidityPoolV4:
-        try:
-            ammCachePath: str = RaydiumAmmCache.__RaydiumAmmCachePath()
-            ammInfoFile:  str = RaydiumAmmCache.__RaydiumAmmFilename(poolAddress=poolAddress)
-            logging.debug(f"Loading Raydium AMM Info from file: {ammInfoFile}")
-            if not os.path.isfile(ammInfoFile):
-                return None
-            with open(ammInfoFile) as f:
-                ammInfoJson = json.load(f)
-                ammEntry = RaydiumLiquidityPoolV4.from_json(ammInfoJson)
-                return ammEntry
-        except:
-            return None
+    def __LoadAmmFromStorage(poolAddress: Union[str, Pubkey]) -> RaydiumLiquidityPoolV4:
+        ammInfo = RaydiumAmmCache.GetStorage().Get(key=poolAddress)
+        if ammInfo:
+            RaydiumMetrics.Inc(RAYDIUM_METRIC_CACHE_LOOKUPS, cache="amm", source="disk")
+        return ammInfo
 
     # ========================================
+    # `resp` is a `getAccountInfo` response.
     #
     @staticmethod
-    def __LoadAmmFromBlockchain(connection: Client, poolAddress: Union[str, Pubkey]) -> RaydiumLiquidityPoolV4:
-        ammCachePath: str = RaydiumAmmCache.__RaydiumAmmCachePath()
-        ammInfoFile:  str = RaydiumAmmCache.__RaydiumAmmFilename(poolAddress=poolAddress)
-
-        logging.debug(f"Loading Raydium AMM Info from Solana Node for AMM ID: {str(poolAddress)}")
-        ammEntry = RaydiumLiquidityPoolV4.fetch(conn=connection, address=poolAddress)
-        
-        with open(ammInfoFile, "w") as f:
-            json.dump(ammEntry.to_json(), f)
+    def __StoreFetched(poolAddress: Union[str, Pubkey], resp: Any) -> Optional[RaydiumLiquidityPoolV4]:
+        if resp.value is None:
+            return None
+        from .raydium_amm_state import RaydiumAmmStateCache # imports this module
+        RaydiumAmmStateCache.Update(poolAddress=poolAddress, slot=resp.context.slot, data=resp.value.data)
+        ammEntry = _DecodeStripped(resp.value.data)
+        RaydiumAmmCache.GetStorage().Put(key=poolAddress, entry=ammEntry)
         return ammEntry
 
+    @staticmethod
+    def __LoadAmmFromBlockchain(connection: Client, poolAddress: Union[str, Pubkey]) -> RaydiumLiquidityPoolV4:
+        logging.debug("Loading Raydium AMM Info from Solana Node for AMM ID: %s", poolAddress)
+        RaydiumMetrics.Inc(RAYDIUM_METRIC_CACHE_LOOKUPS, cache="amm", source="rpc")
+        resp = connection.get_account_info(pubkey=MakePubkey(poolAddress))
+        return RaydiumAmmCache.__StoreFetched(poolAddress=poolAddress, resp=resp)
+
     # ========================================
     #
+    @staticmethod
+    def __WithState(connection: Client, poolAddress: Union[str, Pubkey], ammInfo: Optional[RaydiumLiquidityPoolV4]) -> Optional[RaydiumLiquidityPoolV4]:
+        from .raydium_amm_state import RaydiumAmmStateCache # imports this module
+        if ammInfo is None:
+            return None
+        state = RaydiumAmmStateCache.Get(poolAddress=poolAddress)
+        if state is None or not state.fullSlot:
+            state = RaydiumAmmStateCache.Refresh(connection=connection, poolAddresses=[poolAddress]).get(MakePubkey(poolAddress))
+        return ammInfo if state is None else dataclasses.replace(ammInfo, **state.fields)
+
     @staticmethod
     def UpdateRaydiumAmmCache(connection: Client, poolAddress: Union[str, Pubkey]) -> RaydiumLiquidityPoolV4:
-        return RaydiumAmmCache.__LoadAmmFromBlockchain(connection=connection, poolAddress=poolAddress)
+        ammInfo = RaydiumAmmCache.__FLIGHT.Do(key=MakePubkey(poolAddress), fetch=lambda: RaydiumAmmCache.__LoadAmmFromBlockchain(connection=connection, poolAddress=poolAddress))
+        return RaydiumAmmCache.__WithState(connection=connection, poolAddress=poolAddress, ammInfo=ammInfo)
+
+    @staticmethod
+    def GetRaydiumAmmAddressing(connection: Client, poolAddress: Union[str, Pubkey]) -> RaydiumLiquidityPoolV4:
+        ammInfo = RaydiumAmmCache.__LoadAmmFromStorage(poolAddress=poolAddress)
+        if ammInfo:
+            return ammInfo
+        return RaydiumAmmCache.__FLIGHT.Do(key   = MakePubkey(poolAddress),
+                                           check = lambda: RaydiumAmmCache.__LoadAmmFromStorage(poolAddress=poolAddress),
+                                           fetch = lambda: RaydiumAmmCache.__LoadAmmFromBlockchain(connection=connection, poolAddress=poolAddress))
 
     @staticmethod
     def GetRaydiumAmm(connection: Client, poolAddress: Union[str, Pubkey]) -> RaydiumLiquidityPoolV4:
-        ammInfo = RaydiumAmmCache.__LoadAmmFromFile(poolAddress=poolAddress)
-        return ammInfo if ammInfo else RaydiumAmmCache.__LoadAmmFromBlockchain(connection=connection, poolAddress=poolAddress)
+        ammInfo = RaydiumAmmCache.GetRaydiumAmmAddressing(connection=connection, poolAddress=poolAddress)
+        return RaydiumAmmCache.__WithState(connection=connection, poolAddress=poolAddress, ammInfo=ammInfo)
+
+    # ========================================
+    #
+    @staticmethod
+    async def __LoadAmmFromBlockchainAsync(connection: AsyncClient, poolAddress: Union[str, Pubkey]) -> RaydiumLiquidityPoolV4:
+        logging.debug("Loading Raydium AMM Info from Solana Node for AMM ID: %s", poolAddress)
+        RaydiumMetrics.Inc(RAYDIUM_METRIC_CACHE_LOOKUPS, cache="amm", source="rpc")
+        resp = await connection.get_account_info(pubkey=MakePubkey(poolAddress))
+        return RaydiumAmmCache.__StoreFetched(poolAddress=poolAddress, resp=resp)
+
+    @staticmethod
+    async def __WithStateAsync(connection: AsyncClient, poolAddress: Union[str, Pubkey], ammInfo: Optional[RaydiumLiquidityPoolV4]) -> Optional[RaydiumLiquidityPoolV4]:
+        from .raydium_amm_state import RaydiumAmmStateCache # imports this module
+        if ammInfo is None:
+            return None
+        state = RaydiumAmmStateCache.Get(poolAddress=poolAddress)
+        if state is None or not state.fullSlot:
+            state = (await RaydiumAmmStateCache.RefreshAsync(connection=connection, poolAddresses=[poolAddress])).get(MakePubkey(poolAddress))
+        return ammInfo if state is None else dataclasses.replace(ammInfo, **state.fields)
+
+    @staticmethod
+    async def UpdateRaydiumAmmCacheAsync(connection: AsyncClient, poolAddress: Union[str, Pubkey]) -> RaydiumLiquidityPoolV4:
+        ammInfo = await RaydiumAmmCache.__FLIGHT.DoAsync(key=MakePubkey(poolAddress), fetch=lambda: RaydiumAmmCache.__LoadAmmFromBlockchainAsync(connection=connection, poolAddress=poolAddress))
+        return await RaydiumAmmCache.__WithStateAsync(connection=connection, poolAddress=poolAddress, ammInfo=ammInfo)
+
+    @staticmethod
+    async def GetRaydiumAmmAddressingAsync(connection: AsyncClient, poolAddress: Union[str, Pubkey]) -> RaydiumLiquidityPoolV4:
+        ammInfo = RaydiumAmmCache.__LoadAmmFromStorage(poolAddress=poolAddress)
+        if ammInfo:
+            return ammInfo
+        return await RaydiumAmmCache.__FLIGHT.DoAsync(key   = MakePubkey(poolAddress),
+                                                      check = lambda: RaydiumAmmCache.__LoadAmmFromStorage(poolAddress=poolAddress),
+                                                      fetch = lambda: RaydiumAmmCache.__LoadAmmFromBlockchainAsync(connection=connection, poolAddress=poolAddress))
+
+    @staticmethod
+    async def GetRaydiumAmmAsync(connection: AsyncClient, poolAddress: Union[str, Pubkey]) -> RaydiumLiquidityPoolV4:
+        ammInfo = await RaydiumAmmCache.GetRaydiumAmmAddressingAsync(connection=connection, poolAddress=poolAddress)
+        return await RaydiumAmmCache.__WithStateAsync(connection=connection, poolAddress=poolAddress, ammInfo=ammInfo)
 
 # =============================================================================
 # 
@@ -0,0 +1,229 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: Raydium AMM dynamic state cache
+#
+# =============================================================================
+# 
+from   solana.rpc.api                 import Client
+from   solana.rpc.async_api           import AsyncClient
+from   solana.rpc.commitment          import Commitment
+from   solana.rpc.types               import DataSliceOpts
+from   solders.pubkey                 import Pubkey
+from   sapysol                        import SapysolPubkey, MakePubkey, ListToChunks
+from  .raydium_amm_cache              import RaydiumAmmCache, RAYDIUM_AMM_DYNAMIC_FIELDS
+from ..accounts.raydium_amm_v4        import RaydiumLiquidityPoolV4
+from   typing                         import List, Any, Dict, NamedTuple, Optional, Union, Tuple
+import dataclasses
+import threading
+import asyncio
+import logging
+import time
+
+# =============================================================================
+# Dynamic fields that move with swaps: one contiguous 160-byte range of the
+# 752-byte account (offsets 176..336), read with a `dataSlice`. The rest of
+# `RAYDIUM_AMM_DYNAMIC_FIELDS` (status, trade/PnL fees, `lpReserve`) only
+# changes with admin actions or liquidity changes and is refreshed by a full
+# account read every `FULL_TTL_SLOTS`.
+#
+RAYDIUM_AMM_SWAP_FIELDS: List[str] = ["swapFeeNumerator", "swapFeeDenominator",
+                                      "baseNeedTakePnl", "quoteNeedTakePnl", "quoteTotalPnl", "baseTotalPnl",
+                                      "poolOpenTime", "punishPcAmount", "punishCoinAmount", "orderbookToInitTime",
+                                      "swapBaseInAmount", "swapQuoteOutAmount", "swapBase2QuoteFee",
+                                      "swapQuoteInAmount", "swapBaseOutAmount", "swapQuote2BaseFee"]
+
+# =============================================================================
+# Dynamic fields of one pool read at context slot `slot`, `refreshTime` is
+# the local unix time of the refresh. `fullSlot` is the slot of the last full
+# account read the remaining dynamic fields come from (0: none yet, `fields`
+# then only holds `RAYDIUM_AMM_SWAP_FIELDS`).
+#
+class RaydiumAmmStateEntry(NamedTuple):
+    poolAddress: Pubkey         #
+    slot:        int            #
+    refreshTime: float          #
+    fields:      Dict[str, Any] # RAYDIUM_AMM_DYNAMIC_FIELDS -> value
+    fullSlot:    int = 0        #
+
+# =============================================================================
+# In-memory dynamic AMM state with a TTL measured in slots. Nothing is
+# written to disk. The current slot is estimated from the latest refresh
+# (`SLOT_DURATION` seconds per slot), so expiry checks need no RPC.
+#
+class RaydiumAmmStateCache:
+    PROJECTION                = RaydiumLiquidityPoolV4.codec.Projection(RAYDIUM_AMM_SWAP_FIELDS)
+    FULL_PROJECTION           = RaydiumLiquidityPoolV4.codec.Projection(RAYDIUM_AMM_DYNAMIC_FIELDS)
+    TTL_SLOTS:      int       = 150
+    FULL_TTL_SLOTS: int       = 9000
+    SLOT_DURATION:  float     = 0.4
+    __ENTRIES:     Dict[Pubkey, RaydiumAmmStateEntry] = {}
+    __LAST_SLOT:   tuple     = (0, 0.0) # (slot, local time)
+    __LOCK:        threading.Lock = threading.Lock()
+
+    # ========================================
+    #
+    @staticmethod
+    def SetTtl(ttlSlots: int, fullTtlSlots: Optional[int] = None):
+        RaydiumAmmStateCache.TTL_SLOTS = ttlSlots
+        if fullTtlSlots is not None:
+            RaydiumAmmStateCache.FULL_TTL_SLOTS = fullTtlSlots
+
+    @staticmethod
+    def EstimateSlot() -> int:
+        slot, observed = RaydiumAmmStateCache.__LAST_SLOT
+        return slot + int((time.time() - observed) / RaydiumAmmStateCache.SLOT_DURATION) if slot else 0
+
+    @staticmethod
+    def Clear():
+        with RaydiumAmmStateCache.__LOCK:
+            RaydiumAmmStateCache.__ENTRIES.clear()
+
+    # ========================================
+    #
+    @staticmethod
+    def Get(poolAddress: SapysolPubkey) -> Optional[RaydiumAmmStateEntry]:
+        return RaydiumAmmStateCache.__ENTRIES.get(MakePubkey(poolAddress))
+
+    @staticmethod
+    def IsFresh(entry: Optional[RaydiumAmmStateEntry], maxAgeSlots: Optional[int] = None) -> bool:
+        if entry is None:
+            return False
+        ttl: int = RaydiumAmmStateCache.TTL_SLOTS if maxAgeSlots is None else maxAgeSlots
+        return RaydiumAmmStateCache.EstimateSlot() - entry.slot <= ttl
+
+    # ========================================
+    # Accepts full account data (e.g. from an account subscription) or a
+    # `PROJECTION` slice, which updates the per-swap fields and keeps the
+    # rest. Older slots never replace newer state.
+    #
+    @staticmethod
+    def Update(poolAddress: SapysolPubkey, slot: int, data: bytes) -> RaydiumAmmStateEntry:
+        poolAddress: Pubkey = MakePubkey(poolAddress)
+        full:        bool   = len(data) != RaydiumAmmStateCache.PROJECTION.LENGTH
+        fields = RaydiumAmmStateCache.FULL_PROJECTION.decode_account(data) if full else RaydiumAmmStateCache.PROJECTION.decode(data)
+        with RaydiumAmmStateCache.__LOCK:
+            current = RaydiumAmmStateCache.__ENTRIES.get(poolAddress)
+            if current is not None and current.slot > slot:
+                return current
+            if full:
+                entry = RaydiumAmmStateEntry(poolAddress=poolAddress, slot=slot, refreshTime=time.time(), fields=fields, fullSlot=slot)
+            else:
+                entry = RaydiumAmmStateEntry(poolAddress = poolAddress,
+                                             slot        = slot,
+                                             refreshTime = time.time(),
+                                             fields      = fields if current is None else {**current.fields, **fields},
+                                             fullSlot    = 0 if current is None else current.fullSlot)
+            RaydiumAmmStateCache.__ENTRIES[poolAddress] = entry
+            if slot > RaydiumAmmStateCache.__LAST_SLOT[0]:
+                RaydiumAmmStateCache.__LAST_SLOT = (slot, entry.refreshTime)
+        return entry
+
+    # ========================================
+    #
+    @staticmethod
+    def __ParseChunk(pubkeys: List[Pubkey], accounts: List[Any], slot: int, minLength: int) -> Dict[Pubkey, RaydiumAmmStateEntry]:
+        result: Dict[Pubkey, RaydiumAmmStateEntry] = {}
+        for pubkey, account in zip(pubkeys, accounts):
+            if account is None or len(account.data) < minLength:
+                logging.debug("Raydium AMM state: missing account for AMM ID: %s", pubkey)
+                continue
+            result[pubkey] = RaydiumAmmStateCache.Update(poolAddress=pubkey, slot=slot, data=account.data)
+        return result
+
+    # ========================================
+    # (chunk, dataSlice, minimum data length) per `getMultipleAccounts`:
+    # pools whose rarely changing fields are older than `FULL_TTL_SLOTS` (or
+    # unknown) are read in full, all others with the 160-byte slice.
+    #
+    @staticmethod
+    def __MakeRequests(poolAddresses: List[SapysolPubkey], chunkSize: int) -> List[Tuple[List[Pubkey], Optional[DataSliceOpts], int]]:
+        estimate: int          = RaydiumAmmStateCache.EstimateSlot()
+        full:     List[Pubkey] = []
+        sliced:   List[Pubkey] = []
+        for pubkey in dict.fromkeys(MakePubkey(address) for address in poolAddresses):
+            entry = RaydiumAmmStateCache.__ENTRIES.get(pubkey)
+            if entry is not None and entry.fullSlot and estimate - entry.fullSlot <= RaydiumAmmStateCache.FULL_TTL_SLOTS:
+                sliced.append(pubkey)
+            else:
+                full.append(pubkey)
+        dataSlice = DataSliceOpts(offset=RaydiumAmmStateCache.PROJECTION.OFFSET, length=RaydiumAmmStateCache.PROJECTION.LENGTH)
+        return [(chunk, None,      RaydiumLiquidityPoolV4.codec.SIZE)       for chunk in ListToChunks(baseList=full,   chunkSize=chunkSize)] + \
+               [(chunk, dataSlice, RaydiumAmmStateCache.PROJECTION.LENGTH) for chunk in ListToChunks(baseList=sliced, chunkSize=chunkSize)]
+
+    # ========================================
+    # Lightweight refresh: chunked `getMultipleAccounts` with a `dataSlice`
+    # over the per-swap fields only; addressing data is untouched.
+    #
+    @staticmethod
+    def Refresh(connection:    Client,
+                poolAddresses: List[SapysolPubkey],
+                commitment:    Optional[Commitment] = None,
+                chunkSize:     int = 100) -> Dict[Pubkey, RaydiumAmmStateEntry]:
+        result: Dict[Pubkey, RaydiumAmmStateEntry] = {}
+        for chunk, dataSlice, minLength in RaydiumAmmStateCache.__MakeRequests(poolAddresses=poolAddresses, chunkSize=chunkSize):
+            resp = connection.get_multiple_accounts(pubkeys=chunk, commitment=commitment, data_slice=dataSlice)
+            result.update(RaydiumAmmStateCache.__ParseChunk(pubkeys=chunk, accounts=resp.value, slot=resp.context.slot, minLength=minLength))
+        return result
+
+    @staticmethod
+    async def RefreshAsync(connection:    AsyncClient,
+                           poolAddresses: List[SapysolPubkey],
+                           commitment:    Optional[Commitment] = None,
+                           chunkSize:     int = 100) -> Dict[Pubkey, RaydiumAmmStateEntry]:
+        requests  = RaydiumAmmStateCache.__MakeRequests(poolAddresses=poolAddresses, chunkSize=chunkSize)
+        responses = await asyncio.gather(*[connection.get_multiple_accounts(pubkeys=chunk, commitment=commitment, data_slice=dataSlice) for chunk, dataSlice, _ in requests])
+        result: Dict[Pubkey, RaydiumAmmStateEntry] = {}
+        for (chunk, _, minLength), resp in zip(requests, responses):
+            result.update(RaydiumAmmStateCache.__ParseChunk(pubkeys=chunk, accounts=resp.value, slot=resp.context.slot, minLength=minLength))
+        return result
+
+    # ========================================
+    # Cached state if younger than `maxAgeSlots` (default `TTL_SLOTS`),
+    # refreshed otherwise.
+    #
+    @staticmethod
+    def GetState(connection: Client, poolAddress: SapysolPubkey, maxAgeSlots: Optional[int] = None, commitment: Optional[Commitment] = None) -> Optional[RaydiumAmmStateEntry]:
+        entry = RaydiumAmmStateCache.Get(poolAddress=poolAddress)
+        if RaydiumAmmStateCache.IsFresh(entry=entry, maxAgeSlots=maxAgeSlots):
+            return entry
+        return RaydiumAmmStateCache.Refresh(connection=connection, poolAddresses=[poolAddress], commitment=commitment).get(MakePubkey(poolAddress))
+
+    @staticmethod
+    async def GetStateAsync(connection: AsyncClient, poolAddress: SapysolPubkey, maxAgeSlots: Optional[int] = None, commitment: Optional[Commitment] = None) -> Optional[RaydiumAmmStateEntry]:
+        entry = RaydiumAmmStateCache.Get(poolAddress=poolAddress)
+        if RaydiumAmmStateCache.IsFresh(entry=entry, maxAgeSlots=maxAgeSlots):
+            return entry
+        return (await RaydiumAmmStateCache.RefreshAsync(connection=connection, poolAddresses=[poolAddress], commitment=commitment)).get(MakePubkey(poolAddress))
+
+    # ========================================
+    # Addressing data from `RaydiumAmmCache` merged with dynamic state
+    # within TTL: a `RaydiumLiquidityPoolV4` that is safe to read in full.
+    #
+    @staticmethod
+    def GetRaydiumAmm(connection: Client, poolAddress: SapysolPubkey, maxAgeSlots: Optional[int] = None) -> Optional[RaydiumLiquidityPoolV4]:
+        ammInfo = RaydiumAmmCache.GetRaydiumAmmAddressing(connection=connection, poolAddress=poolAddress)
+        state   = RaydiumAmmStateCache.GetState(connection=connection, poolAddress=poolAddress, maxAgeSlots=maxAgeSlots)
+        return None if ammInfo is None or state is None else dataclasses.replace(ammInfo, **state.fields)
+
+    @staticmethod
+    async def GetRaydiumAmmAsync(connection: AsyncClient, poolAddress: SapysolPubkey, maxAgeSlots: Optional[int] = None) -> Optional[RaydiumLiquidityPoolV4]:
+        ammInfo, state = await asyncio.gather(RaydiumAmmCache.GetRaydiumAmmAddressingAsync(connection=connection, poolAddress=poolAddress),
+                                              RaydiumAmmStateCache.GetStateAsync(connection=connection, poolAddress=poolAddress, maxAgeSlots=maxAgeSlots))
+        return None if ammInfo is None or state is None else dataclasses.replace(ammInfo, **state.fields)
+
+# =============================================================================
+# 
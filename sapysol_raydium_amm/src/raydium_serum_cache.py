@@ -19,69 +19,107 @@
 # =============================================================================
 # 
 from   solana.rpc.api           import Client, Pubkey, Keypair
-from   typing                   import List, Any, TypedDict, Union, Optional
+from   solana.rpc.async_api     import AsyncClient
+from   typing                   import List, Any, Dict, TypedDict, Union, Optional
 from   sapysol                  import *
 from ..accounts.serum_market_v3 import *
+from  .storage                  import RaydiumCacheCodec, RaydiumCacheStorage, RaydiumJsonDirStorage, RaydiumCacheRootPath, \
+                                       MakeDefaultRaydiumCacheStorage, MigrateRaydiumCacheStorage
+from  .single_flight            import RaydiumSingleFlight
+from  .metrics                  import RaydiumMetrics, RAYDIUM_METRIC_CACHE_LOOKUPS
 import logging
 import json
 import os
 
+# =============================================================================
+# 
+RAYDIUM_SERUM_CACHE_CODEC = RaydiumCacheCodec(toJson    = lambda entry: entry.to_json(),
+                                              fromJson  = lambda obj:   SerumMarketV3.from_json(obj) if "ownAddress" in obj else None,
+                                              toBytes   = lambda entry: entry.encode(),
+                                              fromBytes = SerumMarketV3.decode_fast)
+
 # =============================================================================
 # 
 class RaydiumSerumCache:
+    __STORAGE: Optional[RaydiumCacheStorage] = None
+    # One RPC fetch per address across threads and processes sharing the cache
+    __FLIGHT:  RaydiumSingleFlight = RaydiumSingleFlight(name="raydium_serum", lockDir=os.path.join(RaydiumCacheRootPath(), "locks"))
+
     # ========================================
     #
     @staticmethod
-    def __RaydiumSerumCachePath() -> str:
-        path = os.path.join(os.getenv("HOME"), ".sapysol", "raydium")
-        EnsurePathExists(path)
-        return path
+    def GetStorage() -> RaydiumCacheStorage:
+        if RaydiumSerumCache.__STORAGE is None:
+            RaydiumSerumCache.__STORAGE = MakeDefaultRaydiumCacheStorage(codec     = RAYDIUM_SERUM_CACHE_CODEC,
+                                                                         fileName  = "raydium_serum.sqlite",
+                                                                         legacyDir = "raydium")
+        return RaydiumSerumCache.__STORAGE
 
     @staticmethod
-    def __RaydiumSerumFilename(marketAddress: Union[str, Pubkey]) -> str:
-        return os.path.join(RaydiumSerumCache.__RaydiumSerumCachePath(), f"{MakePubkey(marketAddress)}.json")
+    def SetStorage(storage: RaydiumCacheStorage):
+        RaydiumSerumCache.__STORAGE = storage
+
+    @staticmethod
+    def MigrateFromJsonFiles(path: Optional[str] = None) -> int:
+        source = RaydiumJsonDirStorage(codec=RAYDIUM_SERUM_CACHE_CODEC, path=path if path else os.path.join(RaydiumCacheRootPath(), "raydium"))
+        return MigrateRaydiumCacheStorage(source=source, target=RaydiumSerumCache.GetStorage())
 
     # ========================================
     #
     @staticmethod
-    def __LoadSerumFromFile(marketAddress: Union[str, Pubkey]) -> SerumMarketV3:
-        try:
-            serumCachePath: str = RaydiumSerumCache.__RaydiumSerumCachePath()
-            serumInfoFile:  str = RaydiumSerumCache.__RaydiumSerumFilename(marketAddress=marketAddress)
-            logging.debug(f"Loading Raydium AMM Info from file: {serumInfoFile}")
-            if not os.path.isfile(serumInfoFile):
-                return None
-            with open(serumInfoFile) as f:
-                serumInfoJson = json.load(f)
-                serumEntry = SerumMarketV3.from_json(serumInfoJson)
-                return serumEntry
-        except:
-            return None
+    def __LoadSerumFromStorage(marketAddress: Union[str, Pubkey]) -> SerumMarketV3:
+        serumInfo = RaydiumSerumCache.GetStorage().Get(key=marketAddress)
+        if serumInfo:
+            RaydiumMetrics.Inc(RAYDIUM_METRIC_CACHE_LOOKUPS, cache="serum", source="disk")
+        return serumInfo
 
     # ========================================
     #
     @staticmethod
     def __LoadSerumFromBlockchain(connection: Client, marketAddress: Union[str, Pubkey]) -> SerumMarketV3:
-        serumCachePath: str = RaydiumSerumCache.__RaydiumSerumCachePath()
-        serumInfoFile:  str = RaydiumSerumCache.__RaydiumSerumFilename(marketAddress=marketAddress)
-
-        logging.debug(f"Loading Raydium AMM Info from Solana Node for AMM ID: {str(marketAddress)}")
+        logging.debug("Loading Raydium Serum Info from Solana Node for Market ID: %s", marketAddress)
+        RaydiumMetrics.Inc(RAYDIUM_METRIC_CACHE_LOOKUPS, cache="serum", source="rpc")
         serumEntry = SerumMarketV3.fetch(conn=connection, address=marketAddress)
-        
-        with open(serumInfoFile, "w") as f:
-            json.dump(serumEntry.to_json(), f)
+        RaydiumSerumCache.GetStorage().Put(key=marketAddress, entry=serumEntry)
         return serumEntry
 
     # ========================================
     #
     @staticmethod
     def UpdateRaydiumSerumCache(connection: Client, marketAddress: Union[str, Pubkey]) -> SerumMarketV3:
-        return RaydiumSerumCache.__LoadSerumFromBlockchain(connection=connection, marketAddress=marketAddress)
+        return RaydiumSerumCache.__FLIGHT.Do(key=MakePubkey(marketAddress), fetch=lambda: RaydiumSerumCache.__LoadSerumFromBlockchain(connection=connection, marketAddress=marketAddress))
 
     @staticmethod
     def GetRaydiumSerum(connection: Client, marketAddress: Union[str, Pubkey]) -> SerumMarketV3:
-        serumInfo = RaydiumSerumCache.__LoadSerumFromFile(marketAddress=marketAddress)
-        return serumInfo if serumInfo else RaydiumSerumCache.__LoadSerumFromBlockchain(connection=connection, marketAddress=marketAddress)
+        serumInfo = RaydiumSerumCache.__LoadSerumFromStorage(marketAddress=marketAddress)
+        if serumInfo:
+            return serumInfo
+        return RaydiumSerumCache.__FLIGHT.Do(key   = MakePubkey(marketAddress),
+                                             check = lambda: RaydiumSerumCache.__LoadSerumFromStorage(marketAddress=marketAddress),
+                                             fetch = lambda: RaydiumSerumCache.__LoadSerumFromBlockchain(connection=connection, marketAddress=marketAddress))
+
+    # ========================================
+    #
+    @staticmethod
+    async def __LoadSerumFromBlockchainAsync(connection: AsyncClient, marketAddress: Union[str, Pubkey]) -> SerumMarketV3:
+        logging.debug("Loading Raydium Serum Info from Solana Node for Market ID: %s", marketAddress)
+        RaydiumMetrics.Inc(RAYDIUM_METRIC_CACHE_LOOKUPS, cache="serum", source="rpc")
+        serumEntry = await SerumMarketV3.fetch_async(conn=connection, address=marketAddress)
+        RaydiumSerumCache.GetStorage().Put(key=marketAddress, entry=serumEntry)
+        return serumEntry
+
+    @staticmethod
+    async def UpdateRaydiumSerumCacheAsync(connection: AsyncClient, marketAddress: Union[str, Pubkey]) -> SerumMarketV3:
+        return await RaydiumSerumCache.__FLIGHT.DoAsync(key=MakePubkey(marketAddress), fetch=lambda: RaydiumSerumCache.__LoadSerumFromBlockchainAsync(connection=connection, marketAddress=marketAddress))
+
+    @staticmethod
+    async def GetRaydiumSerumAsync(connection: AsyncClient, marketAddress: Union[str, Pubkey]) -> SerumMarketV3:
+        serumInfo = RaydiumSerumCache.__LoadSerumFromStorage(marketAddress=marketAddress)
+        if serumInfo:
+            return serumInfo
+        return await RaydiumSerumCache.__FLIGHT.DoAsync(key   = MakePubkey(marketAddress),
+                                                        check = lambda: RaydiumSerumCache.__LoadSerumFromStorage(marketAddress=marketAddress),
+                                                        fetch = lambda: RaydiumSerumCache.__LoadSerumFromBlockchainAsync(connection=connection, marketAddress=marketAddress))
 
 # =============================================================================
 # 
@@ -19,14 +19,24 @@
 # =============================================================================
 # 
 from   solana.rpc.api      import Client, Pubkey, Keypair
+from   solana.rpc.async_api import AsyncClient
 from   sapysol             import *
 from   sapysol.token_cache import *
 from  .raydium_amm_cache   import *
 from  .raydium_serum_cache import *
-from   typing              import List, Any, TypedDict, Union, NamedTuple, Optional, ClassVar
+from   typing              import List, Any, Dict, TypedDict, Union, NamedTuple, Optional, ClassVar
 from  .constants           import RAYDIUM_LIQUIDITY_POOL_V4, RAYDIUM_AUTHORITY_V4, RAYDIUM_SERUM_PROGAM_ID
 from  .derive              import *
+from  .async_token_cache   import AsyncTokenCache
 from   dataclasses         import dataclass
+from  .storage             import RaydiumCacheCodec, RaydiumCacheStorage, RaydiumJsonDirStorage, RaydiumCacheRootPath, \
+                                  MakeDefaultRaydiumCacheStorage, MigrateRaydiumCacheStorage
+from  .single_flight       import RaydiumSingleFlight
+from  .metrics             import RaydiumMetrics, RAYDIUM_METRIC_CACHE_LOOKUPS
+from   collections         import OrderedDict
+import threading
+import struct
+import asyncio
 import logging
 import os
 
@@ -130,145 +140,462 @@ class RaydiumSwapCacheEntry:
                    asks               = MakePubkey(obj["asks"]),
                    event_queue        = MakePubkey(obj["event_queue"]))
 
+    # ========================================
+    # Compact binary form: version, decimals and raw 32-byte pubkeys.
+    #
+    def to_bytes(self) -> bytes:
+        return _SWAP_CACHE_ENTRY_STRUCT.pack(self.SAPYSOL_RAYDIUM_VERSION,
+                                             self.base_decimals,
+                                             self.quote_decimals,
+                                             *[bytes(getattr(self, name)) for name in _SWAP_CACHE_ENTRY_PUBKEYS])
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "RaydiumSwapCacheEntry":
+        version, baseDecimals, quoteDecimals, *pubkeys = _SWAP_CACHE_ENTRY_STRUCT.unpack_from(data)
+        return cls(SAPYSOL_RAYDIUM_VERSION = version,
+                   base_decimals           = baseDecimals,
+                   quote_decimals          = quoteDecimals,
+                   **{name: Pubkey.from_bytes(pubkey) for name, pubkey in zip(_SWAP_CACHE_ENTRY_PUBKEYS, pubkeys)})
+
+_SWAP_CACHE_ENTRY_PUBKEYS = ["amm_id",       "authority",         "base_mint",          "quote_mint",
+                             "lp_mint",      "open_orders",       "target_orders",      "base_vault",
+                             "quote_vault",  "market_id",         "market_base_vault",  "market_quote_vault",
+                             "market_authority",                  "bids",               "asks",               "event_queue"]
+_SWAP_CACHE_ENTRY_STRUCT  = struct.Struct("<IQQ" + "32s" * len(_SWAP_CACHE_ENTRY_PUBKEYS))
+
+# =============================================================================
+# Entries written by older versions of this library are ignored and refetched.
+#
+def _SwapCacheEntryIfCurrent(entry: RaydiumSwapCacheEntry) -> Optional[RaydiumSwapCacheEntry]:
+    return entry if entry.SAPYSOL_RAYDIUM_VERSION >= SAPYSOL_RAYDIUM_VERSION else None
+
+RAYDIUM_SWAP_CACHE_CODEC = RaydiumCacheCodec(toJson    = lambda entry: entry.to_json(),
+                                             fromJson  = lambda obj:   _SwapCacheEntryIfCurrent(RaydiumSwapCacheEntry.from_json(obj)) if "SAPYSOL_RAYDIUM_VERSION" in obj else None,
+                                             toBytes   = lambda entry: entry.to_bytes(),
+                                             fromBytes = lambda data:  _SwapCacheEntryIfCurrent(RaydiumSwapCacheEntry.from_bytes(data)))
+
+# =============================================================================
+# 
+class RaydiumSwapCacheStats(NamedTuple):
+    hits:     int #
+    misses:   int #
+    size:     int #
+    capacity: int #
+
+class RaydiumSwapCacheBatchResult(NamedTuple):
+    entries: Dict[Pubkey, RaydiumSwapCacheEntry] # pool -> entry
+    errors:  Dict[Any, str]                      # pool (the input as given when it is not a pubkey) -> reason
+
+# =============================================================================
+# `MakePubkey` returns None for unsupported types and panics on bytes of the
+# wrong length, so batch inputs are checked here first.
+#
+def _ParsePoolAddress(pool: SapysolPubkey) -> Pubkey:
+    if isinstance(pool, (bytes, bytearray)) and len(pool) != 32:
+        raise ValueError(f"Pubkey needs 32 bytes, got {len(pool)}")
+    pubkey: Optional[Pubkey] = MakePubkey(pool)
+    if pubkey is None:
+        raise ValueError(f"Not a pubkey: {pool!r}")
+    return pubkey
 
 # =============================================================================
 # 
 class RaydiumSwapCache:
+    # In-process LRU in front of the file cache, keyed by pool and by market pubkey.
+    MEMORY_CACHE_SIZE: int = 4096
+    __MEMORY_CACHE:    OrderedDict = OrderedDict()
+    __MEMORY_LOCK:     threading.Lock = threading.Lock()
+    __MEMORY_HITS:     int = 0
+    __MEMORY_MISSES:   int = 0
+    __STORAGE:         Optional[RaydiumCacheStorage] = None
+    # One RPC fetch per pool/market across threads and processes sharing the cache
+    __FLIGHT:          RaydiumSingleFlight = RaydiumSingleFlight(name="raydium_swaps", lockDir=os.path.join(RaydiumCacheRootPath(), "locks"))
+
     # ========================================
     #
     @staticmethod
-    def __RaydiumSwapCachePath() -> str:
-        path = os.path.join(os.getenv("HOME"), ".sapysol", "raydium_swaps")
-        EnsurePathExists(path)
-        return path
+    def __MemoryGet(address: Pubkey) -> Optional[RaydiumSwapCacheEntry]:
+        with RaydiumSwapCache.__MEMORY_LOCK:
+            entry = RaydiumSwapCache.__MEMORY_CACHE.get(address)
+            if entry is None:
+                RaydiumSwapCache.__MEMORY_MISSES += 1
+                return None
+            RaydiumSwapCache.__MEMORY_CACHE.move_to_end(address)
+            RaydiumSwapCache.__MEMORY_HITS += 1
+        RaydiumMetrics.Inc(RAYDIUM_METRIC_CACHE_LOOKUPS, cache="swap", source="memory")
+        return entry
+
+    @staticmethod
+    def __MemoryPut(entry: RaydiumSwapCacheEntry, addresses: List[Pubkey]):
+        with RaydiumSwapCache.__MEMORY_LOCK:
+            for address in addresses:
+                RaydiumSwapCache.__MEMORY_CACHE[address] = entry
+                RaydiumSwapCache.__MEMORY_CACHE.move_to_end(address)
+            RaydiumSwapCache.__MemoryTrim()
+
+    @staticmethod
+    def __MemoryTrim():
+        while len(RaydiumSwapCache.__MEMORY_CACHE) > max(RaydiumSwapCache.MEMORY_CACHE_SIZE, 0):
+            RaydiumSwapCache.__MEMORY_CACHE.popitem(last=False)
 
     @staticmethod
-    def __RaydiumSwapFilename(poolAddress: SapysolPubkey) -> str:
-        return os.path.join(RaydiumSwapCache.__RaydiumSwapCachePath(), f"{str(MakePubkey(poolAddress))}.json")
+    def __MemoryInvalidate(addresses: List[Pubkey]):
+        with RaydiumSwapCache.__MEMORY_LOCK:
+            for address in addresses:
+                entry = RaydiumSwapCache.__MEMORY_CACHE.pop(address, None)
+                if entry is not None:
+                    RaydiumSwapCache.__MEMORY_CACHE.pop(entry.amm_id,    None)
+                    RaydiumSwapCache.__MEMORY_CACHE.pop(entry.market_id, None)
 
     # ========================================
     #
     @staticmethod
-    def __LoadSwapFromFile(poolAddress: SapysolPubkey) -> RaydiumSwapCacheEntry:
-        try:
-            swapCachePath: str = RaydiumSwapCache.__RaydiumSwapCachePath()
-            swapInfoFile:  str = RaydiumSwapCache.__RaydiumSwapFilename(poolAddress=poolAddress)
-            logging.debug(f"Loading Raydium Swap Info from file: {swapInfoFile}")
-            if not os.path.isfile(swapInfoFile):
-                return None
-            with open(swapInfoFile) as f:
-                swapInfoJson = json.load(f)
-                if "SAPYSOL_RAYDIUM_VERSION" not in swapInfoJson:
-                    return None
-                if swapInfoJson["SAPYSOL_RAYDIUM_VERSION"] < SAPYSOL_RAYDIUM_VERSION:
-                    return None
-                return RaydiumSwapCacheEntry.from_json(swapInfoJson)
-        except:
-            return None
+    def GetMemoryCacheStats() -> RaydiumSwapCacheStats:
+        with RaydiumSwapCache.__MEMORY_LOCK:
+            return RaydiumSwapCacheStats(hits     = RaydiumSwapCache.__MEMORY_HITS,
+                                         misses   = RaydiumSwapCache.__MEMORY_MISSES,
+                                         size     = len(RaydiumSwapCache.__MEMORY_CACHE),
+                                         capacity = RaydiumSwapCache.MEMORY_CACHE_SIZE)
+
+    @staticmethod
+    def SetMemoryCacheSize(capacity: int):
+        with RaydiumSwapCache.__MEMORY_LOCK:
+            RaydiumSwapCache.MEMORY_CACHE_SIZE = capacity
+            RaydiumSwapCache.__MemoryTrim()
+
+    @staticmethod
+    def ClearMemoryCache():
+        with RaydiumSwapCache.__MEMORY_LOCK:
+            RaydiumSwapCache.__MEMORY_CACHE.clear()
+            RaydiumSwapCache.__MEMORY_HITS   = 0
+            RaydiumSwapCache.__MEMORY_MISSES = 0
 
     # ========================================
     #
     @staticmethod
-    def __LoadSwapFromBlockchain(connection: Client, poolAddress: Union[str, Pubkey]) -> RaydiumSwapCacheEntry:
-        ammInfo:   RaydiumLiquidityPoolV4 = RaydiumAmmCache.GetRaydiumAmm    (connection=connection, poolAddress   = poolAddress)
-        serumInfo: SerumMarketV3          = RaydiumSerumCache.GetRaydiumSerum(connection=connection, marketAddress = ammInfo.marketId)
-        swapCachePath: str = RaydiumSwapCache.__RaydiumSwapCachePath()
-        swapInfoFile:  str = RaydiumSwapCache.__RaydiumSwapFilename(poolAddress=poolAddress)
+    def GetStorage() -> RaydiumCacheStorage:
+        if RaydiumSwapCache.__STORAGE is None:
+            RaydiumSwapCache.__STORAGE = MakeDefaultRaydiumCacheStorage(codec     = RAYDIUM_SWAP_CACHE_CODEC,
+                                                                        fileName  = "raydium_swaps.sqlite",
+                                                                        legacyDir = "raydium_swaps")
+        return RaydiumSwapCache.__STORAGE
 
-        logging.debug(f"Loading Raydium Swap Info from Solana Node for AMM ID: {str(poolAddress)}")
+    @staticmethod
+    def SetStorage(storage: RaydiumCacheStorage):
+        RaydiumSwapCache.__STORAGE = storage
+        RaydiumSwapCache.ClearMemoryCache()
+
+    @staticmethod
+    def MigrateFromJsonFiles(path: Optional[str] = None) -> int:
+        source = RaydiumJsonDirStorage(codec=RAYDIUM_SWAP_CACHE_CODEC, path=path if path else os.path.join(RaydiumCacheRootPath(), "raydium_swaps"))
+        return MigrateRaydiumCacheStorage(source=source, target=RaydiumSwapCache.GetStorage())
 
+    # ========================================
+    #
+    @staticmethod
+    def __LoadSwapFromStorage(poolAddress: SapysolPubkey) -> RaydiumSwapCacheEntry:
+        swapInfo = RaydiumSwapCache.GetStorage().Get(key=poolAddress)
+        if swapInfo:
+            RaydiumMetrics.Inc(RAYDIUM_METRIC_CACHE_LOOKUPS, cache="swap", source="disk")
+        return swapInfo
+
+    # ========================================
+    #
+    @staticmethod
+    def __MakeSwapCacheEntry(poolAddress: Pubkey, ammInfo: RaydiumLiquidityPoolV4, serumInfo: SerumMarketV3) -> RaydiumSwapCacheEntry:
         poolAuthority   = DeriveLiquidityV4AssociatedAuthority(programID=RAYDIUM_LIQUIDITY_POOL_V4)
         marketAuthority = DeriveAssociatedMarketAuthority(programID=RAYDIUM_SERUM_PROGAM_ID, marketID=serumInfo.ownAddress)[0]
 
-        cacheEntry = RaydiumSwapCacheEntry(SAPYSOL_RAYDIUM_VERSION = SAPYSOL_RAYDIUM_VERSION, #
-                                           amm_id                  = poolAddress,             #
-                                           authority               = poolAuthority,           #
-                                           base_mint               = ammInfo.baseMint,        #
-                                           base_decimals           = ammInfo.baseDecimal,     #
-                                           quote_mint              = ammInfo.quoteMint,       #
-                                           quote_decimals          = ammInfo.quoteDecimal,    #
-                                           lp_mint                 = ammInfo.lpMint,          #
-                                           open_orders             = ammInfo.openOrders,      #
-                                           target_orders           = ammInfo.targetOrders,    #
-                                           base_vault              = ammInfo.baseVault,       #
-                                           quote_vault             = ammInfo.quoteVault,      #
-                                           market_id               = ammInfo.marketId,        #
-                                           market_base_vault       = serumInfo.baseVault,     #
-                                           market_quote_vault      = serumInfo.quoteVault,    #
-                                           market_authority        = marketAuthority,         #
-                                           bids                    = serumInfo.bids,          #
-                                           asks                    = serumInfo.asks,          #
-                                           event_queue             = serumInfo.eventQueue)    #
-        with open(swapInfoFile, "w") as f:
-            json.dump(cacheEntry.to_json(), f)
+        return RaydiumSwapCacheEntry(SAPYSOL_RAYDIUM_VERSION = SAPYSOL_RAYDIUM_VERSION, #
+                                     amm_id                  = poolAddress,             #
+                                     authority               = poolAuthority,           #
+                                     base_mint               = ammInfo.baseMint,        #
+                                     base_decimals           = ammInfo.baseDecimal,     #
+                                     quote_mint              = ammInfo.quoteMint,       #
+                                     quote_decimals          = ammInfo.quoteDecimal,    #
+                                     lp_mint                 = ammInfo.lpMint,          #
+                                     open_orders             = ammInfo.openOrders,      #
+                                     target_orders           = ammInfo.targetOrders,    #
+                                     base_vault              = ammInfo.baseVault,       #
+                                     quote_vault             = ammInfo.quoteVault,      #
+                                     market_id               = ammInfo.marketId,        #
+                                     market_base_vault       = serumInfo.baseVault,     #
+                                     market_quote_vault      = serumInfo.quoteVault,    #
+                                     market_authority        = marketAuthority,         #
+                                     bids                    = serumInfo.bids,          #
+                                     asks                    = serumInfo.asks,          #
+                                     event_queue             = serumInfo.eventQueue)    #
+
+    @staticmethod
+    def __SaveSwapToStorage(cacheEntry: RaydiumSwapCacheEntry):
+        RaydiumSwapCache.GetStorage().Put(key=cacheEntry.amm_id, entry=cacheEntry)
+
+    # ========================================
+    #
+    @staticmethod
+    def __LoadSwapFromBlockchain(connection: Client, poolAddress: Union[str, Pubkey]) -> RaydiumSwapCacheEntry:
+        ammInfo:   RaydiumLiquidityPoolV4 = RaydiumAmmCache.GetRaydiumAmmAddressing(connection=connection, poolAddress   = poolAddress)
+        serumInfo: SerumMarketV3          = RaydiumSerumCache.GetRaydiumSerum      (connection=connection, marketAddress = ammInfo.marketId)
+
+        logging.debug("Loading Raydium Swap Info from Solana Node for AMM ID: %s", poolAddress)
+
+        RaydiumMetrics.Inc(RAYDIUM_METRIC_CACHE_LOOKUPS, cache="swap", source="rpc")
+
+        cacheEntry = RaydiumSwapCache.__MakeSwapCacheEntry(poolAddress=MakePubkey(poolAddress), ammInfo=ammInfo, serumInfo=serumInfo)
+        RaydiumSwapCache.__SaveSwapToStorage(cacheEntry=cacheEntry)
         return cacheEntry
 
     # ========================================
     #
     @staticmethod
-    def __LoadSwapFromMarketAddress(connection: Client, marketAddress: SapysolPubkey) -> RaydiumSwapCacheEntry:
-        serumInfo: SerumMarketV3 = RaydiumSerumCache.GetRaydiumSerum(connection=connection, marketAddress=marketAddress)
-        associatedID:            Pubkey = DeriveLiquidityV4AssociatedID           (MakePubkey(marketAddress))
-        associatedBaseVault:     Pubkey = DeriveLiquidityV4AssociatedBaseVault    (MakePubkey(marketAddress))
-        associatedQuoteVault:    Pubkey = DeriveLiquidityV4AssociatedQuoteVault   (MakePubkey(marketAddress))
-        associatedLpMint:        Pubkey = DeriveLiquidityV4AssociatedLpMint       (MakePubkey(marketAddress))
-        associatedLpVault:       Pubkey = DeriveLiquidityV4AssociatedLpVault      (MakePubkey(marketAddress))
-        associatedTargetOrders:  Pubkey = DeriveLiquidityV4AssociatedTargetOrders (MakePubkey(marketAddress))
-        associatedWithdrawQueue: Pubkey = DeriveLiquidityV4AssociatedWithdrawQueue(MakePubkey(marketAddress))
-        associatedOpenOrders:    Pubkey = DeriveLiquidityV4AssociatedOpenOrders   (MakePubkey(marketAddress))
-        associatedConfigId:      Pubkey = DeriveLiquidityV4AssociatedConfigId()
-
-        swapInfoFile:  str = RaydiumSwapCache.__RaydiumSwapFilename(poolAddress=associatedID)
-        
-        poolAuthority   = DeriveLiquidityV4AssociatedAuthority(programID=RAYDIUM_LIQUIDITY_POOL_V4)
-        marketAuthority = DeriveAssociatedMarketAuthority(programID=RAYDIUM_SERUM_PROGAM_ID, marketID=serumInfo.ownAddress)[0]
+    def __MakeSwapCacheEntryFromMarket(marketAddress: Pubkey, serumInfo: SerumMarketV3, baseDecimals: int, quoteDecimals: int) -> RaydiumSwapCacheEntry:
+        derived:       RaydiumLiquidityV4Addresses = DeriveLiquidityV4Addresses(marketID=marketAddress)
+        poolAuthority: Pubkey                      = DeriveLiquidityV4AssociatedAuthority(programID=RAYDIUM_LIQUIDITY_POOL_V4)
+
+        return RaydiumSwapCacheEntry(SAPYSOL_RAYDIUM_VERSION = SAPYSOL_RAYDIUM_VERSION, #
+                                     amm_id                  = derived.amm_id,          #
+                                     authority               = poolAuthority,           #
+                                     base_mint               = serumInfo.baseMint,      #
+                                     base_decimals           = baseDecimals,            #
+                                     quote_mint              = serumInfo.quoteMint,     #
+                                     quote_decimals          = quoteDecimals,           #
+                                     lp_mint                 = derived.lp_mint,         #
+                                     open_orders             = derived.open_orders,     #
+                                     target_orders           = derived.target_orders,   #
+                                     base_vault              = derived.base_vault,      #
+                                     quote_vault             = derived.quote_vault,     #
+                                     market_id               = serumInfo.ownAddress,    #
+                                     market_base_vault       = serumInfo.baseVault,     #
+                                     market_quote_vault      = serumInfo.quoteVault,    #
+                                     market_authority        = derived.market_authority, #
+                                     bids                    = serumInfo.bids,          #
+                                     asks                    = serumInfo.asks,          #
+                                     event_queue             = serumInfo.eventQueue)    #
 
+    @staticmethod
+    def __LoadSwapFromMarketAddress(connection: Client, marketAddress: SapysolPubkey) -> RaydiumSwapCacheEntry:
+        RaydiumMetrics.Inc(RAYDIUM_METRIC_CACHE_LOOKUPS, cache="swap", source="rpc")
+        serumInfo:  SerumMarketV3   = RaydiumSerumCache.GetRaydiumSerum(connection=connection, marketAddress=marketAddress)
         baseToken:  TokenCacheEntry = TokenCache.GetToken(connection=connection, tokenMint=serumInfo.baseMint )
         quoteToken: TokenCacheEntry = TokenCache.GetToken(connection=connection, tokenMint=serumInfo.quoteMint)
 
-        cacheEntry = RaydiumSwapCacheEntry(SAPYSOL_RAYDIUM_VERSION = SAPYSOL_RAYDIUM_VERSION, #
-                                           amm_id                  = associatedID,            #
-                                           authority               = poolAuthority,           #
-                                           base_mint               = serumInfo.baseMint,      #
-                                           base_decimals           = baseToken.decimals,      #
-                                           quote_mint              = serumInfo.quoteMint,     #
-                                           quote_decimals          = quoteToken.decimals,     #
-                                           lp_mint                 = associatedLpMint,        #
-                                           open_orders             = associatedOpenOrders,    #
-                                           target_orders           = associatedTargetOrders,  #
-                                           base_vault              = associatedBaseVault,     #
-                                           quote_vault             = associatedQuoteVault,    #
-                                           market_id               = serumInfo.ownAddress,    #
-                                           market_base_vault       = serumInfo.baseVault,     #
-                                           market_quote_vault      = serumInfo.quoteVault,    #
-                                           market_authority        = marketAuthority,         #
-                                           bids                    = serumInfo.bids,          #
-                                           asks                    = serumInfo.asks,          #
-                                           event_queue             = serumInfo.eventQueue)    #
-        with open(swapInfoFile, "w") as f:
-            json.dump(cacheEntry, f)
+        cacheEntry = RaydiumSwapCache.__MakeSwapCacheEntryFromMarket(marketAddress = MakePubkey(marketAddress),
+                                                                     serumInfo     = serumInfo,
+                                                                     baseDecimals  = baseToken.decimals,
+                                                                     quoteDecimals = quoteToken.decimals)
+        RaydiumSwapCache.__SaveSwapToStorage(cacheEntry=cacheEntry)
         return cacheEntry
 
     # ========================================
     #
     @staticmethod
     def UpdateSwapCacheFromPoolAddress(connection: Client, poolAddress: SapysolPubkey) -> RaydiumSwapCacheEntry:
-        return RaydiumSwapCache.__LoadSwapFromBlockchain(connection=connection, poolAddress=poolAddress)
+        poolAddress: Pubkey = MakePubkey(poolAddress)
+        RaydiumSwapCache.__MemoryInvalidate(addresses=[poolAddress])
+        swapInfo = RaydiumSwapCache.__FLIGHT.Do(key=poolAddress, fetch=lambda: RaydiumSwapCache.__LoadSwapFromBlockchain(connection=connection, poolAddress=poolAddress))
+        RaydiumSwapCache.__MemoryPut(entry=swapInfo, addresses=[swapInfo.amm_id, swapInfo.market_id])
+        return swapInfo
 
     @staticmethod
     def UpdateSwapCacheFromMarketAddress(connection: Client, marketAddress: SapysolPubkey) -> RaydiumSwapCacheEntry:
-        return RaydiumSwapCache.__LoadSwapFromMarketAddress(connection=connection, marketAddress=marketAddress)
+        marketAddress: Pubkey = MakePubkey(marketAddress)
+        RaydiumSwapCache.__MemoryInvalidate(addresses=[marketAddress])
+        swapInfo = RaydiumSwapCache.__FLIGHT.Do(key=marketAddress, fetch=lambda: RaydiumSwapCache.__LoadSwapFromMarketAddress(connection=connection, marketAddress=marketAddress))
+        RaydiumSwapCache.__MemoryPut(entry=swapInfo, addresses=[swapInfo.amm_id, swapInfo.market_id])
+        return swapInfo
 
     @staticmethod
     def GetSwapCacheFromPoolAddress(connection: Client, poolAddress: SapysolPubkey) -> RaydiumSwapCacheEntry:
-        swapInfo = RaydiumSwapCache.__LoadSwapFromFile(poolAddress=poolAddress)
-        return swapInfo if swapInfo else RaydiumSwapCache.UpdateSwapCacheFromPoolAddress(connection=connection, poolAddress=poolAddress)
+        poolAddress: Pubkey = MakePubkey(poolAddress)
+        swapInfo = RaydiumSwapCache.__MemoryGet(address=poolAddress)
+        if swapInfo:
+            return swapInfo
+        swapInfo = RaydiumSwapCache.__LoadSwapFromStorage(poolAddress=poolAddress)
+        if not swapInfo:
+            swapInfo = RaydiumSwapCache.__FLIGHT.Do(key   = poolAddress,
+                                                    check = lambda: RaydiumSwapCache.__LoadSwapFromStorage(poolAddress=poolAddress),
+                                                    fetch = lambda: RaydiumSwapCache.__LoadSwapFromBlockchain(connection=connection, poolAddress=poolAddress))
+        RaydiumSwapCache.__MemoryPut(entry=swapInfo, addresses=[swapInfo.amm_id, swapInfo.market_id])
+        return swapInfo
 
     @staticmethod
     def GetSwapCacheFromMarketAddress(connection: Client, marketAddress: SapysolPubkey) -> RaydiumSwapCacheEntry:
-        associatedID: Pubkey = DeriveLiquidityV4AssociatedID(MakePubkey(marketAddress))
-        swapInfo = RaydiumSwapCache.__LoadSwapFromFile(poolAddress=associatedID)
-        return swapInfo if swapInfo else RaydiumSwapCache.UpdateSwapCacheFromMarketAddress(connection=connection, marketAddress=marketAddress)
+        marketAddress: Pubkey = MakePubkey(marketAddress)
+        swapInfo = RaydiumSwapCache.__MemoryGet(address=marketAddress)
+        if swapInfo:
+            return swapInfo
+        associatedID: Pubkey = DeriveLiquidityV4AssociatedID(marketAddress)
+        swapInfo = RaydiumSwapCache.__LoadSwapFromStorage(poolAddress=associatedID)
+        if not swapInfo:
+            swapInfo = RaydiumSwapCache.__FLIGHT.Do(key   = marketAddress,
+                                                    check = lambda: RaydiumSwapCache.__LoadSwapFromStorage(poolAddress=associatedID),
+                                                    fetch = lambda: RaydiumSwapCache.__LoadSwapFromMarketAddress(connection=connection, marketAddress=marketAddress))
+        RaydiumSwapCache.__MemoryPut(entry=swapInfo, addresses=[swapInfo.amm_id, swapInfo.market_id])
+        return swapInfo
+
+    # ========================================
+    # Asyncio variants, same file and memory tiers, RPC through `AsyncClient`.
+    #
+    @staticmethod
+    async def __LoadSwapFromBlockchainAsync(connection: AsyncClient, poolAddress: Pubkey) -> RaydiumSwapCacheEntry:
+        logging.debug("Loading Raydium Swap Info from Solana Node for AMM ID: %s", poolAddress)
+        RaydiumMetrics.Inc(RAYDIUM_METRIC_CACHE_LOOKUPS, cache="swap", source="rpc")
+
+        ammInfo:   RaydiumLiquidityPoolV4 = await RaydiumAmmCache.GetRaydiumAmmAddressingAsync(connection=connection, poolAddress   = poolAddress)
+        serumInfo: SerumMarketV3          = await RaydiumSerumCache.GetRaydiumSerumAsync      (connection=connection, marketAddress = ammInfo.marketId)
+
+        swapInfo = RaydiumSwapCache.__MakeSwapCacheEntry(poolAddress=poolAddress, ammInfo=ammInfo, serumInfo=serumInfo)
+        RaydiumSwapCache.__SaveSwapToStorage(cacheEntry=swapInfo)
+        return swapInfo
+
+    @staticmethod
+    async def __LoadSwapFromMarketAddressAsync(connection: AsyncClient, marketAddress: Pubkey) -> RaydiumSwapCacheEntry:
+        RaydiumMetrics.Inc(RAYDIUM_METRIC_CACHE_LOOKUPS, cache="swap", source="rpc")
+        serumInfo: SerumMarketV3 = await RaydiumSerumCache.GetRaydiumSerumAsync(connection=connection, marketAddress=marketAddress)
+        baseToken, quoteToken    = await asyncio.gather(AsyncTokenCache.GetToken(connection=connection, tokenMint=serumInfo.baseMint ),
+                                                        AsyncTokenCache.GetToken(connection=connection, tokenMint=serumInfo.quoteMint))
+
+        swapInfo = RaydiumSwapCache.__MakeSwapCacheEntryFromMarket(marketAddress = marketAddress,
+                                                                   serumInfo     = serumInfo,
+                                                                   baseDecimals  = baseToken.decimals,
+                                                                   quoteDecimals = quoteToken.decimals)
+        RaydiumSwapCache.__SaveSwapToStorage(cacheEntry=swapInfo)
+        return swapInfo
+
+    @staticmethod
+    async def UpdateSwapCacheFromPoolAddressAsync(connection: AsyncClient, poolAddress: SapysolPubkey) -> RaydiumSwapCacheEntry:
+        poolAddress: Pubkey = MakePubkey(poolAddress)
+        RaydiumSwapCache.__MemoryInvalidate(addresses=[poolAddress])
+        swapInfo = await RaydiumSwapCache.__FLIGHT.DoAsync(key=poolAddress, fetch=lambda: RaydiumSwapCache.__LoadSwapFromBlockchainAsync(connection=connection, poolAddress=poolAddress))
+        RaydiumSwapCache.__MemoryPut(entry=swapInfo, addresses=[swapInfo.amm_id, swapInfo.market_id])
+        return swapInfo
+
+    @staticmethod
+    async def UpdateSwapCacheFromMarketAddressAsync(connection: AsyncClient, marketAddress: SapysolPubkey) -> RaydiumSwapCacheEntry:
+        marketAddress: Pubkey = MakePubkey(marketAddress)
+        RaydiumSwapCache.__MemoryInvalidate(addresses=[marketAddress])
+        swapInfo = await RaydiumSwapCache.__FLIGHT.DoAsync(key=marketAddress, fetch=lambda: RaydiumSwapCache.__LoadSwapFromMarketAddressAsync(connection=connection, marketAddress=marketAddress))
+        RaydiumSwapCache.__MemoryPut(entry=swapInfo, addresses=[swapInfo.amm_id, swapInfo.market_id])
+        return swapInfo
+
+    @staticmethod
+    async def GetSwapCacheFromPoolAddressAsync(connection: AsyncClient, poolAddress: SapysolPubkey) -> RaydiumSwapCacheEntry:
+        poolAddress: Pubkey = MakePubkey(poolAddress)
+        swapInfo = RaydiumSwapCache.__MemoryGet(address=poolAddress)
+        if swapInfo:
+            return swapInfo
+        swapInfo = RaydiumSwapCache.__LoadSwapFromStorage(poolAddress=poolAddress)
+        if not swapInfo:
+            swapInfo = await RaydiumSwapCache.__FLIGHT.DoAsync(key   = poolAddress,
+                                                               check = lambda: RaydiumSwapCache.__LoadSwapFromStorage(poolAddress=poolAddress),
+                                                               fetch = lambda: RaydiumSwapCache.__LoadSwapFromBlockchainAsync(connection=connection, poolAddress=poolAddress))
+        RaydiumSwapCache.__MemoryPut(entry=swapInfo, addresses=[swapInfo.amm_id, swapInfo.market_id])
+        return swapInfo
+
+    @staticmethod
+    async def GetSwapCacheFromMarketAddressAsync(connection: AsyncClient, marketAddress: SapysolPubkey) -> RaydiumSwapCacheEntry:
+        marketAddress: Pubkey = MakePubkey(marketAddress)
+        swapInfo = RaydiumSwapCache.__MemoryGet(address=marketAddress)
+        if swapInfo:
+            return swapInfo
+        associatedID: Pubkey = DeriveLiquidityV4AssociatedID(marketAddress)
+        swapInfo = RaydiumSwapCache.__LoadSwapFromStorage(poolAddress=associatedID)
+        if not swapInfo:
+            swapInfo = await RaydiumSwapCache.__FLIGHT.DoAsync(key   = marketAddress,
+                                                               check = lambda: RaydiumSwapCache.__LoadSwapFromStorage(poolAddress=associatedID),
+                                                               fetch = lambda: RaydiumSwapCache.__LoadSwapFromMarketAddressAsync(connection=connection, marketAddress=marketAddress))
+        RaydiumSwapCache.__MemoryPut(entry=swapInfo, addresses=[swapInfo.amm_id, swapInfo.market_id])
+        return swapInfo
+
+    # ========================================
+    # `FetchAccounts` chunk by chunk: a failing request marks only its own
+    # chunk as failed in `errors`, accounts of the other chunks are kept.
+    #
+    @staticmethod
+    def __FetchChunks(connection: Client, pubkeys: List[Pubkey], chunkSize: int, errors: Dict[Any, str]) -> Dict[Pubkey, Optional[Account]]:
+        accounts: Dict[Pubkey, Optional[Account]] = {}
+        for chunk in ListToChunks(baseList=pubkeys, chunkSize=chunkSize):
+            try:
+                accounts.update(zip(chunk, FetchAccounts(connection=connection, pubkeys=chunk, chunkSize=chunkSize)))
+            except Exception as e:
+                logging.debug("Fetching %s accounts failed: %r", len(chunk), e)
+                errors.update((pubkey, f"RPC request failed: {e!r}") for pubkey in chunk)
+        return accounts
+
+    # ========================================
+    # Resolves many pools with two batched passes: all AMM accounts, then
+    # all of their distinct markets. A failing pool is reported in `errors`
+    # and never aborts the rest of the batch.
+    #
+    @staticmethod
+    def GetSwapCachesFromPoolAddresses(connection:  Client,
+                                       pools:       List[SapysolPubkey],
+                                       chunkSize:   int  = 100,
+                                       forceUpdate: bool = False) -> RaydiumSwapCacheBatchResult:
+        entries: Dict[Pubkey, RaydiumSwapCacheEntry] = {}
+        errors:  Dict[Any, str]                      = {}
+
+        uniquePools: List[Pubkey] = []
+        for pool in pools:
+            try:
+                uniquePools.append(_ParsePoolAddress(pool))
+            except (ValueError, TypeError) as e:
+                errors[pool if isinstance(pool, (str, bytes, type(None))) else repr(pool)] = f"Invalid pool address: {e}"
+        uniquePools = list(dict.fromkeys(uniquePools))
+        if not forceUpdate:
+            for pool in uniquePools:
+                swapInfo = RaydiumSwapCache.__MemoryGet(address=pool)
+                if swapInfo:
+                    entries[pool] = swapInfo
+            stored = RaydiumSwapCache.GetStorage().GetMany(keys=[pool for pool in uniquePools if pool not in entries])
+            for pool, swapInfo in stored.items():
+                RaydiumSwapCache.__MemoryPut(entry=swapInfo, addresses=[swapInfo.amm_id, swapInfo.market_id])
+                entries[pool] = swapInfo
+            RaydiumMetrics.Inc(RAYDIUM_METRIC_CACHE_LOOKUPS, len(stored), cache="swap", source="disk")
+        pending: List[Pubkey] = [pool for pool in uniquePools if pool not in entries]
+        RaydiumMetrics.Inc(RAYDIUM_METRIC_CACHE_LOOKUPS, len(pending), cache="swap", source="rpc")
+
+        # 1. AMM accounts
+        ammInfos: Dict[Pubkey, RaydiumLiquidityPoolV4] = {}
+        for pool, account in RaydiumSwapCache.__FetchChunks(connection=connection, pubkeys=pending, chunkSize=chunkSize, errors=errors).items():
+            if account is None:
+                errors[pool] = "AMM account not found"
+            elif account.owner != RAYDIUM_LIQUIDITY_POOL_V4 or len(account.data) < RaydiumLiquidityPoolV4.codec.SIZE:
+                errors[pool] = "Account is not a Raydium AMM V4 pool"
+            else:
+                ammInfos[pool] = RaydiumLiquidityPoolV4.decode_fast(account.data)
+
+        # 2. Distinct Serum markets
+        marketIDs:    List[Pubkey]                = list(dict.fromkeys(ammInfo.marketId for ammInfo in ammInfos.values()))
+        marketErrors: Dict[Pubkey, str]           = {}
+        serumInfos:   Dict[Pubkey, SerumMarketV3] = {}
+        for marketID, account in RaydiumSwapCache.__FetchChunks(connection=connection, pubkeys=marketIDs, chunkSize=chunkSize, errors=marketErrors).items():
+            if account is not None and len(account.data) >= SerumMarketV3.codec.SIZE:
+                serumInfos[marketID] = SerumMarketV3.decode_fast(account.data)
+
+        # 3. Cache entries
+        fetched: Dict[Pubkey, RaydiumSwapCacheEntry] = {}
+        for pool, ammInfo in ammInfos.items():
+            serumInfo = serumInfos.get(ammInfo.marketId)
+            if ammInfo.marketId in marketErrors:
+                errors[pool] = marketErrors[ammInfo.marketId]
+                continue
+            if serumInfo is None:
+                errors[pool] = f"Serum market not found: {ammInfo.marketId}"
+                continue
+            try:
+                fetched[pool] = RaydiumSwapCache.__MakeSwapCacheEntry(poolAddress=pool, ammInfo=ammInfo, serumInfo=serumInfo)
+            except Exception as e:
+                errors[pool] = repr(e)
+
+        if fetched:
+            RaydiumSwapCache.GetStorage().PutMany(items=fetched)
+        for pool, cacheEntry in fetched.items():
+            RaydiumSwapCache.__MemoryPut(entry=cacheEntry, addresses=[cacheEntry.amm_id, cacheEntry.market_id])
+            entries[pool] = cacheEntry
+
+        logging.debug("Loaded %s Raydium Swap Infos, %s failed", len(entries), len(errors))
+        return RaydiumSwapCacheBatchResult(entries=entries, errors=errors)
 
 # =============================================================================
 # 
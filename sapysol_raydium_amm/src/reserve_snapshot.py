@@ -0,0 +1,212 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: Raydium AMM v4 reserve snapshot
+#
+# =============================================================================
+# 
+from   solana.rpc.api                 import Client, Pubkey
+from   solana.rpc.async_api           import AsyncClient
+from   solana.rpc.commitment          import Commitment
+from   solana.rpc.types               import DataSliceOpts
+from   sapysol                        import ListToChunks
+from  .raydium_swap_cache             import RaydiumSwapCacheEntry
+from  .quote                          import RaydiumAmmReserves
+from ..accounts.raydium_amm_v4        import RaydiumLiquidityPoolV4
+from ..accounts.serum_open_orders_v3  import OpenOrdersV3
+from   typing                         import List, Any, Dict, NamedTuple, Optional
+import asyncio
+import logging
+import struct
+
+# =============================================================================
+# SPL token account `amount` (u64) follows `mint` and `owner`.
+#
+TOKEN_ACCOUNT_AMOUNT_OFFSET: int = 64
+# AMM statuses that still route swaps through the order book
+# (Initialized, OrderBookOnly, WaitingTrade); the rest use vaults only.
+RAYDIUM_AMM_ORDERBOOK_STATUSES: tuple = (1, 5, 7)
+
+# =============================================================================
+# Everything needed to price a pool, read at a single context slot.
+#
+class ReserveSnapshotEntry(NamedTuple):
+    poolAddress:          Pubkey             #
+    slot:                 int                # context slot of the getMultipleAccounts call
+    status:               int                #
+    baseVaultAmount:      int                #
+    quoteVaultAmount:     int                #
+    baseOpenOrdersTotal:  int                # 0 when the pool does not use the order book
+    quoteOpenOrdersTotal: int                # 0 when the pool does not use the order book
+    baseNeedTakePnl:      int                #
+    quoteNeedTakePnl:     int                #
+    reserves:             RaydiumAmmReserves #
+
+# =============================================================================
+# Fetches AMM, both vaults and open orders of many pools with chunked
+# `getMultipleAccounts`. Every account is requested with the same short
+# `dataSlice` that covers all fields we need from all four account types.
+#
+class ReserveSnapshot:
+    AMM_PROJECTION         = RaydiumLiquidityPoolV4.codec.Projection(["status", "swapFeeNumerator", "swapFeeDenominator", "baseNeedTakePnl", "quoteNeedTakePnl"])
+    OPEN_ORDERS_PROJECTION = OpenOrdersV3.codec.Projection(["baseTokenTotal", "quoteTokenTotal"])
+    AMM_LENGTH:         int = AMM_PROJECTION.OFFSET         + AMM_PROJECTION.LENGTH
+    OPEN_ORDERS_LENGTH: int = OPEN_ORDERS_PROJECTION.OFFSET + OPEN_ORDERS_PROJECTION.LENGTH
+    TOKEN_LENGTH:       int = TOKEN_ACCOUNT_AMOUNT_OFFSET   + 8
+    DATA_SLICE_LENGTH:  int = max(AMM_LENGTH, OPEN_ORDERS_LENGTH, TOKEN_LENGTH)
+    ACCOUNTS_PER_POOL:  int = 4
+
+    # ========================================
+    #
+    @staticmethod
+    def __GetPubkeys(swapCaches: List[RaydiumSwapCacheEntry]) -> List[Pubkey]:
+        pubkeys: List[Pubkey] = []
+        for swapCache in swapCaches:
+            pubkeys += [swapCache.amm_id, swapCache.base_vault, swapCache.quote_vault, swapCache.open_orders]
+        return pubkeys
+
+    # ========================================
+    #
+    @staticmethod
+    def __GetChunks(swapCaches: List[RaydiumSwapCacheEntry], chunkSize: int) -> List[List[RaydiumSwapCacheEntry]]:
+        return ListToChunks(baseList=list(swapCaches), chunkSize=max(1, chunkSize // ReserveSnapshot.ACCOUNTS_PER_POOL))
+
+    # ========================================
+    #
+    @staticmethod
+    def DecodeTokenAmount(data: bytes) -> int:
+        return struct.unpack_from("<Q", data, TOKEN_ACCOUNT_AMOUNT_OFFSET)[0]
+
+    # ========================================
+    # Builds an entry from decoded AMM fields (`AMM_PROJECTION`), vault amounts
+    # and open orders fields (`OPEN_ORDERS_PROJECTION`, may be None).
+    # Returns None if effective reserves come out negative.
+    #
+    @staticmethod
+    def MakeEntry(poolAddress:      Pubkey,
+                  slot:             int,
+                  ammFields:        Dict[str, Any],
+                  baseVaultAmount:  int,
+                  quoteVaultAmount: int,
+                  openOrdersFields: Optional[Dict[str, Any]]) -> Optional[ReserveSnapshotEntry]:
+
+        baseOpenOrdersTotal:  int = 0
+        quoteOpenOrdersTotal: int = 0
+        if ammFields["status"] in RAYDIUM_AMM_ORDERBOOK_STATUSES and openOrdersFields is not None:
+            baseOpenOrdersTotal  = openOrdersFields["baseTokenTotal" ]
+            quoteOpenOrdersTotal = openOrdersFields["quoteTokenTotal"]
+        try:
+            reserves = RaydiumAmmReserves.FromAmounts(baseVaultAmount      = baseVaultAmount,
+                                                      quoteVaultAmount     = quoteVaultAmount,
+                                                      baseNeedTakePnl      = ammFields["baseNeedTakePnl"   ],
+                                                      quoteNeedTakePnl     = ammFields["quoteNeedTakePnl"  ],
+                                                      swapFeeNumerator     = ammFields["swapFeeNumerator"  ],
+                                                      swapFeeDenominator   = ammFields["swapFeeDenominator"],
+                                                      baseOpenOrdersTotal  = baseOpenOrdersTotal,
+                                                      quoteOpenOrdersTotal = quoteOpenOrdersTotal)
+        except ValueError as e:
+            logging.debug("Reserve snapshot: %s AMM ID: %s", e, poolAddress)
+            return None
+
+        return ReserveSnapshotEntry(poolAddress          = poolAddress,
+                                    slot                 = slot,
+                                    status               = ammFields["status"],
+                                    baseVaultAmount      = baseVaultAmount,
+                                    quoteVaultAmount     = quoteVaultAmount,
+                                    baseOpenOrdersTotal  = baseOpenOrdersTotal,
+                                    quoteOpenOrdersTotal = quoteOpenOrdersTotal,
+                                    baseNeedTakePnl      = ammFields["baseNeedTakePnl" ],
+                                    quoteNeedTakePnl     = ammFields["quoteNeedTakePnl"],
+                                    reserves             = reserves)
+
+    # ========================================
+    #
+    @staticmethod
+    def __ParseChunk(swapCaches: List[RaydiumSwapCacheEntry], accounts: List[Any], slot: int) -> Dict[Pubkey, ReserveSnapshotEntry]:
+        result: Dict[Pubkey, ReserveSnapshotEntry] = {}
+        for index, swapCache in enumerate(swapCaches):
+            amm, baseVault, quoteVault, openOrders = accounts[index * ReserveSnapshot.ACCOUNTS_PER_POOL:(index + 1) * ReserveSnapshot.ACCOUNTS_PER_POOL]
+            if not amm or not baseVault or not quoteVault or len(amm.data) < ReserveSnapshot.AMM_LENGTH \
+                                                          or min(len(baseVault.data), len(quoteVault.data)) < ReserveSnapshot.TOKEN_LENGTH:
+                logging.debug("Reserve snapshot: missing accounts for AMM ID: %s", swapCache.amm_id)
+                continue
+
+            openOrdersFields: Optional[Dict[str, Any]] = None
+            if openOrders and len(openOrders.data) >= ReserveSnapshot.OPEN_ORDERS_LENGTH:
+                openOrdersFields = ReserveSnapshot.OPEN_ORDERS_PROJECTION.decode_account(openOrders.data)
+
+            entry = ReserveSnapshot.MakeEntry(poolAddress      = swapCache.amm_id,
+                                              slot             = slot,
+                                              ammFields        = ReserveSnapshot.AMM_PROJECTION.decode_account(amm.data),
+                                              baseVaultAmount  = ReserveSnapshot.DecodeTokenAmount(baseVault.data ),
+                                              quoteVaultAmount = ReserveSnapshot.DecodeTokenAmount(quoteVault.data),
+                                              openOrdersFields = openOrdersFields)
+            if entry is not None:
+                result[swapCache.amm_id] = entry
+        return result
+
+    # ========================================
+    # Pools whose accounts are missing are left out of the result.
+    #
+    @staticmethod
+    def FetchMany(connection: Client,
+                  swapCaches: List[RaydiumSwapCacheEntry],
+                  commitment: Optional[Commitment] = None,
+                  chunkSize:  int = 100) -> Dict[Pubkey, ReserveSnapshotEntry]:
+
+        dataSlice = DataSliceOpts(offset=0, length=ReserveSnapshot.DATA_SLICE_LENGTH)
+        result: Dict[Pubkey, ReserveSnapshotEntry] = {}
+        for chunk in ReserveSnapshot.__GetChunks(swapCaches=swapCaches, chunkSize=chunkSize):
+            resp = connection.get_multiple_accounts(pubkeys    = ReserveSnapshot.__GetPubkeys(swapCaches=chunk),
+                                                    commitment = commitment,
+                                                    data_slice = dataSlice)
+            result.update(ReserveSnapshot.__ParseChunk(swapCaches=chunk, accounts=resp.value, slot=resp.context.slot))
+        return result
+
+    # ========================================
+    #
+    @staticmethod
+    def Fetch(connection: Client, swapCache: RaydiumSwapCacheEntry, commitment: Optional[Commitment] = None) -> Optional[ReserveSnapshotEntry]:
+        return ReserveSnapshot.FetchMany(connection=connection, swapCaches=[swapCache], commitment=commitment).get(swapCache.amm_id)
+
+    # ========================================
+    # Same as `FetchMany`, chunks are requested concurrently.
+    #
+    @staticmethod
+    async def FetchManyAsync(connection: AsyncClient,
+                             swapCaches: List[RaydiumSwapCacheEntry],
+                             commitment: Optional[Commitment] = None,
+                             chunkSize:  int = 100) -> Dict[Pubkey, ReserveSnapshotEntry]:
+
+        dataSlice = DataSliceOpts(offset=0, length=ReserveSnapshot.DATA_SLICE_LENGTH)
+        chunks    = ReserveSnapshot.__GetChunks(swapCaches=swapCaches, chunkSize=chunkSize)
+        responses = await asyncio.gather(*[connection.get_multiple_accounts(pubkeys    = ReserveSnapshot.__GetPubkeys(swapCaches=chunk),
+                                                                            commitment = commitment,
+                                                                            data_slice = dataSlice) for chunk in chunks])
+        result: Dict[Pubkey, ReserveSnapshotEntry] = {}
+        for chunk, resp in zip(chunks, responses):
+            result.update(ReserveSnapshot.__ParseChunk(swapCaches=chunk, accounts=resp.value, slot=resp.context.slot))
+        return result
+
+    # ========================================
+    #
+    @staticmethod
+    async def FetchAsync(connection: AsyncClient, swapCache: RaydiumSwapCacheEntry, commitment: Optional[Commitment] = None) -> Optional[ReserveSnapshotEntry]:
+        result = await ReserveSnapshot.FetchManyAsync(connection=connection, swapCaches=[swapCache], commitment=commitment)
+        return result.get(swapCache.amm_id)
+
+# =============================================================================
+# 
@@ -0,0 +1,317 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: Raydium AMM v4 reserve stream
+#
+# =============================================================================
+# 
+from   solders.pubkey         import Pubkey
+from   solana.rpc.async_api   import AsyncClient
+from  .raydium_swap_cache     import RaydiumSwapCacheEntry
+from  .reserve_snapshot       import ReserveSnapshot, ReserveSnapshotEntry
+from   typing                 import List, Any, Dict, Tuple, NamedTuple, Optional, Callable
+import asyncio
+import logging
+import base64
+import json
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+# =============================================================================
+# Roles of the four accounts we subscribe to per pool.
+#
+STREAM_ACCOUNT_AMM:         str = "amm"
+STREAM_ACCOUNT_BASE_VAULT:  str = "baseVault"
+STREAM_ACCOUNT_QUOTE_VAULT: str = "quoteVault"
+STREAM_ACCOUNT_OPEN_ORDERS: str = "openOrders"
+
+# =============================================================================
+# `previous` is None for the first complete state of a pool.
+#
+class ReserveStreamUpdate(NamedTuple):
+    poolAddress: Pubkey                         #
+    previous:    Optional[ReserveSnapshotEntry] #
+    current:     ReserveSnapshotEntry           #
+
+# =============================================================================
+# `reason` is "reconnect" or "slot"; slots are the last seen and the new one.
+#
+class ReserveStreamGap(NamedTuple):
+    reason:   str #
+    fromSlot: int #
+    toSlot:   int #
+
+# =============================================================================
+# Keeps live reserves for a watchlist of pools using `accountSubscribe` on
+# each pool's AMM, vaults and open orders, plus `slotSubscribe` for gap
+# detection. Reconnects with exponential backoff and resubscribes; after a
+# reconnect or slot gap it resyncs with `ReserveSnapshot` when `connection`
+# is given. Callbacks may be plain functions or coroutines.
+#
+class ReserveStream:
+    def __init__(self,
+                 wsEndpoint:        str,
+                 swapCaches:        List[RaydiumSwapCacheEntry],
+                 connection:        Optional[AsyncClient] = None,
+                 commitment:        str   = "confirmed",
+                 maxSlotGap:        int   = 16,
+                 reconnectDelay:    float = 0.5,
+                 maxReconnectDelay: float = 30.0,
+                 recordPath:        Optional[str] = None):
+
+        self.WS_ENDPOINT:         str                                    = wsEndpoint
+        self.CONNECTION:          Optional[AsyncClient]                  = connection
+        self.COMMITMENT:          str                                    = commitment
+        self.MAX_SLOT_GAP:        int                                    = maxSlotGap
+        self.RECONNECT_DELAY:     float                                  = reconnectDelay
+        self.MAX_RECONNECT_DELAY: float                                  = maxReconnectDelay
+        self.RECORD_PATH:         Optional[str]                          = recordPath
+        self.SWAP_CACHES:         Dict[Pubkey, RaydiumSwapCacheEntry]    = {entry.amm_id: entry for entry in swapCaches}
+        self.__ACCOUNTS:          Dict[Pubkey, Tuple[Pubkey, str]]       = {}
+        self.__FIELDS:            Dict[Pubkey, Dict[str, Any]]           = {}
+        self.__ACCOUNT_SLOTS:     Dict[Pubkey, int]                      = {}
+        self.__STATE:             Dict[Pubkey, ReserveSnapshotEntry]     = {}
+        self.__PRICE_CALLBACKS:   List[Callable[[ReserveStreamUpdate], Any]] = []
+        self.__GAP_CALLBACKS:     List[Callable[[ReserveStreamGap], Any]]    = []
+        self.__LAST_SLOT:         int                                    = 0
+        self.__STOPPED:           bool                                   = False
+        self.__WEBSOCKET:         Any                                    = None
+        self.CONNECTIONS:         int                                    = 0
+
+        for poolAddress, entry in self.SWAP_CACHES.items():
+            self.__FIELDS[poolAddress] = {}
+            self.__ACCOUNTS[entry.amm_id     ] = (poolAddress, STREAM_ACCOUNT_AMM        )
+            self.__ACCOUNTS[entry.base_vault ] = (poolAddress, STREAM_ACCOUNT_BASE_VAULT )
+            self.__ACCOUNTS[entry.quote_vault] = (poolAddress, STREAM_ACCOUNT_QUOTE_VAULT)
+            self.__ACCOUNTS[entry.open_orders] = (poolAddress, STREAM_ACCOUNT_OPEN_ORDERS)
+
+    # ========================================
+    #
+    def AddPriceCallback(self, callback: Callable[[ReserveStreamUpdate], Any]):
+        self.__PRICE_CALLBACKS.append(callback)
+
+    def AddGapCallback(self, callback: Callable[[ReserveStreamGap], Any]):
+        self.__GAP_CALLBACKS.append(callback)
+
+    # ========================================
+    #
+    def GetState(self, poolAddress: Pubkey) -> Optional[ReserveSnapshotEntry]:
+        return self.__STATE.get(poolAddress)
+
+    def GetAllStates(self) -> Dict[Pubkey, ReserveSnapshotEntry]:
+        return dict(self.__STATE)
+
+    def GetLastSlot(self) -> int:
+        return self.__LAST_SLOT
+
+    # ========================================
+    #
+    async def __Emit(self, callbacks: List[Callable], value: Any):
+        for callback in callbacks:
+            try:
+                result = callback(value)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logging.exception(f"ReserveStream callback failed: {str(e)}")
+
+    # ========================================
+    # Rebuilds pool state from the decoded fields, notifies on change.
+    #
+    async def __UpdatePool(self, poolAddress: Pubkey, slot: int):
+        fields: Dict[str, Any] = self.__FIELDS[poolAddress]
+        if STREAM_ACCOUNT_AMM not in fields or STREAM_ACCOUNT_BASE_VAULT not in fields or STREAM_ACCOUNT_QUOTE_VAULT not in fields:
+            return
+        current = ReserveSnapshot.MakeEntry(poolAddress      = poolAddress,
+                                            slot             = slot,
+                                            ammFields        = fields[STREAM_ACCOUNT_AMM],
+                                            baseVaultAmount  = fields[STREAM_ACCOUNT_BASE_VAULT ],
+                                            quoteVaultAmount = fields[STREAM_ACCOUNT_QUOTE_VAULT],
+                                            openOrdersFields = fields.get(STREAM_ACCOUNT_OPEN_ORDERS))
+        if current is None:
+            return
+        previous = self.__STATE.get(poolAddress)
+        self.__STATE[poolAddress] = current
+        if previous is None or previous.reserves != current.reserves:
+            await self.__Emit(callbacks=self.__PRICE_CALLBACKS, value=ReserveStreamUpdate(poolAddress=poolAddress, previous=previous, current=current))
+
+    # ========================================
+    # Decodes only the account that changed. Updates older than what we
+    # already have for this account are dropped.
+    #
+    async def __OnAccount(self, pubkey: Pubkey, slot: int, data: bytes):
+        poolAddress, role = self.__ACCOUNTS[pubkey]
+        if slot < self.__ACCOUNT_SLOTS.get(pubkey, 0):
+            return
+        self.__ACCOUNT_SLOTS[pubkey] = slot
+
+        if role == STREAM_ACCOUNT_AMM:
+            if len(data) < ReserveSnapshot.AMM_LENGTH:
+                return
+            value = ReserveSnapshot.AMM_PROJECTION.decode_account(data)
+        elif role == STREAM_ACCOUNT_OPEN_ORDERS:
+            if len(data) < ReserveSnapshot.OPEN_ORDERS_LENGTH:
+                return
+            value = ReserveSnapshot.OPEN_ORDERS_PROJECTION.decode_account(data)
+        else:
+            if len(data) < ReserveSnapshot.TOKEN_LENGTH:
+                return
+            value = ReserveSnapshot.DecodeTokenAmount(data)
+
+        self.__FIELDS[poolAddress][role] = value
+        await self.__UpdatePool(poolAddress=poolAddress, slot=slot)
+
+    # ========================================
+    #
+    async def __OnSlot(self, slot: int):
+        lastSlot: int = self.__LAST_SLOT
+        self.__LAST_SLOT = max(lastSlot, slot)
+        if lastSlot and slot - lastSlot > self.MAX_SLOT_GAP:
+            await self.__OnGap(gap=ReserveStreamGap(reason="slot", fromSlot=lastSlot, toSlot=slot))
+
+    # ========================================
+    #
+    async def __OnGap(self, gap: ReserveStreamGap):
+        logging.debug("ReserveStream gap: %s, slots %s -> %s", gap.reason, gap.fromSlot, gap.toSlot)
+        await self.__Emit(callbacks=self.__GAP_CALLBACKS, value=gap)
+        await self.Resync()
+
+    # ========================================
+    # Re-reads all pools over HTTP; no-op without `connection`.
+    #
+    async def Resync(self):
+        if self.CONNECTION is None:
+            return
+        snapshots = await ReserveSnapshot.FetchManyAsync(connection=self.CONNECTION, swapCaches=list(self.SWAP_CACHES.values()))
+        for poolAddress, entry in snapshots.items():
+            swapCache: RaydiumSwapCacheEntry = self.SWAP_CACHES[poolAddress]
+            pubkeys:   Tuple[Pubkey, ...]     = (swapCache.amm_id, swapCache.base_vault, swapCache.quote_vault, swapCache.open_orders)
+            if entry.slot < max(self.__ACCOUNT_SLOTS.get(pubkey, 0) for pubkey in pubkeys):
+                continue
+            # Notifications that queued up during the resync but are older
+            # than the snapshot must not overwrite it
+            for pubkey in pubkeys:
+                self.__ACCOUNT_SLOTS[pubkey] = max(self.__ACCOUNT_SLOTS.get(pubkey, 0), entry.slot)
+            fields: Dict[str, Any] = self.__FIELDS[poolAddress]
+            fields[STREAM_ACCOUNT_AMM        ] = {"status":             entry.status,
+                                                  "swapFeeNumerator":   entry.reserves.swapFeeNumerator,
+                                                  "swapFeeDenominator": entry.reserves.swapFeeDenominator,
+                                                  "baseNeedTakePnl":    entry.baseNeedTakePnl,
+                                                  "quoteNeedTakePnl":   entry.quoteNeedTakePnl}
+            fields[STREAM_ACCOUNT_BASE_VAULT ] = entry.baseVaultAmount
+            fields[STREAM_ACCOUNT_QUOTE_VAULT] = entry.quoteVaultAmount
+            fields[STREAM_ACCOUNT_OPEN_ORDERS] = {"baseTokenTotal": entry.baseOpenOrdersTotal, "quoteTokenTotal": entry.quoteOpenOrdersTotal}
+            await self.__UpdatePool(poolAddress=poolAddress, slot=entry.slot)
+
+    # ========================================
+    #
+    def __Record(self, item: dict):
+        if self.RECORD_PATH:
+            with open(self.RECORD_PATH, "a") as f:
+                f.write(json.dumps(item) + "\n")
+
+    # ========================================
+    # One websocket session: subscribe to everything, resync (notifications
+    # queue up meanwhile), then dispatch until the connection drops.
+    #
+    async def __Session(self, websocket: Any, gap: Optional[ReserveStreamGap]):
+        requests:      Dict[int, Optional[Pubkey]] = {}
+        subscriptions: Dict[int, Optional[Pubkey]] = {}
+        for requestID, pubkey in enumerate(self.__ACCOUNTS, start=1):
+            requests[requestID] = pubkey
+            await websocket.send(json.dumps({"jsonrpc": "2.0", "id": requestID, "method": "accountSubscribe",
+                                             "params":  [str(pubkey), {"encoding": "base64", "commitment": self.COMMITMENT}]}))
+        requests[0] = None
+        await websocket.send(json.dumps({"jsonrpc": "2.0", "id": 0, "method": "slotSubscribe"}))
+        if gap is not None:
+            await self.__OnGap(gap=gap)
+        else:
+            await self.Resync()
+
+        async for message in websocket:
+            try:
+                await self.__Dispatch(message=message, requests=requests, subscriptions=subscriptions)
+            except (ValueError, KeyError, TypeError, IndexError) as e:
+                logging.debug("ReserveStream skipping malformed message: %r", e)
+
+    # ========================================
+    #
+    async def __Dispatch(self, message: Any, requests: Dict[int, Optional[Pubkey]], subscriptions: Dict[int, Optional[Pubkey]]):
+        item: dict = json.loads(message)
+        if "id" in item:
+            if "result" in item:
+                subscriptions[item["result"]] = requests.get(item["id"])
+            else:
+                logging.debug("ReserveStream subscribe failed: %s", item.get('error'))
+            return
+
+        params: dict = item.get("params", {})
+        method: str  = item.get("method")
+        if method == "accountNotification":
+            pubkey: Optional[Pubkey] = subscriptions.get(params.get("subscription"))
+            if pubkey is None:
+                return
+            result: dict  = params["result"]
+            slot:   int   = result["context"]["slot"]
+            data:   bytes = base64.b64decode(result["value"]["data"][0])
+            self.__Record({"type": "account", "pubkey": str(pubkey), "slot": slot, "data": result["value"]["data"][0]})
+            await self.__OnAccount(pubkey=pubkey, slot=slot, data=data)
+        elif method == "slotNotification":
+            slot: int = params["result"]["slot"]
+            self.__Record({"type": "slot", "slot": slot})
+            await self.__OnSlot(slot=slot)
+
+    # ========================================
+    # Runs until `Stop()`.
+    #
+    async def Run(self):
+        if websockets is None:
+            raise ImportError("ReserveStream requires `websockets`, please install it (pip install websockets)!")
+
+        delay: float = self.RECONNECT_DELAY
+        while not self.__STOPPED:
+            try:
+                async with websockets.connect(self.WS_ENDPOINT, max_size=None) as websocket:
+                    self.__WEBSOCKET = websocket
+                    self.CONNECTIONS += 1
+                    delay = self.RECONNECT_DELAY
+                    gap = None if self.CONNECTIONS == 1 else ReserveStreamGap(reason="reconnect", fromSlot=self.__LAST_SLOT, toSlot=self.__LAST_SLOT)
+                    await self.__Session(websocket=websocket, gap=gap)
+            except (OSError, asyncio.TimeoutError, websockets.exceptions.WebSocketException) as e:
+                logging.debug("ReserveStream connection lost: %s", e)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # E.g. a failed HTTP resync, reconnecting resyncs again.
+                logging.exception("ReserveStream session failed: %r", e)
+            finally:
+                self.__WEBSOCKET = None
+
+            if not self.__STOPPED:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.MAX_RECONNECT_DELAY)
+
+    # ========================================
+    #
+    async def Stop(self):
+        self.__STOPPED = True
+        if self.__WEBSOCKET is not None:
+            await self.__WEBSOCKET.close()
+
+# =============================================================================
+# 
@@ -0,0 +1,141 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: Raydium AMM v4 reserve stream replay server
+#
+# =============================================================================
+# 
+from   typing import List, Any, Dict, Optional
+import asyncio
+import logging
+import json
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+# =============================================================================
+# Reads notifications recorded by `ReserveStream(recordPath=...)`, one JSON
+# object per line: {"type": "account", "pubkey", "slot", "data"} or
+# {"type": "slot", "slot"}.
+#
+def LoadReserveStreamRecording(path: str) -> List[dict]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+# =============================================================================
+# Local stand-in for a Solana websocket endpoint. Answers `accountSubscribe`
+# and `slotSubscribe`, then replays the recording to the subscribed clients.
+# `dropAfter` closes the connection after that many notifications so client
+# reconnects can be exercised; the next connection continues where the
+# previous one stopped.
+#
+class ReserveStreamReplayServer:
+    def __init__(self, notifications: List[dict], host: str = "127.0.0.1", port: int = 0, dropAfter: Optional[int] = None, interval: float = 0.0):
+        self.NOTIFICATIONS: List[dict]    = notifications
+        self.HOST:          str           = host
+        self.PORT:          int           = port
+        self.DROP_AFTER:    Optional[int] = dropAfter
+        self.INTERVAL:      float         = interval
+        self.POSITION:      int           = 0
+        self.CONNECTIONS:   int           = 0
+        self.DONE:          asyncio.Event = asyncio.Event()
+        self.__SERVER:      Any           = None
+
+    # ========================================
+    #
+    @property
+    def URL(self) -> str:
+        return f"ws://{self.HOST}:{self.PORT}"
+
+    # ========================================
+    #
+    async def Start(self) -> str:
+        if websockets is None:
+            raise ImportError("ReserveStreamReplayServer requires `websockets`, please install it (pip install websockets)!")
+        self.__SERVER = await websockets.serve(self.__Handle, self.HOST, self.PORT)
+        self.PORT     = self.__SERVER.sockets[0].getsockname()[1]
+        return self.URL
+
+    async def Stop(self):
+        if self.__SERVER is not None:
+            self.__SERVER.close()
+            await self.__SERVER.wait_closed()
+
+    # ========================================
+    # Answers subscribe requests for the whole connection lifetime.
+    #
+    async def __Answer(self, websocket: Any, subscriptions: Dict[str, int]):
+        async for message in websocket:
+            request:        dict = json.loads(message)
+            subscriptionID: int  = 1000 + len(subscriptions)
+            if request.get("method") == "accountSubscribe":
+                subscriptions[request["params"][0]] = subscriptionID
+            elif request.get("method") == "slotSubscribe":
+                subscriptions[""] = subscriptionID
+            else:
+                continue
+            await websocket.send(json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": subscriptionID}))
+
+    # ========================================
+    # Waits (up to a second) until every recorded pubkey and the slot
+    # feed are subscribed, then replays. Slot subscription is keyed "".
+    #
+    async def __Handle(self, websocket: Any, *args):
+        self.CONNECTIONS += 1
+        expected:      set            = {item["pubkey"] for item in self.NOTIFICATIONS if item["type"] == "account"} | {""}
+        subscriptions: Dict[str, int] = {}
+        answer = asyncio.ensure_future(self.__Answer(websocket=websocket, subscriptions=subscriptions))
+        try:
+            for _ in range(100):
+                if expected.issubset(subscriptions):
+                    break
+                await asyncio.sleep(0.01)
+            await self.__Replay(websocket=websocket, subscriptions=subscriptions)
+        finally:
+            answer.cancel()
+
+    # ========================================
+    #
+    async def __Replay(self, websocket: Any, subscriptions: Dict[str, int]):
+        sent: int = 0
+        while self.POSITION < len(self.NOTIFICATIONS):
+            if self.DROP_AFTER is not None and sent >= self.DROP_AFTER:
+                logging.debug("ReserveStreamReplayServer: dropping connection at %s", self.POSITION)
+                await websocket.close()
+                return
+            item: dict = self.NOTIFICATIONS[self.POSITION]
+            self.POSITION += 1
+            if item["type"] == "account" and item["pubkey"] in subscriptions:
+                message = {"jsonrpc": "2.0", "method": "accountNotification",
+                           "params":  {"subscription": subscriptions[item["pubkey"]],
+                                       "result":       {"context": {"slot": item["slot"]},
+                                                        "value":   {"data": [item["data"], "base64"], "executable": False, "lamports": 0, "owner": "", "rentEpoch": 0}}}}
+            elif item["type"] == "slot" and "" in subscriptions:
+                message = {"jsonrpc": "2.0", "method": "slotNotification",
+                           "params":  {"subscription": subscriptions[""], "result": {"slot": item["slot"], "parent": item["slot"] - 1, "root": item["slot"] - 32}}}
+            else:
+                continue
+            await websocket.send(json.dumps(message))
+            sent += 1
+            if self.INTERVAL:
+                await asyncio.sleep(self.INTERVAL)
+
+        self.DONE.set()
+        await websocket.wait_closed()
+
+# =============================================================================
+# 
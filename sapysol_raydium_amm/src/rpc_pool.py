@@ -0,0 +1,355 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: Raydium hedged RPC pool
+#
+# =============================================================================
+# 
+from   solana.rpc.api          import Client
+from   solana.rpc.async_api    import AsyncClient
+from   concurrent.futures      import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from   typing                  import List, Any, Dict, Union, NamedTuple, Optional
+import threading
+import asyncio
+import logging
+import time
+
+# =============================================================================
+# Methods that change state are sent to one endpoint only, never hedged.
+#
+RAYDIUM_RPC_UNHEDGED_METHODS: frozenset = frozenset(["send_transaction", "send_raw_transaction", "send_legacy_transaction", "request_airdrop"])
+
+# =============================================================================
+#
+class RaydiumRpcEndpointStats(NamedTuple):
+    endpoint:    str   #
+    ewmaLatency: float # seconds, successful requests only
+    healthy:     bool  #
+    requests:    int   #
+    errors:      int   #
+    hedges:      int   # requests sent here as the hedge of a slower endpoint
+    wins:        int   # responses that were used
+    lastSlot:    int   # highest context slot returned
+
+# =============================================================================
+# Latency (EWMA) and health of one endpoint. An endpoint is unhealthy for
+# `cooldown` seconds after `maxErrors` consecutive failures.
+#
+class _Endpoint:
+    def __init__(self, endpoint: str, client: Any):
+        self.ENDPOINT:       str   = endpoint
+        self.CLIENT:         Any   = client
+        self.EWMA_LATENCY:   float = 0.0
+        self.REQUESTS:       int   = 0
+        self.ERRORS:         int   = 0
+        self.HEDGES:         int   = 0
+        self.WINS:           int   = 0
+        self.LAST_SLOT:      int   = 0
+        self.FAILURES:       int   = 0 # consecutive
+        self.UNHEALTHY_TILL: float = 0.0
+
+    def IsHealthy(self) -> bool:
+        return time.monotonic() >= self.UNHEALTHY_TILL
+
+    def Stats(self) -> RaydiumRpcEndpointStats:
+        return RaydiumRpcEndpointStats(endpoint=self.ENDPOINT, ewmaLatency=self.EWMA_LATENCY, healthy=self.IsHealthy(), requests=self.REQUESTS,
+                                       errors=self.ERRORS, hedges=self.HEDGES, wins=self.WINS, lastSlot=self.LAST_SLOT)
+
+# =============================================================================
+# Shared bookkeeping of the sync and async pools.
+#
+class _RaydiumRpcPoolBase:
+    def __init__(self,
+                 endpoints:      List[_Endpoint],
+                 hedgeDelay:     Optional[float] = None,
+                 hedgeFactor:    float = 2.0,
+                 minHedgeDelay:  float = 0.05,
+                 maxSlotLag:     int   = 4,
+                 slotMarkTtl:    float = 2.0,
+                 collectWindow:  float = 0.01,
+                 ewmaAlpha:      float = 0.2,
+                 maxErrors:      int   = 3,
+                 cooldown:       float = 5.0):
+
+        assert(len(endpoints) > 0)
+        self.ENDPOINTS:       List[_Endpoint] = endpoints
+        self.HEDGE_DELAY:     Optional[float] = hedgeDelay    # fixed delay, None: EWMA of the first endpoint * hedgeFactor
+        self.HEDGE_FACTOR:    float           = hedgeFactor
+        self.MIN_HEDGE_DELAY: float           = minHedgeDelay
+        self.MAX_SLOT_LAG:    int             = maxSlotLag    # responses this far behind the best known slot are stale
+        self.SLOT_MARK_TTL:   float           = slotMarkTtl   # seconds a best known slot counts without being reached again
+        self.COLLECT_WINDOW:  float           = collectWindow # seconds other in-flight responses get after the first fresh one
+        self.EWMA_ALPHA:      float           = ewmaAlpha
+        self.MAX_ERRORS:      int             = maxErrors
+        self.COOLDOWN:        float           = cooldown
+        self.MAX_SLOTS:       Dict[tuple, tuple] = {}         # (method, commitment) -> (best known slot, monotonic time)
+        self.LOCK:            threading.Lock  = threading.Lock()
+
+    # ========================================
+    # Healthy endpoints by EWMA latency (unmeasured first, so every
+    # endpoint gets probed); all of them if none is healthy.
+    #
+    def Ranked(self) -> List[_Endpoint]:
+        healthy = [endpoint for endpoint in self.ENDPOINTS if endpoint.IsHealthy()] or self.ENDPOINTS
+        return sorted(healthy, key=lambda endpoint: endpoint.EWMA_LATENCY)
+
+    def HedgeDelayFor(self, endpoint: _Endpoint) -> float:
+        if self.HEDGE_DELAY is not None:
+            return self.HEDGE_DELAY
+        return max(self.MIN_HEDGE_DELAY, endpoint.EWMA_LATENCY * self.HEDGE_FACTOR)
+
+    def GetStats(self) -> List[RaydiumRpcEndpointStats]:
+        with self.LOCK:
+            return [endpoint.Stats() for endpoint in self.ENDPOINTS]
+
+    # ========================================
+    #
+    @staticmethod
+    def Slot(resp: Any) -> Optional[int]:
+        context = getattr(resp, "context", None)
+        return getattr(context, "slot", None)
+
+    # Best known slots are kept per method and commitment: a `processed`
+    # read must not make every `finalized` one look stale.
+    @staticmethod
+    def SlotKey(method: str, kwargs: dict) -> tuple:
+        return (method, str(kwargs.get("commitment")))
+
+    def Record(self, endpoint: _Endpoint, latency: float, resp: Any = None, error: Optional[BaseException] = None, key: tuple = ()):
+        with self.LOCK:
+            endpoint.REQUESTS += 1
+            if error is not None:
+                endpoint.ERRORS   += 1
+                endpoint.FAILURES += 1
+                if endpoint.FAILURES >= self.MAX_ERRORS:
+                    endpoint.UNHEALTHY_TILL = time.monotonic() + self.COOLDOWN
+                    logging.debug("RPC endpoint %s unhealthy after %s errors: %r", endpoint.ENDPOINT, endpoint.FAILURES, error)
+                return
+            endpoint.FAILURES     = 0
+            endpoint.EWMA_LATENCY = latency if endpoint.EWMA_LATENCY == 0 else \
+                                    endpoint.EWMA_LATENCY + self.EWMA_ALPHA * (latency - endpoint.EWMA_LATENCY)
+            slot = _RaydiumRpcPoolBase.Slot(resp)
+            if slot is not None:
+                endpoint.LAST_SLOT = max(endpoint.LAST_SLOT, slot)
+                if slot >= self.MaxSlot(key=key):
+                    self.MAX_SLOTS[key] = (slot, time.monotonic())
+
+    # Lower bound from a request that lost the race and was cancelled, so a
+    # slow endpoint does not keep looking unmeasured.
+    def RecordAbandoned(self, endpoint: _Endpoint, elapsed: float):
+        with self.LOCK:
+            endpoint.EWMA_LATENCY = max(endpoint.EWMA_LATENCY, elapsed)
+
+    # A best known slot that no response reached again within
+    # `slotMarkTtl` is dropped, so one answer from ahead of the chain does
+    # not make every later one stale.
+    def MaxSlot(self, key: tuple) -> int:
+        slot, seenAt = self.MAX_SLOTS.get(key, (0, 0.0))
+        return slot if time.monotonic() - seenAt <= self.SLOT_MARK_TTL else 0
+
+    def IsFresh(self, resp: Any, key: tuple) -> bool:
+        slot = _RaydiumRpcPoolBase.Slot(resp)
+        return slot is None or slot >= self.MaxSlot(key=key) - self.MAX_SLOT_LAG
+
+    def Pick(self, results: List[tuple]) -> Any:
+        # (endpoint, resp) pairs: highest slot wins
+        endpoint, resp = max(results, key=lambda item: _RaydiumRpcPoolBase.Slot(item[1]) or 0)
+        with self.LOCK:
+            endpoint.WINS += 1
+        return resp
+
+# =============================================================================
+# Drop-in for `Client` (pass it wherever a `connection` is expected) that
+# spreads reads over several endpoints:
+#  - the request goes to the healthy endpoint with the lowest EWMA latency;
+#  - if it has not answered after the hedge delay, the same request goes to
+#    the next endpoint as well (up to `maxInFlight` endpoints);
+#  - once a valid response arrives, the other in-flight requests get
+#    `collectWindow` seconds more and the highest-slot response wins.
+#    Errors are not valid, and neither are responses whose context slot
+#    lags the best known slot (per method and commitment) by more than
+#    `maxSlotLag`. If nothing valid arrives, the highest-slot response is
+#    used, or the last error is raised.
+# `RAYDIUM_RPC_UNHEDGED_METHODS` go to the best endpoint only.
+#
+class RaydiumRpcPool(_RaydiumRpcPoolBase):
+    def __init__(self, endpoints: List[Union[str, Client]], maxInFlight: int = 2, timeout: float = 10, **kwargs):
+        super().__init__(endpoints=[_Endpoint(endpoint=endpoint if isinstance(endpoint, str) else endpoint._provider.endpoint_uri,
+                                              client=Client(endpoint, timeout=timeout) if isinstance(endpoint, str) else endpoint) for endpoint in endpoints],
+                         **kwargs)
+        self.MAX_IN_FLIGHT: int                = max(1, maxInFlight)
+        self.EXECUTOR:      ThreadPoolExecutor = ThreadPoolExecutor(max_workers=len(self.ENDPOINTS) * 4, thread_name_prefix="raydium-rpc")
+
+    # ========================================
+    #
+    def __Run(self, endpoint: _Endpoint, method: str, args: tuple, kwargs: dict) -> Any:
+        started: float = time.monotonic()
+        try:
+            resp = getattr(endpoint.CLIENT, method)(*args, **kwargs)
+        except BaseException as e:
+            self.Record(endpoint=endpoint, latency=time.monotonic() - started, error=e)
+            raise
+        self.Record(endpoint=endpoint, latency=time.monotonic() - started, resp=resp, key=self.SlotKey(method=method, kwargs=kwargs))
+        return resp
+
+    def Call(self, method: str, *args, **kwargs) -> Any:
+        ranked: List[_Endpoint] = self.Ranked()
+        if method in RAYDIUM_RPC_UNHEDGED_METHODS:
+            return self.__Run(endpoint=ranked[0], method=method, args=args, kwargs=kwargs)
+
+        key:          tuple                   = self.SlotKey(method=method, kwargs=kwargs)
+        candidates:   List[_Endpoint]         = ranked[:self.MAX_IN_FLIGHT]
+        pending:      Dict[Future, _Endpoint] = {}
+        results:      List[tuple]             = []
+        lastError:    Optional[BaseException] = None
+        nextIndex:    int                     = 0
+        collectUntil: Optional[float]         = None
+        while True:
+            if collectUntil is None and nextIndex < len(candidates) and (not pending or nextIndex > 0):
+                endpoint = candidates[nextIndex]
+                if nextIndex > 0:
+                    with self.LOCK:
+                        endpoint.HEDGES += 1
+                pending[self.EXECUTOR.submit(self.__Run, endpoint, method, args, kwargs)] = endpoint
+                nextIndex += 1
+            if not pending:
+                break
+
+            # Wait for a response, until it is time to hedge, or until the
+            # collect window after the first fresh response closes
+            if collectUntil is not None:
+                waitFor = collectUntil - time.monotonic()
+                if waitFor <= 0:
+                    break
+            else:
+                waitFor = self.HedgeDelayFor(candidates[0]) if nextIndex < len(candidates) else None
+            done, _ = wait(list(pending.keys()), timeout=waitFor, return_when=FIRST_COMPLETED)
+            for future in done:
+                endpoint = pending.pop(future)
+                try:
+                    resp = future.result()
+                except Exception as e:
+                    lastError = e
+                    continue
+                results.append((endpoint, resp))
+                if collectUntil is None and self.IsFresh(resp=resp, key=key):
+                    collectUntil = time.monotonic() + self.COLLECT_WINDOW
+            if collectUntil is None and done and nextIndex < len(candidates) and not pending:
+                continue # failed or stale before the hedge fired: hedge right away
+
+        if results:
+            return self.Pick(results=results)
+        raise lastError
+
+    # ========================================
+    # Any `Client` method; non-callable attributes come from the first endpoint.
+    #
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        attr = getattr(self.ENDPOINTS[0].CLIENT, name)
+        if not callable(attr):
+            return attr
+        return lambda *args, **kwargs: self.Call(name, *args, **kwargs)
+
+# =============================================================================
+# `RaydiumRpcPool` for `AsyncClient`, hedges are asyncio tasks.
+#
+class AsyncRaydiumRpcPool(_RaydiumRpcPoolBase):
+    def __init__(self, endpoints: List[Union[str, AsyncClient]], maxInFlight: int = 2, timeout: float = 10, **kwargs):
+        super().__init__(endpoints=[_Endpoint(endpoint=endpoint if isinstance(endpoint, str) else endpoint._provider.endpoint_uri,
+                                              client=AsyncClient(endpoint, timeout=timeout) if isinstance(endpoint, str) else endpoint) for endpoint in endpoints],
+                         **kwargs)
+        self.MAX_IN_FLIGHT: int = max(1, maxInFlight)
+
+    # ========================================
+    #
+    async def __Run(self, endpoint: _Endpoint, method: str, args: tuple, kwargs: dict) -> Any:
+        started: float = time.monotonic()
+        try:
+            resp = await getattr(endpoint.CLIENT, method)(*args, **kwargs)
+        except asyncio.CancelledError:
+            self.RecordAbandoned(endpoint=endpoint, elapsed=time.monotonic() - started)
+            raise
+        except BaseException as e:
+            self.Record(endpoint=endpoint, latency=time.monotonic() - started, error=e)
+            raise
+        self.Record(endpoint=endpoint, latency=time.monotonic() - started, resp=resp, key=self.SlotKey(method=method, kwargs=kwargs))
+        return resp
+
+    async def Call(self, method: str, *args, **kwargs) -> Any:
+        ranked: List[_Endpoint] = self.Ranked()
+        if method in RAYDIUM_RPC_UNHEDGED_METHODS:
+            return await self.__Run(endpoint=ranked[0], method=method, args=args, kwargs=kwargs)
+
+        key:          tuple                         = self.SlotKey(method=method, kwargs=kwargs)
+        candidates:   List[_Endpoint]               = ranked[:self.MAX_IN_FLIGHT]
+        pending:      Dict[asyncio.Task, _Endpoint] = {}
+        results:      List[tuple]                   = []
+        lastError:    Optional[BaseException]       = None
+        nextIndex:    int                           = 0
+        collectUntil: Optional[float]               = None
+        try:
+            while True:
+                if collectUntil is None and nextIndex < len(candidates) and (not pending or nextIndex > 0):
+                    endpoint = candidates[nextIndex]
+                    if nextIndex > 0:
+                        with self.LOCK:
+                            endpoint.HEDGES += 1
+                    pending[asyncio.ensure_future(self.__Run(endpoint, method, args, kwargs))] = endpoint
+                    nextIndex += 1
+                if not pending:
+                    break
+
+                if collectUntil is not None:
+                    waitFor = collectUntil - time.monotonic()
+                    if waitFor <= 0:
+                        break
+                else:
+                    waitFor = self.HedgeDelayFor(candidates[0]) if nextIndex < len(candidates) else None
+                done, _ = await asyncio.wait(list(pending.keys()), timeout=waitFor, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    endpoint = pending.pop(task)
+                    try:
+                        resp = task.result()
+                    except Exception as e:
+                        lastError = e
+                        continue
+                    results.append((endpoint, resp))
+                    if collectUntil is None and self.IsFresh(resp=resp, key=key):
+                        collectUntil = time.monotonic() + self.COLLECT_WINDOW
+                if collectUntil is None and done and nextIndex < len(candidates) and not pending:
+                    continue
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if results:
+            return self.Pick(results=results)
+        raise lastError
+
+    # ========================================
+    #
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        attr = getattr(self.ENDPOINTS[0].CLIENT, name)
+        if not callable(attr):
+            return attr
+        return lambda *args, **kwargs: self.Call(name, *args, **kwargs)
+
+# =============================================================================
+# 
@@ -0,0 +1,141 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: Raydium RPC stand-in server
+#
+# =============================================================================
+# 
+# Local stand-in for a Solana HTTP JSON-RPC endpoint, for exercising
+# `RaydiumRpcPool` (hedging, stale-slot rejection, cooldown) offline. Serves
+# account reads from a dict at a configurable slot; `DELAY`, `SLOT` and
+# `FAIL` can be changed while the server runs.
+#
+from   solders.pubkey           import Pubkey
+from   solders.account          import Account
+from   http.server              import ThreadingHTTPServer, BaseHTTPRequestHandler
+from   typing                   import List, Any, Dict, Optional
+import threading
+import base64
+import json
+import time
+
+# =============================================================================
+#
+class RaydiumRpcStandInServer:
+    def __init__(self,
+                 accounts: Optional[Dict[Pubkey, Optional[Account]]] = None,
+                 slot:     int   = 1,
+                 delay:    float = 0.0,
+                 host:     str   = "127.0.0.1",
+                 port:     int   = 0):
+        self.ACCOUNTS: Dict[Pubkey, Optional[Account]] = accounts if accounts is not None else {}
+        self.SLOT:     int   = slot
+        self.DELAY:    float = delay  # seconds before every response
+        self.FAIL:     bool  = False  # answer HTTP 503 instead
+        self.HOST:     str   = host
+        self.PORT:     int   = port
+        self.REQUESTS: int   = 0
+        self.__SERVER: Optional[ThreadingHTTPServer] = None
+        self.__THREAD: Optional[threading.Thread]    = None
+
+    # ========================================
+    #
+    @property
+    def URL(self) -> str:
+        return f"http://{self.HOST}:{self.PORT}"
+
+    # ========================================
+    #
+    def Start(self) -> str:
+        standIn = self
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body: bytes = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                standIn.REQUESTS += 1
+                if standIn.DELAY:
+                    time.sleep(standIn.DELAY)
+                if standIn.FAIL:
+                    self.send_error(503)
+                    return
+                request = json.loads(body)
+                result  = [standIn.Answer(item) for item in request] if isinstance(request, list) else standIn.Answer(request)
+                data: bytes = json.dumps(result).encode()
+                self.send_response(200)
+                self.send_header("Content-Type",   "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.__SERVER = ThreadingHTTPServer((self.HOST, self.PORT), Handler)
+        self.__SERVER.daemon_threads = True
+        self.PORT     = self.__SERVER.server_address[1]
+        self.__THREAD = threading.Thread(target=self.__SERVER.serve_forever, name="raydium-rpc-stand-in", daemon=True)
+        self.__THREAD.start()
+        return self.URL
+
+    def Stop(self):
+        if self.__SERVER is not None:
+            self.__SERVER.shutdown()
+            self.__SERVER.server_close()
+            self.__SERVER = None
+
+    # ========================================
+    #
+    def __Account(self, pubkey: str, config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        account: Optional[Account] = self.ACCOUNTS.get(Pubkey.from_string(pubkey))
+        if account is None:
+            return None
+        data:      bytes          = bytes(account.data)
+        dataSlice: Dict[str, int] = config.get("dataSlice") or {}
+        if dataSlice:
+            data = data[dataSlice["offset"]:dataSlice["offset"] + dataSlice["length"]]
+        return {"data":       [base64.b64encode(data).decode(), "base64"],
+                "executable": account.executable,
+                "lamports":   account.lamports,
+                "owner":      str(account.owner),
+                "rentEpoch":  account.rent_epoch,
+                "space":      len(account.data)}
+
+    # ========================================
+    # One JSON-RPC request -> response. `getSlot`, `getAccountInfo`,
+    # `getMultipleAccounts`, `getBalance` and `getLatestBlockhash` are
+    # supported, anything else gets "method not found".
+    #
+    def Answer(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        method:  str       = request.get("method")
+        params:  List[Any] = request.get("params") or []
+        config:  Dict      = params[1] if len(params) > 1 and isinstance(params[1], dict) else {}
+        context: Dict      = {"slot": self.SLOT, "apiVersion": "1.18.0"}
+        if method == "getSlot":
+            result: Any = self.SLOT
+        elif method == "getAccountInfo":
+            result = {"context": context, "value": self.__Account(pubkey=params[0], config=config)}
+        elif method == "getMultipleAccounts":
+            result = {"context": context, "value": [self.__Account(pubkey=pubkey, config=config) for pubkey in params[0]]}
+        elif method == "getBalance":
+            account = self.ACCOUNTS.get(Pubkey.from_string(params[0]))
+            result  = {"context": context, "value": 0 if account is None else account.lamports}
+        elif method == "getLatestBlockhash":
+            result = {"context": context, "value": {"blockhash": str(Pubkey.default()), "lastValidBlockHeight": self.SLOT + 150}}
+        else:
+            return {"jsonrpc": "2.0", "id": request.get("id"), "error": {"code": -32601, "message": "Method not found"}}
+        return {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+
+# =============================================================================
+#
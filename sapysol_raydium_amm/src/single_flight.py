@@ -0,0 +1,218 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: Raydium single-flight and file locks
+#
+# =============================================================================
+# 
+from   sapysol                 import EnsurePathExists
+from   typing                  import Any, Dict, Callable, Awaitable, Optional
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+import threading
+import tempfile
+import asyncio
+import zlib
+import os
+
+# =============================================================================
+# Advisory `flock` on `path` (created if missing). Without `fcntl`
+# (Windows) locking is a no-op and only in-process guarantees remain.
+#
+class RaydiumFileLock:
+    POLL_INTERVAL: float = 0.005
+
+    def __init__(self, path: str, shared: bool = False):
+        self.PATH:   str  = path
+        self.SHARED: bool = shared
+        self.__FILE       = None
+
+    # ========================================
+    #
+    def __Open(self):
+        EnsurePathExists(os.path.dirname(self.PATH))
+        self.__FILE = open(self.PATH, "a+b")
+
+    def __Mode(self) -> int:
+        return fcntl.LOCK_SH if self.SHARED else fcntl.LOCK_EX
+
+    def Acquire(self):
+        if fcntl is None:
+            return
+        self.__Open()
+        fcntl.flock(self.__FILE.fileno(), self.__Mode())
+
+    async def AcquireAsync(self):
+        if fcntl is None:
+            return
+        self.__Open()
+        while True:
+            try:
+                fcntl.flock(self.__FILE.fileno(), self.__Mode() | fcntl.LOCK_NB)
+                return
+            except BlockingIOError:
+                await asyncio.sleep(RaydiumFileLock.POLL_INTERVAL)
+
+    def Release(self):
+        if self.__FILE is not None:
+            fcntl.flock(self.__FILE.fileno(), fcntl.LOCK_UN)
+            self.__FILE.close()
+            self.__FILE = None
+
+    # ========================================
+    #
+    def __enter__(self) -> "RaydiumFileLock":
+        self.Acquire()
+        return self
+
+    def __exit__(self, *args):
+        self.Release()
+
+    async def __aenter__(self) -> "RaydiumFileLock":
+        await self.AcquireAsync()
+        return self
+
+    async def __aexit__(self, *args):
+        self.Release()
+
+# =============================================================================
+# Readers see either the old or the new file, never a partial write:
+# data goes to a temp file in the same directory, then `os.replace`.
+#
+def RaydiumAtomicWrite(path: str, data: bytes):
+    directory: str = os.path.dirname(path) or "."
+    fd, tempPath = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tempPath, path)
+    except BaseException:
+        try:
+            os.remove(tempPath)
+        except FileNotFoundError:
+            pass
+        raise
+
+# =============================================================================
+# In flight call shared by every waiter in the process.
+#
+class _Flight:
+    def __init__(self):
+        self.DONE:   threading.Event         = threading.Event()
+        self.RESULT: Any                     = None
+        self.ERROR:  Optional[BaseException] = None
+
+# =============================================================================
+# Single-flight: at most one `fetch` per key runs at a time.
+#
+# In a process, concurrent callers (threads, or tasks of one event loop for
+# `DoAsync`) with the same key wait for the leader and share its result or
+# exception. Across processes the leader holds an exclusive lock on one of
+# `LOCK_STRIPES` lock files in `lockDir`, then calls `check()` first, so a
+# process that waited for another one reads the stored result instead of
+# calling RPC again.
+#
+class RaydiumSingleFlight:
+    LOCK_STRIPES: int = 256
+
+    def __init__(self, name: str, lockDir: Optional[str] = None):
+        self.NAME:     str           = name
+        self.LOCK_DIR: Optional[str] = lockDir # None: in-process only
+        self.__LOCK:   threading.Lock = threading.Lock()
+        self.__CALLS:  Dict[Any, _Flight] = {}
+        self.__TASKS:  Dict[Any, asyncio.Future] = {}
+
+    # ========================================
+    #
+    def __FileLock(self, key: Any) -> Optional[RaydiumFileLock]:
+        if self.LOCK_DIR is None:
+            return None
+        stripe: int = zlib.crc32(str(key).encode()) % RaydiumSingleFlight.LOCK_STRIPES
+        return RaydiumFileLock(path=os.path.join(self.LOCK_DIR, f"{self.NAME}.{stripe}.lock"))
+
+    # ========================================
+    #
+    def Do(self, key: Any, fetch: Callable[[], Any], check: Optional[Callable[[], Any]] = None) -> Any:
+        with self.__LOCK:
+            flight = self.__CALLS.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.__CALLS[key] = _Flight()
+
+        if not leader:
+            flight.DONE.wait()
+            if flight.ERROR is not None:
+                raise flight.ERROR
+            return flight.RESULT
+
+        fileLock = self.__FileLock(key=key)
+        try:
+            if fileLock is not None:
+                fileLock.Acquire()
+            try:
+                result = check() if check is not None else None
+                flight.RESULT = result if result is not None else fetch()
+            finally:
+                if fileLock is not None:
+                    fileLock.Release()
+            return flight.RESULT
+        except BaseException as e:
+            flight.ERROR = e
+            raise
+        finally:
+            with self.__LOCK:
+                self.__CALLS.pop(key, None)
+            flight.DONE.set()
+
+    # ========================================
+    # `fetch` is a coroutine function, `check` a plain one.
+    #
+    async def DoAsync(self, key: Any, fetch: Callable[[], Awaitable[Any]], check: Optional[Callable[[], Any]] = None) -> Any:
+        taskKey = (id(asyncio.get_running_loop()), key)
+        future  = self.__TASKS.get(taskKey)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self.__TASKS[taskKey] = future
+        fileLock = self.__FileLock(key=key)
+        try:
+            if fileLock is not None:
+                await fileLock.AcquireAsync()
+            try:
+                result = check() if check is not None else None
+                result = result if result is not None else await fetch()
+            finally:
+                if fileLock is not None:
+                    fileLock.Release()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception() # mark as retrieved, waiters re-raise it
+            raise
+        finally:
+            self.__TASKS.pop(taskKey, None)
+
+# =============================================================================
+# 
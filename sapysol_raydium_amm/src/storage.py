@@ -0,0 +1,253 @@
+#!/usr/bin/python
+# =============================================================================
+#
+#  ######     ###    ########  ##    ##  ######   #######  ##       
+# ##    ##   ## ##   ##     ##  ##  ##  ##    ## ##     ## ##       
+# ##        ##   ##  ##     ##   ####   ##       ##     ## ##       
+#  ######  ##     ## ########     ##     ######  ##     ## ##       
+#       ## ######### ##           ##          ## ##     ## ##       
+# ##    ## ##     ## ##           ##    ##    ## ##     ## ##       
+#  ######  ##     ## ##           ##     ######   #######  ########
+#
+# =============================================================================
+#
+# SuperArmor's Python Solana library.
+# (c) SuperArmor
+#
+# module: Raydium cache storage
+#
+# =============================================================================
+# 
+from   solders.pubkey import Pubkey
+from   sapysol        import SapysolPubkey, MakePubkey, EnsurePathExists, ListToChunks
+from   typing         import List, Any, Dict, Optional, NamedTuple, Callable
+from  .single_flight  import RaydiumFileLock, RaydiumAtomicWrite
+from   abc            import ABC, abstractmethod
+import threading
+import sqlite3
+import struct
+import logging
+import json
+import os
+
+# =============================================================================
+# Converts cache entries to/from their JSON (legacy files) and compact binary
+# (single-file stores) forms. `fromJson`/`fromBytes` may return None to skip
+# stale or foreign records.
+#
+class RaydiumCacheCodec(NamedTuple):
+    toJson:    Callable[[Any], dict]
+    fromJson:  Callable[[dict], Optional[Any]]
+    toBytes:   Callable[[Any], bytes]
+    fromBytes: Callable[[bytes], Optional[Any]]
+
+# =============================================================================
+# Storage backend interface for RaydiumAmmCache, RaydiumSerumCache and
+# RaydiumSwapCache. Keys are pubkeys, values are decoded cache entries.
+#
+class RaydiumCacheStorage(ABC):
+    def __init__(self, codec: RaydiumCacheCodec):
+        self.CODEC: RaydiumCacheCodec = codec
+
+    def Get(self, key: SapysolPubkey) -> Optional[Any]:
+        return self.GetMany(keys=[key]).get(MakePubkey(key))
+
+    def Put(self, key: SapysolPubkey, entry: Any):
+        self.PutMany(items={MakePubkey(key): entry})
+
+    @abstractmethod
+    def GetMany(self, keys: List[SapysolPubkey]) -> Dict[Pubkey, Any]:
+        pass
+
+    @abstractmethod
+    def PutMany(self, items: Dict[Pubkey, Any]):
+        pass
+
+    @abstractmethod
+    def Delete(self, key: SapysolPubkey):
+        pass
+
+    @abstractmethod
+    def Keys(self) -> List[Pubkey]:
+        pass
+
+    def LoadAll(self) -> Dict[Pubkey, Any]:
+        return self.GetMany(keys=self.Keys())
+
+# =============================================================================
+# Legacy layout: one `<pubkey>.json` file per entry in a directory.
+#
+class RaydiumJsonDirStorage(RaydiumCacheStorage):
+    def __init__(self, codec: RaydiumCacheCodec, path: str):
+        super().__init__(codec=codec)
+        self.PATH: str = path
+        EnsurePathExists(path)
+
+    def __Filename(self, key: SapysolPubkey) -> str:
+        return os.path.join(self.PATH, f"{str(MakePubkey(key))}.json")
+
+    def __Load(self, key: Pubkey) -> Optional[Any]:
+        try:
+            fileName: str = self.__Filename(key=key)
+            logging.debug("Loading Raydium cache entry from file: %s", fileName)
+            if not os.path.isfile(fileName):
+                return None
+            with open(fileName) as f:
+                return self.CODEC.fromJson(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logging.debug("Skipping unreadable Raydium cache entry %s: %r", key, e)
+            return None
+
+    def GetMany(self, keys: List[SapysolPubkey]) -> Dict[Pubkey, Any]:
+        result: Dict[Pubkey, Any] = {}
+        for key in keys:
+            key   = MakePubkey(key)
+            entry = self.__Load(key=key)
+            if entry is not None:
+                result[key] = entry
+        return result
+
+    # Atomic per file; the directory lock serializes writers across processes.
+    def PutMany(self, items: Dict[Pubkey, Any]):
+        with RaydiumFileLock(path=os.path.join(self.PATH, ".lock")):
+            for key, entry in items.items():
+                RaydiumAtomicWrite(path=self.__Filename(key=key), data=json.dumps(self.CODEC.toJson(entry)).encode())
+
+    def Delete(self, key: SapysolPubkey):
+        try:
+            os.remove(self.__Filename(key=key))
+        except FileNotFoundError:
+            pass
+
+    def Keys(self) -> List[Pubkey]:
+        keys: List[Pubkey] = []
+        for fileName in os.listdir(self.PATH):
+            if not fileName.endswith(".json"):
+                continue
+            try:
+                keys.append(MakePubkey(fileName[:-5]))
+            except:
+                continue
+        return keys
+
+# =============================================================================
+# One SQLite file per cache type, keys and values stored as raw bytes.
+#
+class RaydiumSqliteStorage(RaydiumCacheStorage):
+    QUERY_CHUNK_SIZE: int = 500
+
+    def __init__(self, codec: RaydiumCacheCodec, path: str):
+        super().__init__(codec=codec)
+        EnsurePathExists(os.path.dirname(path))
+        self.PATH: str            = path
+        self.LOCK: threading.Lock = threading.Lock()
+        self.DB:   sqlite3.Connection = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self.DB.execute("PRAGMA journal_mode=WAL")
+        self.DB.execute("PRAGMA synchronous=NORMAL")
+        self.DB.execute("CREATE TABLE IF NOT EXISTS entries (key BLOB PRIMARY KEY, value BLOB NOT NULL) WITHOUT ROWID")
+        self.DB.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID")
+
+    # Store-level markers, e.g. that the legacy migration has completed.
+    def GetMeta(self, name: str) -> Optional[str]:
+        with self.LOCK:
+            row = self.DB.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def SetMeta(self, name: str, value: str):
+        with self.LOCK:
+            self.DB.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, value))
+
+    # Corrupt or outdated rows are skipped, as missing entries.
+    def __Decode(self, key: bytes, value: bytes) -> Optional[Any]:
+        try:
+            return self.CODEC.fromBytes(value)
+        except (struct.error, ValueError, KeyError, TypeError, IndexError) as e:
+            logging.debug("Skipping unreadable Raydium cache entry %s: %r", Pubkey.from_bytes(key), e)
+            return None
+
+    def GetMany(self, keys: List[SapysolPubkey]) -> Dict[Pubkey, Any]:
+        result: Dict[Pubkey, Any] = {}
+        for chunk in ListToChunks(baseList=[bytes(MakePubkey(key)) for key in keys], chunkSize=self.QUERY_CHUNK_SIZE):
+            with self.LOCK:
+                rows = self.DB.execute(f"SELECT key, value FROM entries WHERE key IN ({','.join('?' * len(chunk))})", chunk).fetchall()
+            for key, value in rows:
+                entry = self.__Decode(key=key, value=value)
+                if entry is not None:
+                    result[Pubkey.from_bytes(key)] = entry
+        return result
+
+    def PutMany(self, items: Dict[Pubkey, Any]):
+        rows = [(bytes(MakePubkey(key)), self.CODEC.toBytes(entry)) for key, entry in items.items()]
+        with self.LOCK:
+            self.DB.execute("BEGIN IMMEDIATE")
+            try:
+                self.DB.executemany("INSERT OR REPLACE INTO entries (key, value) VALUES (?, ?)", rows)
+                self.DB.execute("COMMIT")
+            except:
+                self.DB.execute("ROLLBACK")
+                raise
+
+    def Delete(self, key: SapysolPubkey):
+        with self.LOCK:
+            self.DB.execute("DELETE FROM entries WHERE key = ?", (bytes(MakePubkey(key)),))
+
+    def Keys(self) -> List[Pubkey]:
+        with self.LOCK:
+            rows = self.DB.execute("SELECT key FROM entries").fetchall()
+        return [Pubkey.from_bytes(key) for (key,) in rows]
+
+    def LoadAll(self) -> Dict[Pubkey, Any]:
+        with self.LOCK:
+            rows = self.DB.execute("SELECT key, value FROM entries").fetchall()
+        result: Dict[Pubkey, Any] = {}
+        for key, value in rows:
+            entry = self.__Decode(key=key, value=value)
+            if entry is not None:
+                result[Pubkey.from_bytes(key)] = entry
+        return result
+
+# =============================================================================
+# 
+def RaydiumCacheRootPath() -> str:
+    return os.path.join(os.getenv("HOME"), ".sapysol")
+
+# =============================================================================
+# Copies every entry `source` can decode into `target`, in bulk.
+# `skipExisting` keeps entries `target` already has (resumed migrations).
+#
+def MigrateRaydiumCacheStorage(source: RaydiumCacheStorage, target: RaydiumCacheStorage, chunkSize: int = 1000, skipExisting: bool = False) -> int:
+    migrated: int          = 0
+    keys:     List[Pubkey] = source.Keys()
+    if skipExisting:
+        existing = set(target.Keys())
+        keys     = [key for key in keys if key not in existing]
+    for chunk in ListToChunks(baseList=keys, chunkSize=chunkSize):
+        entries: Dict[Pubkey, Any] = source.GetMany(keys=chunk)
+        if entries:
+            target.PutMany(items=entries)
+            migrated += len(entries)
+    logging.info(f"Migrated {migrated} Raydium cache entries to {type(target).__name__}")
+    return migrated
+
+# =============================================================================
+# Default backend: single SQLite file. Entries from the legacy JSON directory
+# are imported once; the "migrated" marker is only written after the import
+# completes, so a crashed migration is resumed on the next start. The import
+# runs under a file lock, other processes wait for it instead of reading a
+# half-filled store.
+#
+_MIGRATED_MARKER: str = "migrated"
+
+def MakeDefaultRaydiumCacheStorage(codec: RaydiumCacheCodec, fileName: str, legacyDir: Optional[str] = None) -> RaydiumCacheStorage:
+    path:    str = os.path.join(RaydiumCacheRootPath(), fileName)
+    legacy:  str = os.path.join(RaydiumCacheRootPath(), legacyDir) if legacyDir else ""
+    storage = RaydiumSqliteStorage(codec=codec, path=path)
+    if legacy and os.path.isdir(legacy) and storage.GetMeta(name=_MIGRATED_MARKER) is None:
+        with RaydiumFileLock(path=f"{path}.migrate.lock"):
+            if storage.GetMeta(name=_MIGRATED_MARKER) is None:
+                MigrateRaydiumCacheStorage(source=RaydiumJsonDirStorage(codec=codec, path=legacy), target=storage, skipExisting=True)
+                storage.SetMeta(name=_MIGRATED_MARKER, value=legacy)
+    return storage
+
+# =============================================================================
+# 